@@ -0,0 +1,232 @@
+"""Stubs and fixtures shared by the test modules."""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+import vector2png.batch as batch_module
+import vector2png.converters.dxf as dxf_module
+from vector2png.exceptions import ConversionError
+
+
+class RecordingConverter:
+    """Converter stub that records its sources and writes a marker naming the DPI.
+
+    Sources named ``broken*`` fail, ``slow*`` ones take :attr:`delay` seconds and
+    ``crash*`` ones kill the process converting them.
+    """
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: list[Path] = []
+
+    @property
+    def names(self) -> list[str]:
+        return [path.name for path in self.calls]
+
+    def convert(self, source, target=None, options=None):
+        name = Path(source).stem
+        self.calls.append(Path(source))
+        if name.startswith("crash"):
+            os._exit(1)
+        if name.startswith("slow"):
+            time.sleep(self.delay)
+        if name.startswith("broken"):
+            raise ConversionError(f"cannot render {source}")
+        output = Path(target) if target else Path(source).with_suffix(".png")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(f"dpi={getattr(options, 'dpi', None)}")
+        return output
+
+
+@pytest.fixture
+def stub_converter(monkeypatch):
+    """Serve both converter kinds from one :class:`RecordingConverter` in this process.
+
+    Worker processes forked afterwards inherit it too.
+    """
+    converter = RecordingConverter()
+    monkeypatch.setattr(batch_module, "_CONVERTERS", {("ai", None): converter, ("dxf", None): converter})
+    return converter
+
+
+class DummyLayout:
+    """Placeholder layout object."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __iter__(self):
+        return iter([object()])
+
+
+class DummyLayouts:
+    """Lightweight container mimicking ezdxf layouts."""
+
+    def __init__(self) -> None:
+        self._names = {"Model", "Layout1"}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def names(self):  # noqa: D401 - simple pass-through
+        return list(self._names)
+
+    def get(self, name: str) -> DummyLayout:
+        return DummyLayout(name)
+
+
+class DummyDoc:
+    """Fake ezdxf document exposing modelspace and layouts."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.layouts = DummyLayouts()
+        self.header = {"$PDSIZE": 0}
+        self.entitydb = {"1": object(), "2": object()}
+
+    def modelspace(self) -> DummyLayout:
+        return DummyLayout("Model")
+
+
+def register_dxf_stubs(monkeypatch):
+    """Register DXF-related stub modules inside sys.modules."""
+
+    ezdxf_mod = types.ModuleType("ezdxf")
+    ezdxf_mod.readfile = lambda path: DummyDoc(Path(path))
+    ezdxf_mod.read = lambda stream: DummyDoc(Path(stream.read()))
+
+    addons_pkg = types.ModuleType("ezdxf.addons")
+    addons_pkg.__path__ = []
+
+    drawing_pkg = types.ModuleType("ezdxf.addons.drawing")
+    drawing_pkg.__path__ = []
+
+    class DummyRenderContext:
+        def __init__(self, _doc):
+            self.layers = {}
+
+    class DummyFrontend:
+        def __init__(self, _ctx, _backend, config=None):
+            self.config = config
+
+        def draw_layout(self, _layout, filter_func=None):
+            drawing_pkg.filters.append(filter_func)
+
+    drawing_pkg.filters = []
+    drawing_pkg.RenderContext = DummyRenderContext
+    drawing_pkg.Frontend = DummyFrontend
+
+    layout_mod = types.ModuleType("ezdxf.addons.drawing.layout")
+    layout_mod.__path__ = []
+
+    class DummyMargins:
+        def __init__(self, value: float) -> None:
+            self.value = value
+
+        @classmethod
+        def all(cls, value: float):
+            return cls(value)
+
+    class DummyUnits:
+        mm = "mm"
+
+    class DummyPage:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+    class DummySettings:
+        def __init__(self, scale: float, fit_page: bool) -> None:
+            self.scale = scale
+            self.fit_page = fit_page
+
+    layout_mod.Margins = DummyMargins
+    layout_mod.Units = DummyUnits
+    layout_mod.Page = DummyPage
+    layout_mod.Settings = DummySettings
+
+    config_mod = types.ModuleType("ezdxf.addons.drawing.config")
+    config_mod.__path__ = []
+
+    class DummyPolicy:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+    class DummyConfiguration:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+        def with_changes(self, **changes):
+            data = dict(self.kwargs)
+            data.update(changes)
+            return DummyConfiguration(**data)
+
+    config_mod.Configuration = DummyConfiguration
+    config_mod.BackgroundPolicy = types.SimpleNamespace(
+        WHITE=DummyPolicy("white"),
+        BLACK=DummyPolicy("black"),
+        DEFAULT=DummyPolicy("default"),
+        OFF=DummyPolicy("off"),
+    )
+    config_mod.ColorPolicy = types.SimpleNamespace(
+        COLOR=DummyPolicy("color"),
+        BLACK=DummyPolicy("black"),
+        WHITE=DummyPolicy("white"),
+        MONOCHROME=DummyPolicy("mono"),
+    )
+
+    pymupdf_mod = types.ModuleType("ezdxf.addons.drawing.pymupdf")
+
+    class DummyBackend:
+        records = ()
+
+        def get_pixmap_bytes(self, _page, fmt: str, settings, dpi: int):  # noqa: D401
+            payload = f"fmt={fmt},dpi={dpi},scale={settings.scale}".encode()
+            return payload
+
+    pymupdf_mod.PyMuPdfBackend = DummyBackend
+
+    modules = {
+        "ezdxf": ezdxf_mod,
+        "ezdxf.addons": addons_pkg,
+        "ezdxf.addons.drawing": drawing_pkg,
+        "ezdxf.addons.drawing.layout": layout_mod,
+        "ezdxf.addons.drawing.config": config_mod,
+        "ezdxf.addons.drawing.pymupdf": pymupdf_mod,
+    }
+
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    # Drop the process-wide bundle so the stubs are resolved for this test.
+    monkeypatch.setattr(dxf_module, "_modules", None)
+
+    addons_pkg.drawing = drawing_pkg
+
+    return modules
+
+
+@pytest.fixture
+def dxf_stubs(monkeypatch):
+    """Stub out ezdxf and return the registered modules by name."""
+    return register_dxf_stubs(monkeypatch)
+
+
+@pytest.fixture
+def real_drawing(tmp_path):
+    """A small drawing saved with the real ezdxf (skips without ezdxf and PyMuPDF)."""
+    ezdxf = pytest.importorskip("ezdxf")
+    pytest.importorskip("fitz")
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (100, 0), (100, 30), (0, 30)], close=True)
+    msp.add_line((0, 0), (100, 30))
+    msp.add_circle((50, 15), 10)
+    path = tmp_path / "drawing.dxf"
+    doc.saveas(path)
+    return path
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import io
 import types
 from pathlib import Path
 
@@ -9,6 +10,7 @@ import pytest
 
 import vector2png.converters.ai as ai_module
 from vector2png.converters.ai import AIConverter
+from vector2png.documents import DocumentCache
 from vector2png.exceptions import ConversionError, DependencyMissingError
 from vector2png.options import AIOptions
 
@@ -26,6 +28,10 @@ class DummyPixmap:
     def save(self, path: str | Path) -> None:
         Path(path).write_bytes(b"PNG-DATA")
 
+    def tobytes(self, output: str = "png") -> bytes:
+        return b"PNG-DATA"
+
+
 
 class DummyPage:
     """Fake page object exposing rect metadata and render hook."""
@@ -141,53 +147,148 @@ def test_ai_converter_raises_when_pdf2image_unavailable(tmp_path, fitz_stub):
         )
 
 
-def test_pymupdf_background_color_composites_with_pillow(tmp_path, monkeypatch, fitz_stub):
-    """Ensure PyMuPDF path applies background_color via Pillow."""
+def write_real_ai(path: Path, rotation: int = 0) -> Path:
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    page = doc.new_page(width=100, height=50)
+    page.draw_rect(fitz.Rect(10, 10, 60, 40), color=None, fill=(0, 0, 1))
+    page.set_rotation(rotation)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.mark.parametrize("rotation", [0, 90])
+def test_pymupdf_background_color_fills_the_page_natively(tmp_path, monkeypatch, rotation):
+    """Ensure PyMuPDF draws the background color under the page without Pillow."""
+    fitz = pytest.importorskip("fitz")
+    monkeypatch.setattr(ai_module, "optional_import", lambda *_args, **_kwargs: pytest.fail("Pillow imported"))
+    ai_file = write_real_ai(tmp_path / "bg_color.ai", rotation)
+
+    for documents in (None, DocumentCache()):
+        png_file = tmp_path / "bg_color.png"
+        AIConverter(documents=documents).convert(
+            ai_file,
+            png_file,
+            AIOptions(dpi=72, prefer_method="pymupdf", fallback=False, background_color=(10, 20, 30)),
+        )
+
+        pix = fitz.Pixmap(str(png_file))
+        assert (pix.width, pix.height, pix.alpha) == ((100, 50) if rotation == 0 else (50, 100)) + (0,)
+        assert pix.pixel(2, 2) == (10, 20, 30)
+        assert pix.pixel(30, 25) == (0, 0, 255)
+
+
+def test_convert_tiles_replaces_tiles_of_an_earlier_run(tmp_path):
+    fitz = pytest.importorskip("fitz")
+    ai_file = write_real_ai(tmp_path / "plan.ai")
+    converter = AIConverter()
+
+    for color in ((255, 0, 0), (0, 255, 0)):
+        opts = AIOptions(dpi=72, prefer_method="pymupdf", background_color=color)
+        pyramid = converter.convert_tiles(ai_file, tmp_path / "tiles", opts)
+        assert fitz.Pixmap(str(pyramid.tile_path(len(pyramid.levels) - 1, 0, 0))).pixel(2, 2) == color
+
+
+class MultiPagePixmap(DummyPixmap):
+    """Pixmap stub that records which page produced it."""
+
+    def __init__(self, number: int, alpha: bool = False) -> None:
+        super().__init__(alpha=alpha)
+        self.number = number
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_bytes(f"PAGE-{self.number}".encode())
+
+
+class MultiPageDocument(DummyDocument):
+    """Document stub exposing several numbered pages."""
+
+    def __init__(self, path: Path, page_count: int = 4) -> None:
+        super().__init__(path)
+        self.page_count = page_count
+
+    def __getitem__(self, index: int) -> DummyPage:
+        if not 0 <= index < self.page_count:
+            raise IndexError
+        page = DummyPage()
+        page.get_pixmap = lambda matrix, alpha=False: MultiPagePixmap(index + 1, alpha=alpha)
+        return page
+
 
-    class PilImageStub:
-        def __init__(self, mode, size, data=None, color=None):
-            self.mode = mode
-            self.size = size
-            self.data = data
-            self.color = color
-            self.pasted = None
+def test_convert_pages_writes_one_png_per_selected_page(tmp_path, fitz_stub):
+    fitz_stub.open = lambda path: MultiPageDocument(Path(path))
+    ai_file = tmp_path / "artboards.ai"
+    ai_file.write_bytes(b"%PDF-1.7 demo body")
 
-        def split(self):
-            return (None, None, None, "mask")
+    converter = AIConverter()
+    outputs = converter.convert_pages(ai_file, options=AIOptions(pages="2-"), workers=1)
 
-        def paste(self, image, mask=None):
-            self.pasted = (image, mask)
+    assert [p.name for p in outputs] == ["artboards-2.png", "artboards-3.png", "artboards-4.png"]
+    assert outputs[0].read_bytes() == b"PAGE-2"
 
-        def save(self, path, fmt):
-            Path(path).write_bytes(b"PYMUPDF-BG")
 
-    class PilStub(types.SimpleNamespace):
-        def __init__(self):
-            super().__init__(
-                new=lambda mode, size, color: PilImageStub(mode, size, color=color),
-                frombytes=lambda mode, size, data: PilImageStub(mode, size, data=data),
-            )
+def test_convert_honours_page_selector(tmp_path, fitz_stub):
+    fitz_stub.open = lambda path: MultiPageDocument(Path(path))
+    ai_file = tmp_path / "pick.ai"
+    ai_file.write_bytes(b"%PDF-1.7 demo body")
 
-    pil_stub = PilStub()
-    real_optional_import = ai_module.optional_import
+    result = AIConverter().convert(ai_file, options=AIOptions(pages="3", fallback=False))
 
-    def fake_optional_import(module, package=None, hint=None):
-        if module == "PIL.Image":
-            return pil_stub
-        return real_optional_import(module, package=package, hint=hint)
+    assert result.read_bytes() == b"PAGE-3"
 
-    ai_file = tmp_path / "bg_color.ai"
+
+def test_convert_pages_rejects_out_of_range_selection(tmp_path, fitz_stub):
+    ai_file = tmp_path / "single.ai"
     ai_file.write_bytes(b"%PDF-1.7 demo body")
-    png_file = tmp_path / "bg_color.png"
 
-    monkeypatch.setattr(ai_module, "optional_import", fake_optional_import)
+    with pytest.raises(ConversionError):
+        AIConverter().convert_pages(ai_file, options=AIOptions(pages="5-6", prefer_method="pymupdf", fallback=False))
+
+
+def test_convert_bytes_renders_from_memory(monkeypatch, fitz_stub):
+    opened = []
+
+    def open_stream(path=None, stream=None, filetype=None):
+        opened.append((path, stream, filetype))
+        return DummyDocument(Path("memory"))
+
+    monkeypatch.setattr(fitz_stub, "open", open_stream)
+    data = b"%PDF-1.7 in-memory body"
 
     converter = AIConverter()
-    result = converter.convert(
-        ai_file,
-        png_file,
-        AIOptions(prefer_method="pymupdf", background_color=(10, 20, 30)),
-    )
+    assert converter.convert_bytes(data) == b"PNG-DATA"
+    assert converter.convert_bytes(memoryview(data)) == b"PNG-DATA"
+    assert converter.convert_bytes(io.BytesIO(data)) == b"PNG-DATA"
+    assert opened == [(None, data, "pdf")] * 3
 
-    assert result == png_file
-    assert png_file.read_bytes() == b"PYMUPDF-BG"
+
+def test_document_cache_replays_page_display_lists(tmp_path, fitz_stub):
+    recorded = []
+
+    class DisplayList:
+        def __init__(self, number: int) -> None:
+            self.number = number
+            self.rect = DummyPage().rect
+
+        def get_pixmap(self, matrix, alpha=False, clip=None):
+            return MultiPagePixmap(self.number, alpha=alpha)
+
+    class RecordingDocument(MultiPageDocument):
+        def __getitem__(self, index: int) -> DummyPage:
+            page = super().__getitem__(index)
+            page.get_displaylist = lambda: recorded.append(index + 1) or DisplayList(index + 1)
+            return page
+
+    fitz_stub.open = lambda path: RecordingDocument(Path(path))
+    ai_file = tmp_path / "preview.ai"
+    ai_file.write_bytes(b"%PDF-1.7 demo body")
+    converter = AIConverter(documents=DocumentCache())
+
+    for dpi in (36, 72, 144):
+        converter.convert(ai_file, tmp_path / f"thumb-{dpi}.png", AIOptions(dpi=dpi, pages="2", fallback=False))
+    converter.convert(ai_file, tmp_path / "other.png", AIOptions(pages="3", fallback=False))
+
+    assert recorded == [2, 3]
+    assert (tmp_path / "thumb-144.png").read_bytes() == b"PAGE-2"
+    assert converter.documents.stats().hits == 2
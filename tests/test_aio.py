@@ -0,0 +1,95 @@
+"""Unit tests for the asyncio conversion API."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import pickle
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import vector2png.aio as aio_module
+import vector2png.batch as batch_module
+from vector2png.converters.dxf import DXFConverter
+from vector2png.exceptions import DependencyMissingError
+
+
+class StagedConverter(DXFConverter):
+    """DXF converter stub that reports one stage and which document cache it used."""
+
+    def convert(self, source, target=None, options=None):
+        with self.stage("convert", source, cached=self.documents is not None):
+            output = Path(target) if target else Path(source).with_suffix(".png")
+            output.write_bytes(b"PNG")
+        return output
+
+
+@pytest.fixture
+def thread_executor(stub_converter):
+    stub_converter.delay = 0.2
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def make_files(tmp_path, *names):
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_text("x")
+        paths.append(path)
+    return paths
+
+
+def test_convert_many_streams_results_as_completed(tmp_path, thread_executor):
+    sources = make_files(tmp_path, "slow.dxf", "fast.ai", "broken.dxf")
+
+    async def collect():
+        return [r async for r in aio_module.convert_many(sources, concurrency=3, executor=thread_executor)]
+
+    results = asyncio.run(collect())
+
+    assert results[-1].source.name == "slow.dxf"
+    by_name = {r.source.name: r for r in results}
+    assert by_name["fast.ai"].ok
+    assert "cannot render" in by_name["broken.dxf"].error
+
+
+def test_aconvert_times_out(tmp_path, thread_executor, monkeypatch):
+    monkeypatch.setattr(aio_module, "_TIMEOUT_GRACE", 0.0)
+    (source,) = make_files(tmp_path, "slow.dxf")
+
+    async def run():
+        return await DXFConverter().aconvert(source, timeout=0.05, executor=thread_executor)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+
+@pytest.mark.parametrize("pool", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_aconvert_reports_stages_to_the_converters_observers(tmp_path, monkeypatch, pool):
+    if pool is ProcessPoolExecutor and multiprocessing.get_start_method() != "fork":
+        pytest.skip("workers must inherit the stub converter")
+    warm = StagedConverter(documents=object())
+    monkeypatch.setattr(batch_module, "_CONVERTERS", {("dxf", None): warm})
+    (source,) = make_files(tmp_path, "plan.dxf")
+    events = []
+    converter = DXFConverter(observers=[types.SimpleNamespace(on_stage=events.append)])
+
+    async def run():
+        with pool(max_workers=1) as executor:
+            return await converter.aconvert(source, executor=executor)
+
+    assert asyncio.run(run()) == tmp_path / "plan.png"
+    assert [(event.kind, event.stage, event.attributes["cached"]) for event in events] == [("dxf", "convert", False)]
+    assert warm.observers == [] and warm.documents is not None
+
+
+def test_dependency_error_survives_pickling():
+    error = pickle.loads(pickle.dumps(DependencyMissingError("ezdxf", "pip install ezdxf")))
+
+    assert error.package == "ezdxf"
+    assert str(error) == "Dependency 'ezdxf' is required for this operation. pip install ezdxf"
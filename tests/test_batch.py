@@ -0,0 +1,104 @@
+"""Unit tests for batch conversion helpers."""
+
+from __future__ import annotations
+
+import multiprocessing
+
+import pytest
+
+from vector2png.batch import convert_batch, expand_sources, infer_kind, summarize
+from vector2png.exceptions import ConversionError
+
+
+def test_expand_sources_handles_globs_and_directories(tmp_path):
+    for name in ("b.ai", "a.dxf", "notes.txt"):
+        (tmp_path / name).write_text("x")
+
+    from_dir = expand_sources(tmp_path)
+    from_glob = expand_sources([str(tmp_path / "*.ai"), tmp_path / "b.ai"])
+
+    assert [p.name for p in from_dir] == ["a.dxf", "b.ai"]
+    assert [p.name for p in from_glob] == ["b.ai"]
+
+
+def test_infer_kind_rejects_unknown_suffix():
+    assert infer_kind("drawing.DXF") == "dxf"
+    with pytest.raises(ConversionError):
+        infer_kind("image.svg")
+
+
+def test_convert_batch_collects_errors_and_reuses_converters(tmp_path, stub_converter):
+    sources = []
+    for name in ("one.ai", "broken.ai", "plan.dxf", "two.ai", "readme.txt"):
+        path = tmp_path / name
+        path.write_text("x")
+        sources.append(path)
+
+    results = convert_batch(sources, output_dir=tmp_path / "out", workers=1)
+
+    assert [r.source.name for r in results] == [p.name for p in sources]
+    assert [r.ok for r in results] == [True, False, True, True, False]
+    assert "cannot render" in results[1].error
+    assert "Unsupported input type" in results[4].error
+    assert results[0].target == tmp_path / "out" / "one.png"
+    assert stub_converter.names == ["one.ai", "broken.ai", "plan.dxf", "two.ai"]
+    assert summarize(results)["failed"] == 2
+
+
+def test_convert_batch_keeps_relative_paths_and_reports_collisions(tmp_path, stub_converter):
+    sources = []
+    for name in ("a/plan.dxf", "b/plan.dxf", "b/plan.ai", "b/deep/plan.dxf"):
+        path = tmp_path / "in" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+        sources.append(path)
+
+    results = convert_batch(sources, output_dir=tmp_path / "out", workers=1)
+
+    out = tmp_path / "out"
+    expected = [out / "a" / "plan.png", out / "b" / "plan.png", out / "b" / "plan.png", out / "b" / "deep" / "plan.png"]
+    assert [r.target for r in results] == expected
+    assert [r.ok for r in results] == [True, True, False, True]
+    assert str(sources[1]) in results[2].error
+    assert stub_converter.calls == [sources[0], sources[1], sources[3]]
+
+
+def test_convert_batch_reports_sources_sharing_a_png_next_to_them(tmp_path, stub_converter):
+    sources = []
+    for name in ("plan.dxf", "plan.ai"):
+        path = tmp_path / name
+        path.write_text("x")
+        sources.append(path)
+
+    results = convert_batch(sources, workers=1)
+
+    assert [r.ok for r in results] == [True, False]
+    assert str(sources[0]) in results[1].error
+    assert stub_converter.calls == [sources[0]]
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="workers must inherit the stub converter")
+def test_convert_batch_survives_a_worker_process_dying(tmp_path, stub_converter):
+    sources = []
+    for name in ("a.dxf", "crash.dxf", "b.dxf", "c.dxf"):
+        path = tmp_path / name
+        path.write_text("x")
+        sources.append(path)
+
+    results = convert_batch(sources, output_dir=tmp_path / "out", workers=2)
+
+    assert [r.source for r in results] == sources
+    assert [r.ok for r in results] == [True, False, True, True]
+    assert "Worker process died" in results[1].error
+    assert (tmp_path / "out" / "c.png").exists()
+
+
+def test_convert_batch_enforces_per_file_timeout(tmp_path, stub_converter):
+    stub_converter.delay = 1.0
+    source = tmp_path / "slow.dxf"
+    source.write_text("x")
+
+    (result,) = convert_batch([source], workers=1, timeout=0.05)
+
+    assert not result.ok
+    assert "timed out" in result.error
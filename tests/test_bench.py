@@ -0,0 +1,40 @@
+"""Tests for the benchmark corpus generator and report."""
+
+from __future__ import annotations
+
+import json
+
+from vector2png.bench import CorpusSpec, generate_corpus, percentile, run_benchmark
+from vector2png.converters.ai import AIConverter
+
+
+def test_generate_corpus_writes_pdf_and_dxf(tmp_path):
+    corpus = generate_corpus(tmp_path, CorpusSpec(files=2, pages=3, entities=40, text_density=0.5))
+
+    assert [path.name for path in corpus.ai_files] == ["bench-000.ai", "bench-001.ai"]
+    pdf = corpus.ai_files[0].read_bytes()
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    assert b"/Count 3" in pdf and b"Tj ET" in pdf
+    dxf = corpus.dxf_files[1].read_text()
+    assert "ENTITIES" in dxf and dxf.rstrip().endswith("EOF")
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_run_benchmark_reports_latency_and_stages(tmp_path, monkeypatch):
+    corpus = generate_corpus(tmp_path / "corpus", CorpusSpec(files=3, entities=5))
+    monkeypatch.setattr(AIConverter, "convert", lambda self, source, target, opts: target.write_bytes(b"PNG"))
+
+    report = run_benchmark(corpus, dpis=[72], ai_methods=["pymupdf"], include_dxf=False)
+
+    (case,) = report["cases"]
+    assert case["name"] == "ai-pymupdf-72"
+    assert case["errors"] == 0 and case["files"] == 3
+    assert case["files_per_sec"] > 0
+    assert set(case["stages"]) == {"render"}
+    json.dumps(report)
@@ -0,0 +1,84 @@
+"""Unit tests for the on-disk render cache."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from vector2png.cache import RenderCache, parse_size
+from vector2png.converters.base import BaseConverter
+from vector2png.options import DXFOptions
+
+
+class CountingConverter(BaseConverter[DXFOptions]):
+    """Converter that writes the source bytes plus DPI and counts renders."""
+
+    def __init__(self, cache=None) -> None:
+        super().__init__(cache=cache)
+        self.renders = 0
+
+    def convert(self, source, target=None, options=None):
+        opts = options or DXFOptions()
+        source, target = Path(source), Path(target)
+
+        def render():
+            self.renders += 1
+            target.write_bytes(source.read_bytes() + f"@{opts.dpi}".encode())
+
+        self._cached_render(source, target, opts, render)
+        return target
+
+
+def test_cache_hit_skips_rendering(tmp_path):
+    source = tmp_path / "plan.dxf"
+    source.write_bytes(b"DXF")
+    converter = CountingConverter(cache=RenderCache(tmp_path / "cache"))
+
+    converter.convert(source, tmp_path / "a.png", DXFOptions(dpi=72))
+    converter.convert(source, tmp_path / "b.png", DXFOptions(dpi=72))
+    converter.convert(source, tmp_path / "c.png", DXFOptions(dpi=150))
+
+    assert converter.renders == 2
+    assert (tmp_path / "b.png").read_bytes() == b"DXF@72"
+    assert converter.cache.hits == 1
+    assert converter.cache.stats().entries == 2
+
+
+def test_cache_key_tracks_content_changes(tmp_path):
+    source = tmp_path / "plan.dxf"
+    source.write_bytes(b"v1")
+    converter = CountingConverter(cache=RenderCache(tmp_path / "cache"))
+    target = tmp_path / "out.png"
+
+    converter.convert(source, target)
+    source.write_bytes(b"v2")
+    converter.convert(source, target)
+
+    assert converter.renders == 2
+    assert target.read_bytes() == b"v2@300"
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = RenderCache(tmp_path / "cache", max_bytes=10**6)
+    png = tmp_path / "in.png"
+    png.write_bytes(b"x" * 100)
+    for index, key in enumerate(("aa01", "bb02", "cc03")):
+        cache.store(key, png)
+        os.utime(cache.path_for(key), (1000 + index, 1000 + index))
+    os.utime(cache.path_for("aa01"), (5000, 5000))
+
+    removed = cache.prune(max_bytes=200)
+
+    assert removed == 1
+    assert not cache.path_for("bb02").exists()
+    assert cache.path_for("aa01").exists()
+
+
+def test_parse_size_units():
+    assert parse_size("512") == 512
+    assert parse_size("2K") == 2048
+    assert parse_size("1.5G") == int(1.5 * 1024**3)
+    with pytest.raises(ValueError):
+        parse_size("lots")
@@ -0,0 +1,114 @@
+"""Tests for the in-process parsed-document cache."""
+
+from __future__ import annotations
+
+import os
+
+import vector2png.converters.dxf as dxf_module
+from vector2png.converters.dxf import DXFConverter
+from vector2png.documents import DocumentCache
+from vector2png.options import DXFOptions
+
+
+class Document:
+    pass
+
+
+def write(path, size, mtime_ns=1_000_000_000):
+    path.write_bytes(b"0" * size)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_lru_eviction_revival_and_stats(tmp_path):
+    cache = DocumentCache(max_documents=2, max_bytes=250)
+    paths = [write(tmp_path / f"{name}.dxf", 100) for name in "abc"]
+    keys = [cache.key_for(path) for path in paths]
+    kept = [Document() for _ in paths]
+
+    cache.put(keys[0], kept[0])
+    cache.put(keys[1], Document())
+    assert cache.get(keys[0]) is kept[0]
+    cache.put(keys[2], kept[2])  # evicts keys[1], the least recently used
+
+    assert cache.get(keys[1]) is None
+    assert len(cache) == 2
+    cache.put(keys[1], kept[1])  # over both limits: evicts keys[0], still referenced
+    assert cache.get(keys[0]) is kept[0]
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.revived) == (1, 1, 1)
+    assert stats.evictions == 3 and stats.documents == 2 and stats.bytes == 200
+
+
+def test_weighted_entries_are_evicted_once_they_grow(tmp_path):
+    cache = DocumentCache(max_bytes=250)
+    keys = [cache.key_for(write(tmp_path / f"{name}.dxf", 100)) for name in "ab"]
+    growing = Document()
+    growing.cache_weight = 1
+    cache.put(keys[0], growing)
+    cache.put(keys[1], Document())
+
+    growing.cache_weight = 2  # e.g. a session that recorded another layout
+    assert cache.get(keys[1]) is not None
+
+    assert cache.stats().evictions == 1 and len(cache) == 1
+
+
+def test_changed_file_replaces_the_cached_version(tmp_path):
+    cache = DocumentCache()
+    path = write(tmp_path / "plan.dxf", 10)
+    old_key = cache.key_for(path)
+    cache.put(old_key, Document())
+
+    write(path, 12, mtime_ns=2_000_000_000)
+    new_key = cache.key_for(path)
+    assert cache.get(new_key) is None
+    cache.put(new_key, Document())
+
+    assert len(cache) == 1 and cache.get(old_key) is None
+
+
+def test_converter_parses_hot_drawings_once(tmp_path, monkeypatch, dxf_stubs):
+    reads = []
+    readfile = dxf_stubs["ezdxf"].readfile
+    monkeypatch.setattr(dxf_stubs["ezdxf"], "readfile", lambda path: reads.append(path) or readfile(path))
+    source = write(tmp_path / "plan.dxf", 10)
+    converter = DXFConverter(documents=DocumentCache())
+
+    converter.convert(source, tmp_path / "a.png")
+    converter.convert_layout(source, "Layout1", tmp_path / "b.png")
+    converter.convert_multi(source, [72, 150], tmp_path / "c.png")
+    assert len(reads) == 1
+
+    write(source, 11, mtime_ns=2_000_000_000)
+    converter.convert(source, tmp_path / "d.png")
+    assert len(reads) == 2
+    assert converter.documents.stats().hits == 2
+
+
+def test_cached_document_renders_repeat_identically_with_real_ezdxf(tmp_path, monkeypatch, real_drawing):
+    monkeypatch.setattr(dxf_module, "_modules", None)
+    converter = DXFConverter(documents=DocumentCache())
+
+    first = converter.convert(real_drawing, tmp_path / "first.png").read_bytes()
+    second = converter.convert(real_drawing, tmp_path / "second.png").read_bytes()
+
+    assert converter.documents.stats().hits == 1
+    assert second == first
+
+
+def test_session_keeps_the_most_recent_recordings(tmp_path, monkeypatch, dxf_stubs):
+    draws = []
+    frontend = dxf_stubs["ezdxf.addons.drawing"].Frontend
+    monkeypatch.setattr(frontend, "draw_layout", lambda self, layout, filter_func=None: draws.append(layout))
+    source = write(tmp_path / "plan.dxf", 10)
+
+    with DXFConverter().open(source) as session:
+        session.max_recordings = 2
+        for pdsize in (1.0, 2.0, 1.0, 3.0, 1.0):
+            session.render_bytes(DXFOptions(dpi=72, pdsize=pdsize))
+        assert session.cache_weight == 3
+
+    # 3.0 evicts 2.0, the least recently used, so the last render of 1.0 is replayed.
+    assert len(draws) == 3
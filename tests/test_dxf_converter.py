@@ -4,179 +4,227 @@ from __future__ import annotations
 
 import sys
 import types
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
+import vector2png.converters.dxf as dxf_module
 from vector2png.converters.dxf import DXFConverter
 from vector2png.exceptions import ConversionError
 from vector2png.options import DXFOptions
 
 
-class DummyLayout:
-    """Placeholder layout object."""
+def test_dxf_converter_produces_png(tmp_path, dxf_stubs):
+    dxf_file = tmp_path / "mock.dxf"
+    dxf_file.write_text("0\nSECTION\n")
+    png_file = tmp_path / "mock.png"
 
-    def __init__(self, name: str) -> None:
-        self.name = name
+    converter = DXFConverter()
+    result = converter.convert(dxf_file, png_file, DXFOptions(dpi=150, scale=2.0))
 
+    assert result == png_file
+    assert png_file.read_bytes() == b"fmt=png,dpi=150,scale=2.0"
 
-class DummyLayouts:
-    """Lightweight container mimicking ezdxf layouts."""
 
-    def __init__(self) -> None:
-        self._names = {"Model", "Layout1"}
+def test_dxf_converter_reports_missing_layout(tmp_path, dxf_stubs):
+    dxf_file = tmp_path / "layout.dxf"
+    dxf_file.write_text("0\nSECTION\n")
 
-    def __contains__(self, name: str) -> bool:
-        return name in self._names
+    converter = DXFConverter()
 
-    def names(self):  # noqa: D401 - simple pass-through
-        return list(self._names)
+    with pytest.raises(ConversionError):
+        converter.convert(dxf_file, dxf_file.with_suffix(".png"), DXFOptions(layout_name="UNKNOWN"))
 
-    def get(self, name: str) -> DummyLayout:
-        return DummyLayout(name)
 
+def test_session_reuses_recording_across_dpis(tmp_path, monkeypatch, dxf_stubs):
+    backend_cls = dxf_stubs["ezdxf.addons.drawing.pymupdf"].PyMuPdfBackend
+    created = []
+    monkeypatch.setattr(
+        dxf_stubs["ezdxf.addons.drawing.pymupdf"],
+        "PyMuPdfBackend",
+        lambda: created.append(backend_cls()) or created[-1],
+    )
+    dxf_file = tmp_path / "session.dxf"
+    dxf_file.write_text("0\nSECTION\n")
 
-class DummyDoc:
-    """Fake ezdxf document exposing modelspace and layouts."""
+    with DXFConverter().open(dxf_file) as session:
+        low = session.render(tmp_path / "low.png", DXFOptions(dpi=72))
+        high = session.render(tmp_path / "high.png", DXFOptions(dpi=600))
+        mono = session.render(tmp_path / "mono.png", DXFOptions(dpi=72, color_policy="monochrome"))
 
-    def __init__(self, path: Path) -> None:
-        self.path = path
-        self.layouts = DummyLayouts()
-        self.header = {"$PDSIZE": 0}
+    assert low.read_bytes() == b"fmt=png,dpi=72,scale=1.0"
+    assert high.read_bytes() == b"fmt=png,dpi=600,scale=1.0"
+    assert mono.exists()
+    assert len(created) == 2
 
-    def modelspace(self) -> DummyLayout:
-        return DummyLayout("Model")
 
+def test_converters_share_modules_and_bounded_config_cache(dxf_stubs):
+    first, second = DXFConverter(), DXFConverter()
+    assert first._load_modules() is second._load_modules()
 
-def register_dxf_stubs(monkeypatch):
-    """Register DXF-related stub modules inside sys.modules."""
+    config_module = dxf_stubs["ezdxf.addons.drawing.config"]
+    cfg = first._get_config(config_module, DXFOptions(background="black"), 2.0)
+    assert second._get_config(config_module, DXFOptions(background="black", dpi=600), 2.0) is cfg
+    assert cfg.kwargs["pdsize"] == 2.0 and cfg.kwargs["background_policy"].name == "black"
+    assert first._get_config(config_module, DXFOptions(background="black"), 1.0) is not cfg
+    assert dxf_module.drawing_config.cache_info().maxsize == dxf_module.CONFIG_CACHE_SIZE
 
-    ezdxf_mod = types.ModuleType("ezdxf")
-    ezdxf_mod.readfile = lambda path: DummyDoc(Path(path))
 
-    addons_pkg = types.ModuleType("ezdxf.addons")
-    addons_pkg.__path__ = []
+def test_convert_all_layouts_parses_once(tmp_path, monkeypatch, dxf_stubs):
+    reads = []
+    original_readfile = dxf_stubs["ezdxf"].readfile
+    monkeypatch.setattr(dxf_stubs["ezdxf"], "readfile", lambda path: reads.append(path) or original_readfile(path))
+    dxf_file = tmp_path / "sheets.dxf"
+    dxf_file.write_text("0\nSECTION\n")
 
-    drawing_pkg = types.ModuleType("ezdxf.addons.drawing")
-    drawing_pkg.__path__ = []
+    outputs = DXFConverter().convert_all_layouts(dxf_file, tmp_path / "out")
 
-    class DummyRenderContext:
-        def __init__(self, _doc):
-            pass
+    assert sorted(outputs) == ["Layout1", "Model"]
+    assert outputs["Layout1"] == tmp_path / "out" / "sheets-Layout1.png"
+    assert len(reads) == 1
 
-    class DummyFrontend:
-        def __init__(self, _ctx, _backend, config=None):
-            self.config = config
 
-        def draw_layout(self, _layout):
-            return None
+def test_convert_multi_rasterizes_each_dpi_from_one_draw(tmp_path, monkeypatch, dxf_stubs):
+    draws = []
+    frontend_cls = dxf_stubs["ezdxf.addons.drawing"].Frontend
+    monkeypatch.setattr(frontend_cls, "draw_layout", lambda self, layout: draws.append(layout))
+    dxf_file = tmp_path / "multi.dxf"
+    dxf_file.write_text("0\nSECTION\n")
 
-    drawing_pkg.RenderContext = DummyRenderContext
-    drawing_pkg.Frontend = DummyFrontend
+    from vector2png.options import OutputSpec
 
-    layout_mod = types.ModuleType("ezdxf.addons.drawing.layout")
-    layout_mod.__path__ = []
+    outputs = DXFConverter().convert_multi(
+        dxf_file,
+        [72, 150, OutputSpec(dpi=600, target=tmp_path / "print.png")],
+    )
 
-    class DummyMargins:
-        def __init__(self, value: float) -> None:
-            self.value = value
+    assert [p.name for p in outputs] == ["multi-72dpi.png", "multi-150dpi.png", "print.png"]
+    assert outputs[2].read_bytes() == b"fmt=png,dpi=600,scale=1.0"
+    assert len(draws) == 1
 
-        @classmethod
-        def all(cls, value: float):
-            return cls(value)
 
-    class DummyUnits:
-        mm = "mm"
+def test_convert_bytes_reads_stream_with_header_encoding(monkeypatch, dxf_stubs):
+    lldxf_pkg = types.ModuleType("ezdxf.lldxf")
+    lldxf_pkg.__path__ = []
+    validator_mod = types.ModuleType("ezdxf.lldxf.validator")
+    validator_mod.dxf_info = lambda _stream: types.SimpleNamespace(encoding="cp1251")
+    monkeypatch.setitem(sys.modules, "ezdxf.lldxf", lldxf_pkg)
+    monkeypatch.setitem(sys.modules, "ezdxf.lldxf.validator", validator_mod)
 
-    class DummyPage:
-        def __init__(self, **kwargs):
-            self.kwargs = kwargs
+    converter = DXFConverter()
+    data = "0\nSECTION\n999\nПривет\n".encode("cp1251")
 
-    class DummySettings:
-        def __init__(self, scale: float, fit_page: bool) -> None:
-            self.scale = scale
-            self.fit_page = fit_page
+    assert converter.convert_bytes(memoryview(data), DXFOptions(dpi=96)) == b"fmt=png,dpi=96,scale=1.0"
+    with converter.open_bytes(data) as session:
+        assert session.doc.path == Path("0\nSECTION\n999\nПривет\n")
+        with pytest.raises(ConversionError):
+            session.render()
 
-    layout_mod.Margins = DummyMargins
-    layout_mod.Units = DummyUnits
-    layout_mod.Page = DummyPage
-    layout_mod.Settings = DummySettings
 
-    config_mod = types.ModuleType("ezdxf.addons.drawing.config")
-    config_mod.__path__ = []
+def test_observers_receive_each_stage(tmp_path, dxf_stubs):
+    dxf_file = tmp_path / "profiled.dxf"
+    dxf_file.write_text("0\nSECTION\n")
+    events = []
+    observer = types.SimpleNamespace(on_stage=events.append)
 
-    class DummyPolicy:
-        def __init__(self, name: str) -> None:
-            self.name = name
+    DXFConverter(observers=[observer]).convert(dxf_file, tmp_path / "profiled.png", DXFOptions(dpi=150))
 
-    class DummyConfiguration:
-        def __init__(self, **kwargs):
-            self.kwargs = kwargs
+    assert [event.stage for event in events] == ["read", "draw", "rasterize", "write"]
+    assert events[0].attributes["entities"] == 2
+    assert events[2].attributes["dpi"] == 150
+    assert events[3].attributes["bytes"] == len(b"fmt=png,dpi=150,scale=1.0")
+    assert all(event.kind == "dxf" and event.duration >= 0 for event in events)
 
-        def with_changes(self, **changes):
-            data = dict(self.kwargs)
-            data.update(changes)
-            return DummyConfiguration(**data)
 
-    config_mod.Configuration = DummyConfiguration
-    config_mod.BackgroundPolicy = types.SimpleNamespace(
-        WHITE=DummyPolicy("white"),
-        BLACK=DummyPolicy("black"),
-        DEFAULT=DummyPolicy("default"),
-        OFF=DummyPolicy("off"),
-    )
-    config_mod.ColorPolicy = types.SimpleNamespace(
-        COLOR=DummyPolicy("color"),
-        BLACK=DummyPolicy("black"),
-        WHITE=DummyPolicy("white"),
-        MONOCHROME=DummyPolicy("mono"),
-    )
+def test_normalize_relative_sizes_rewrites_only_marked_mtext():
+    class MText:
+        def __init__(self, text, char_height=2.0):
+            self.text = text
+            self.dxf = types.SimpleNamespace(char_height=char_height)
 
-    pymupdf_mod = types.ModuleType("ezdxf.addons.drawing.pymupdf")
+    marked = MText(r"{\H0.5x;small} and \H3x big")
+    plain = MText("no markers")
+    absolute = MText(r"\H4;already absolute")
+    queried = []
 
-    class DummyBackend:
-        def get_pixmap_bytes(self, _page, fmt: str, settings, dpi: int):  # noqa: D401
-            payload = f"fmt={fmt},dpi={dpi},scale={settings.scale}".encode()
-            return payload
+    class Doc:
+        header = {"$TEXTSIZE": 2.5}
 
-    pymupdf_mod.PyMuPdfBackend = DummyBackend
+        def query(self, selector):
+            queried.append(selector)
+            return [marked, plain, absolute]
 
-    modules = {
-        "ezdxf": ezdxf_mod,
-        "ezdxf.addons": addons_pkg,
-        "ezdxf.addons.drawing": drawing_pkg,
-        "ezdxf.addons.drawing.layout": layout_mod,
-        "ezdxf.addons.drawing.config": config_mod,
-        "ezdxf.addons.drawing.pymupdf": pymupdf_mod,
-    }
+    assert DXFConverter()._normalize_relative_point_sizes(Doc()) == 1
+    assert queried == ["MTEXT"]
+    assert marked.text == r"{\H1;small} and \H6; big"
+    assert plain.text == "no markers" and absolute.text == r"\H4;already absolute"
 
-    for name, module in modules.items():
-        monkeypatch.setitem(sys.modules, name, module)
 
-    addons_pkg.drawing = drawing_pkg
+def test_expand_relative_heights_is_picklable_for_workers():
+    import pickle
 
-    return modules
+    worker = pickle.loads(pickle.dumps(dxf_module.expand_relative_heights))
+    assert worker([("\\H2x;x", 1.5), ("plain", 1.0)]) == ["\\H3;x", None]
 
 
-def test_dxf_converter_produces_png(tmp_path, monkeypatch):
-    register_dxf_stubs(monkeypatch)
-    dxf_file = tmp_path / "mock.dxf"
+def test_entity_filters_are_passed_to_the_frontend(tmp_path, dxf_stubs):
+
+    class Entity:
+        def __init__(self, kind, layer):
+            self.kind = kind
+            self.dxf = types.SimpleNamespace(layer=layer)
+
+        def dxftype(self):
+            return self.kind
+
+    dxf_file = tmp_path / "site.dxf"
     dxf_file.write_text("0\nSECTION\n")
-    png_file = tmp_path / "mock.png"
 
-    converter = DXFConverter()
-    result = converter.convert(dxf_file, png_file, DXFOptions(dpi=150, scale=2.0))
+    with DXFConverter().open(dxf_file) as session:
+        session.render(tmp_path / "all.png", DXFOptions(dpi=72))
+        opts = DXFOptions(dpi=72, layers=("walls", "hidden"), exclude_layers=("HIDDEN",), entity_types=("line",))
+        session.render(tmp_path / "filtered.png", opts)
+        session.render(tmp_path / "filtered-hi.png", replace(opts, dpi=300))
 
-    assert result == png_file
-    assert png_file.read_bytes() == b"fmt=png,dpi=150,scale=2.0"
+    unfiltered, accept = dxf_stubs["ezdxf.addons.drawing"].filters
+    assert unfiltered is None
+    assert accept(Entity("LINE", "Walls"))
+    assert not accept(Entity("CIRCLE", "WALLS"))
+    assert not accept(Entity("LINE", "DOORS"))
+    assert not accept(Entity("LINE", "hidden"))
 
 
-def test_dxf_converter_reports_missing_layout(tmp_path, monkeypatch):
-    register_dxf_stubs(monkeypatch)
-    dxf_file = tmp_path / "layout.dxf"
-    dxf_file.write_text("0\nSECTION\n")
+def test_session_renders_match_fresh_renders_with_real_ezdxf(monkeypatch, real_drawing):
+    monkeypatch.setattr(dxf_module, "_modules", None)
+    expected = {dpi: DXFConverter().convert_bytes(real_drawing.read_bytes(), DXFOptions(dpi=dpi)) for dpi in (36, 50)}
 
+    with DXFConverter().open(real_drawing) as session:
+        rendered = [session.render_bytes(DXFOptions(dpi=dpi)) for dpi in (50, 36, 50)]
+
+    assert rendered == [expected[50], expected[36], expected[50]]
+    assert dxf_module.png_dimensions(expected[36]) != dxf_module.png_dimensions(expected[50])
+
+
+@pytest.mark.parametrize("dpis", [(36, 50), (50, 36)])
+def test_convert_multi_sizes_do_not_depend_on_order_with_real_ezdxf(monkeypatch, dpis, real_drawing):
+    monkeypatch.setattr(dxf_module, "_modules", None)
     converter = DXFConverter()
+    expected = {
+        dpi: dxf_module.png_dimensions(converter.convert_bytes(real_drawing.read_bytes(), DXFOptions(dpi=dpi)))
+        for dpi in dpis
+    }
 
-    with pytest.raises(ConversionError):
-        converter.convert(dxf_file, dxf_file.with_suffix(".png"), DXFOptions(layout_name="UNKNOWN"))
+    outputs = converter.convert_multi(real_drawing, list(dpis))
+
+    assert [dxf_module.png_dimensions(path.read_bytes()) for path in outputs] == [expected[dpi] for dpi in dpis]
+
+
+def test_banded_render_matches_regular_render_with_real_ezdxf(tmp_path, monkeypatch, real_drawing):
+    monkeypatch.setattr(dxf_module, "_modules", None)
+
+    with DXFConverter().open(real_drawing) as session:
+        regular = session.render_bytes(DXFOptions(dpi=50))
+        banded = session.render(tmp_path / "banded.png", DXFOptions(dpi=50, tile_size=16))
+
+    assert dxf_module.png_dimensions(banded.read_bytes()) == dxf_module.png_dimensions(regular)
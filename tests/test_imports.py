@@ -0,0 +1,45 @@
+"""Tests that importing the CLI stays cheap and lazy."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ("fitz", "ezdxf", "PIL", "pdf2image", "vector2png.converters.ai", "vector2png.converters.dxf")
+
+# Generous so slow CI machines pass; an eager PyMuPDF/ezdxf import alone costs more.
+STARTUP_BUDGET_SECONDS = 0.5
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import vector2png.cli
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "loaded": sorted(name for name in %r if name in sys.modules)}))
+"""
+
+
+def run_probe():
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE % (HEAVY_MODULES,)], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def test_cli_import_defers_rendering_stacks():
+    assert run_probe()["loaded"] == []
+
+
+def test_cli_import_fits_startup_budget():
+    # Best of three runs to ignore a cold filesystem cache.
+    elapsed = min(run_probe()["elapsed"] for _ in range(3))
+    assert elapsed < STARTUP_BUDGET_SECONDS
+
+
+def test_lazy_attributes_resolve_on_access():
+    import vector2png
+
+    assert vector2png.AIConverter.__name__ == "AIConverter"
+    assert vector2png.RenderCache.__name__ == "RenderCache"
+    assert "DXFDocumentSession" in dir(vector2png)
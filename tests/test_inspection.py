@@ -0,0 +1,135 @@
+"""Tests for metadata inspection without rendering."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+import types
+
+from vector2png import cli
+from vector2png.inspection import inspect, inspect_many
+
+
+def dxf_text(*sections):
+    tags = []
+    for name, body in sections:
+        tags += [(0, "SECTION"), (2, name), *body, (0, "ENDSEC")]
+    tags.append((0, "EOF"))
+    return "".join(f"{code}\n{value}\n" for code, value in tags)
+
+
+HEADER = (
+    "HEADER",
+    [
+        (9, "$ACADVER"), (1, "AC1032"),
+        (9, "$INSUNITS"), (70, "4"),
+        (9, "$EXTMIN"), (10, "0.0"), (20, "-5.0"), (30, "0.0"),
+        (9, "$EXTMAX"), (10, "100.0"), (20, "50.0"), (30, "0.0"),
+    ],
+)
+BLOCKS = (
+    "BLOCKS",
+    [
+        (0, "BLOCK"), (8, "0"), (2, "DOOR"),
+        (0, "LINE"), (8, "DOORS"),
+        (0, "ARC"), (8, "DOORS"),
+        (0, "ENDBLK"),
+        (0, "BLOCK"), (8, "0"), (2, "*Paper_Space0"),
+        (0, "TEXT"), (8, "TITLE"), (1, "Sheet 2"),
+        (0, "ENDBLK"),
+    ],
+)
+ENTITIES = (
+    "ENTITIES",
+    [
+        (0, "LINE"), (8, "WALLS"),
+        (0, "LWPOLYLINE"), (8, "WALLS"),
+        (0, "MTEXT"), (8, "NOTES"), (1, "Küche"),
+        (0, "INSERT"), (8, "DOORS"), (2, "DOOR"),
+        (0, "ATTRIB"), (8, "DOORS"), (1, "D1"),
+        (0, "SEQEND"), (8, "DOORS"),
+    ],
+)
+OBJECTS = (
+    "OBJECTS",
+    [
+        (0, "LAYOUT"), (100, "AcDbPlotSettings"), (1, "Setup"), (100, "AcDbLayout"), (1, "Sheet"), (71, "1"),
+        (0, "LAYOUT"), (100, "AcDbPlotSettings"), (1, ""), (100, "AcDbLayout"), (1, "Model"), (71, "0"),
+    ],
+)
+
+
+def test_inspect_dxf_counts_entities_without_ezdxf(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "ezdxf", None)
+    source = tmp_path / "plan.dxf"
+    source.write_text(dxf_text(HEADER, BLOCKS, ENTITIES, OBJECTS), encoding="utf-8")
+
+    result = inspect(source)
+
+    assert (result.kind, result.format, result.version, result.units) == ("dxf", "ascii", "AC1032", 4)
+    assert result.extents == (0.0, -5.0, 100.0, 50.0)
+    assert result.layouts == ["Model", "Sheet"]
+    assert result.layers == {"WALLS": 2, "NOTES": 1, "DOORS": 1, "TITLE": 1}
+    assert (result.entities, result.texts) == (5, 3)
+    assert result.cost == 7  # the INSERT draws the two entities of its block
+
+
+def test_inspect_header_only_stops_after_header(tmp_path):
+    source = tmp_path / "plan.dxf.gz"
+    # A truncated file: nothing after the header needs to be readable.
+    source.write_bytes(gzip.compress(dxf_text(HEADER).encode() + b"0\nSECTION\n2\nENTITIES\nnot a code\n"))
+
+    result = inspect(source, header_only=True)
+
+    assert (result.format, result.version, result.extents) == ("gzip", "AC1032", (0.0, -5.0, 100.0, 50.0))
+    assert result.entities is None and result.layouts == []
+
+
+def test_inspect_ai_reads_page_boxes_lazily(tmp_path, monkeypatch):
+    class Document:
+        page_count = 2
+        metadata = {"format": "PDF 1.6"}
+
+        def page_cropbox(self, index):
+            return types.SimpleNamespace(width=600.0 + index, height=400.0)
+
+        def page_xref(self, index):
+            return 10 + index
+
+        def xref_get_key(self, xref, key):
+            if key == "Contents":
+                return ("xref", "20 0 R") if xref == 10 else ("array", "[21 0 R 22 0 R]")
+            return "int", str(xref * 10)
+
+        def __getitem__(self, index):
+            raise AssertionError("pages must not be loaded")
+
+        def close(self):
+            pass
+
+    monkeypatch.setitem(sys.modules, "fitz", types.SimpleNamespace(open=lambda path: Document()))
+    source = tmp_path / "poster.ai"
+    source.write_bytes(b"%PDF-1.6 body")
+
+    result = inspect(source)
+
+    assert (result.kind, result.format, result.version) == ("ai", "pdf", "PDF 1.6")
+    pages = [(page.number, page.width, page.content_bytes) for page in result.pages]
+    assert pages == [(1, 600.0, 200), (2, 601.0, 430)]
+    assert result.cost == 630
+
+
+def test_info_command_writes_json_lines(tmp_path, capsys):
+    (tmp_path / "plan.dxf").write_text(dxf_text(HEADER, ENTITIES), encoding="utf-8")
+    (tmp_path / "legacy.ai").write_bytes(b"%!PS-Adobe-3.0\n%%BoundingBox: 0 0 612 792\n%%EndComments\n")
+    (tmp_path / "broken.dxf").write_text("oops\n", encoding="utf-8")
+
+    assert cli.main(["info", str(tmp_path)]) == 1
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    by_name = {line["source"].rsplit("/", 1)[-1]: line for line in lines}
+    assert by_name["plan.dxf"]["layers"] == {"WALLS": 2, "NOTES": 1, "DOORS": 1}
+    assert by_name["legacy.ai"]["pages"] == [{"number": 1, "width": 612.0, "height": 792.0, "content_bytes": None}]
+    assert "Malformed DXF group code" in by_name["broken.dxf"]["error"]
+    assert [item.ok for item in inspect_many(tmp_path / "plan.dxf")] == [True]
@@ -0,0 +1,120 @@
+"""Tests for level-of-detail simplification."""
+
+from __future__ import annotations
+
+import sys
+import types
+
+import pytest
+
+from vector2png.converters.dxf import DXFConverter
+from vector2png.lod import simplify_entities, units_per_pixel
+from vector2png.options import DXFOptions
+
+
+class Attribs:
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+    def hasattr(self, name):
+        return name in self.__dict__
+
+    def get(self, name):
+        return self.__dict__[name]
+
+
+class Entity:
+    def __init__(self, kind, handle, box, **dxfattribs):
+        self.kind = kind
+        self.box = box
+        self.dxf = Attribs(**{"handle": handle, "layer": "0", **dxfattribs})
+
+    def dxftype(self):
+        return self.kind
+
+
+class Polyline(Entity):
+    def __init__(self, handle="P", points=(), dxfattribs=None):
+        super().__init__("LWPOLYLINE", handle, None, **(dxfattribs or {}))
+        self.points = list(points)
+        self.closed = False
+
+    @classmethod
+    def new(cls, dxfattribs=None):
+        return cls(dxfattribs=dxfattribs)
+
+    def __len__(self):
+        return len(self.points)
+
+    def get_points(self, format):
+        return list(self.points)
+
+    def set_points(self, points, format):
+        self.points = [tuple(point) + (0, 0, 0)[: 5 - len(point)] for point in points]
+
+    def copy(self):
+        return Polyline(self.dxf.handle, self.points)
+
+
+def test_units_per_pixel_follows_dpi_and_page_fit():
+    extents = (0, 0, 1000, 500)
+
+    assert units_per_pixel(extents, DXFOptions(dpi=254)) == pytest.approx(0.1)
+    # A 100 mm wide page shrinks 1000 mm of drawing tenfold.
+    assert units_per_pixel(extents, DXFOptions(dpi=254, page_width=100, margins=0)) == pytest.approx(1.0)
+    assert units_per_pixel(extents, DXFOptions(dpi=254, max_width=2000)) == pytest.approx(0.1)
+    assert units_per_pixel(None, DXFOptions()) is None
+
+
+def test_simplify_drops_boxes_and_decimates():
+    dot = Entity("LINE", "1", (0, 0, 0.5, 0.5))
+    point = Entity("POINT", "2", (5, 5, 5, 5))
+    label = Entity("TEXT", "3", (10, 10, 40, 12), height=2, color=3)
+    title = Entity("MTEXT", "4", (10, 20, 90, 40), char_height=20)
+    zigzag = Polyline("5", [(x * 0.2, 0, 0, 0, 0) for x in range(50)])
+    arcs = Polyline("6", [(x, 0, 0, 0, 0.5) for x in range(10)])
+
+    entities, stats = simplify_entities(
+        [dot, point, label, title, zigzag, arcs],
+        lambda entity: entity.box,
+        pixel=1.0,
+        threshold=1.0,
+        text_height=4.0,
+        lwpolyline=Polyline,
+    )
+
+    assert [entity.dxf.handle for entity in entities] == ["2", "3", "4", "5", "6"]
+    outline = entities[1]
+    assert isinstance(outline, Polyline) and outline.closed and outline.dxf.color == 3
+    assert [point[:2] for point in outline.points] == [(10, 10), (40, 10), (40, 12), (10, 12)]
+    assert entities[2] is title
+    assert len(entities[3]) == 11 and len(zigzag) == 50
+    assert entities[4] is arcs
+    assert (stats.dropped, stats.boxed, stats.decimated, stats.removed_vertices) == (1, 1, 1, 39)
+
+
+def test_lod_render_draws_simplified_layout(tmp_path, monkeypatch, dxf_stubs):
+    entities = [Entity("LINE", "1", (0, 0, 1000, 1000)), Entity("LINE", "2", (0, 0, 0.01, 0.01))]
+    doc = dxf_stubs["ezdxf"].readfile(str(tmp_path / "plan.dxf"))
+    doc.modelspace = lambda: entities
+    monkeypatch.setattr(dxf_stubs["ezdxf"], "readfile", lambda path: doc)
+    drawn = []
+    frontend = dxf_stubs["ezdxf.addons.drawing"].Frontend
+    monkeypatch.setattr(frontend, "draw_layout", lambda self, layout, filter_func=None: drawn.append(layout))
+    bbox_mod = types.ModuleType("ezdxf.bbox")
+    bbox_mod.extents = lambda items, fast=False: types.SimpleNamespace(
+        has_data=True,
+        extmin=types.SimpleNamespace(x=items[0].box[0], y=items[0].box[1]),
+        extmax=types.SimpleNamespace(x=items[0].box[2], y=items[0].box[3]),
+    )
+    monkeypatch.setitem(sys.modules, "ezdxf.bbox", bbox_mod)
+    monkeypatch.setitem(sys.modules, "ezdxf.entities", types.SimpleNamespace(LWPolyline=Polyline))
+    (tmp_path / "plan.dxf").write_text("0\nSECTION\n")
+
+    with DXFConverter().open(tmp_path / "plan.dxf") as session:
+        session.render(tmp_path / "a.png", DXFOptions(dpi=72, lod=True))
+        session.render(tmp_path / "b.png", DXFOptions(dpi=72, lod=True))
+        session.render(tmp_path / "c.png", DXFOptions(dpi=144, lod=True))
+
+    assert len(drawn) == 2  # same resolution reuses the recording
+    assert [entity.dxf.handle for entity in drawn[0]] == ["1"]
@@ -0,0 +1,65 @@
+"""Tests for stage events and metric exporters."""
+
+from __future__ import annotations
+
+import io
+import json
+import types
+
+import pytest
+
+from vector2png.metrics import JSONLinesExporter, PrometheusExporter, StageEvent
+
+
+def test_jsonlines_exporter_writes_one_object_per_event():
+    stream = io.StringIO()
+    exporter = JSONLinesExporter(stream)
+
+    exporter.on_stage(
+        StageEvent(kind="dxf", stage="draw", duration=0.5, source="a.dxf", attributes={"layout": "Model"})
+    )
+    exporter.on_stage(StageEvent(kind="ai", stage="convert", duration=1.0, attributes={"method": "pymupdf"}))
+
+    first, second = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert first["stage"] == "draw" and first["layout"] == "Model" and first["source"] == "a.dxf"
+    assert second["method"] == "pymupdf"
+
+
+def test_prometheus_exporter_aggregates_stages(tmp_path):
+    exporter = PrometheusExporter()
+    exporter.on_stage(StageEvent(kind="dxf", stage="write", duration=0.25, attributes={"bytes": 100}))
+    exporter.on_stage(StageEvent(kind="dxf", stage="write", duration=0.75, attributes={"bytes": 50}))
+    exporter.on_stage(StageEvent(kind="ai", stage="convert", duration=1.0, attributes={"method": "pdf2image"}))
+    exporter.on_stage(StageEvent(kind="ai", stage="open", duration=0.1, error="ConversionError: bad"))
+
+    text = exporter.write(tmp_path / "metrics.prom").read_text()
+    assert 'vector2png_stage_seconds_sum{kind="dxf",stage="write"} 1.000000' in text
+    assert 'vector2png_stage_seconds_count{kind="dxf",stage="write"} 2' in text
+    assert 'vector2png_bytes_total{kind="dxf",stage="write"} 150' in text
+    assert 'vector2png_method_total{kind="ai",method="pdf2image"} 1' in text
+    assert 'vector2png_stage_errors_total{kind="ai",stage="open"} 1' in text
+
+
+def test_prometheus_exporter_renders_large_totals_exactly():
+    exporter = PrometheusExporter()
+    exporter.on_stage(StageEvent(kind="dxf", stage="write", duration=0.1, attributes={"bytes": 1_234_567_891}))
+    exporter.on_stage(StageEvent(kind="ai", stage="write", duration=0.1, attributes={"bytes": 0.1}))
+    exporter.on_stage(StageEvent(kind="ai", stage="write", duration=0.1, attributes={"bytes": 0.2}))
+
+    text = exporter.render()
+    assert 'vector2png_bytes_total{kind="dxf",stage="write"} 1234567891\n' in text
+    assert f'vector2png_bytes_total{{kind="ai",stage="write"}} {0.1 + 0.2!r}\n' in text
+
+
+def test_converter_stage_reports_errors():
+    from vector2png.converters.dxf import DXFConverter
+
+    events = []
+    converter = DXFConverter(observers=[types.SimpleNamespace(on_stage=events.append)])
+
+    with pytest.raises(RuntimeError):
+        with converter.stage("draw", "x.dxf"):
+            raise RuntimeError("boom")
+
+    assert events[0].error == "RuntimeError: boom"
+    assert events[0].source == "x.dxf"
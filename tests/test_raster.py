@@ -0,0 +1,113 @@
+"""Unit tests for the band-wise rasterization helpers."""
+
+from __future__ import annotations
+
+import io
+import struct
+import zlib
+
+import pytest
+
+from vector2png.raster import PNGStreamWriter, backdrop, render_banded
+
+
+def decode_png(data: bytes):
+    """Return (width, height, color_type, rows) for a filter-0 PNG."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    offset, idat, header = 8, b"", None
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset : offset + 4])
+        tag = data[offset + 4 : offset + 8]
+        body = data[offset + 8 : offset + 8 + length]
+        (crc,) = struct.unpack(">I", data[offset + 8 + length : offset + 12 + length])
+        assert crc == zlib.crc32(tag + body) & 0xFFFFFFFF
+        if tag == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif tag == b"IDAT":
+            idat += body
+        offset += 12 + length
+    width, height, _depth, color_type = header[:4]
+    channels = {2: 3, 6: 4}[color_type]
+    raw = zlib.decompress(idat)
+    stride = width * channels + 1
+    rows = [raw[i * stride + 1 : (i + 1) * stride] for i in range(height)]
+    assert all(raw[i * stride] == 0 for i in range(height))
+    return width, height, color_type, rows
+
+
+def sample_page(fitz):
+    doc = fitz.open()
+    page = doc.new_page(width=100, height=50)
+    page.draw_rect(fitz.Rect(10, 10, 60, 40), color=(1, 0, 0), fill=(0, 0, 1), width=3)
+    page.draw_line(fitz.Point(0, 0), fitz.Point(100, 50), color=(0, 0.5, 0))
+    return doc, page
+
+
+def test_png_stream_writer_round_trips_rows():
+    buffer = io.BytesIO()
+    writer = PNGStreamWriter(buffer, width=2, height=3, channels=3)
+    writer.write_rows(bytes(range(12)), stride=6)
+    writer.write_rows(bytes(range(12, 18)), stride=6)
+    writer.close()
+
+    width, height, color_type, rows = decode_png(buffer.getvalue())
+
+    assert (width, height, color_type) == (2, 3, 2)
+    assert b"".join(rows) == bytes(range(18))
+
+
+def test_png_stream_writer_rejects_incomplete_image():
+    writer = PNGStreamWriter(io.BytesIO(), width=1, height=2, channels=4)
+    writer.write_rows(b"\x00" * 4, stride=4)
+    with pytest.raises(ValueError):
+        writer.close()
+
+
+@pytest.mark.parametrize("alpha", [False, True])
+def test_render_banded_matches_a_full_render(alpha):
+    fitz = pytest.importorskip("fitz")
+    doc, page = sample_page(fitz)
+    buffer = io.BytesIO()
+
+    size = render_banded(fitz, page, buffer, zoom=1.37, band_height=7, alpha=alpha)
+
+    full = page.get_pixmap(matrix=fitz.Matrix(1.37, 1.37), alpha=alpha)
+    width, height, color_type, rows = decode_png(buffer.getvalue())
+    assert size == (width, height) == (full.width, full.height)
+    assert color_type == (6 if alpha else 2)
+    # Only anti-aliased edge pixels may differ slightly between clipped and full renders.
+    assert max(abs(x - y) for x, y in zip(b"".join(rows), full.samples)) < 32
+
+
+def test_render_banded_interprets_the_page_once():
+    fitz = pytest.importorskip("fitz")
+    doc, page = sample_page(fitz)
+    calls = []
+
+    class Page:
+        rect = page.rect
+
+        def get_displaylist(self):
+            calls.append("get_displaylist")
+            return page.get_displaylist()
+
+        def get_pixmap(self, **kwargs):
+            calls.append("get_pixmap")
+            return page.get_pixmap(**kwargs)
+
+    render_banded(fitz, Page(), io.BytesIO(), zoom=2.0, band_height=16)
+
+    assert calls == ["get_displaylist"]
+
+
+def test_render_banded_replays_display_list_pages_with_background():
+    fitz = pytest.importorskip("fitz")
+    doc, page = sample_page(fitz)
+    buffer = io.BytesIO()
+
+    render_banded(fitz, backdrop(fitz, page, (10, 20, 30)), buffer, zoom=2.0, band_height=16)
+
+    width, _, _, rows = decode_png(buffer.getvalue())
+    assert rows[0][-3:] == rows[-1][:3] == bytes([10, 20, 30])
+    assert rows[50][60 * 3 : 61 * 3] == bytes([0, 0, 255])
+    assert len(rows) == 100 and width == 200
@@ -0,0 +1,97 @@
+"""Tests for the warm conversion daemon and its client."""
+
+from __future__ import annotations
+
+import socket
+import threading
+
+import pytest
+
+import vector2png.batch as batch_module
+import vector2png.converters.dxf as dxf_module
+import vector2png.documents as documents_module
+from vector2png import cli
+from vector2png.exceptions import ConversionError
+from vector2png.options import AIOptions, DXFOptions
+from vector2png.server import ConversionDaemon, DaemonClient, decode_options, encode_options
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets required")
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch, stub_converter):
+    monkeypatch.setattr("vector2png.server.preload", lambda: None)
+    server = ConversionDaemon(tmp_path / "v2p.sock")
+    server.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.converter = stub_converter
+    yield server
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+def test_options_round_trip_through_json():
+    options = AIOptions(dpi=144, background_color=(1, 2, 3), pages="1-2")
+    assert decode_options("ai", encode_options(options)) == options
+
+
+def test_client_converts_through_daemon(tmp_path, daemon):
+    source = tmp_path / "plan.dxf"
+    source.write_text("0\nEOF\n")
+    client = DaemonClient(daemon.socket_path)
+
+    assert client.ping()["ok"]
+    output = client.convert("dxf", source, tmp_path / "out.png", DXFOptions(dpi=96))
+
+    assert output == tmp_path / "out.png"
+    assert output.read_text() == "dpi=96"
+    broken = tmp_path / "broken.dxf"
+    broken.write_text("")
+    with pytest.raises(ConversionError, match="cannot render"):
+        client.convert("dxf", broken)
+
+
+def test_cli_forwards_to_daemon_and_falls_back(tmp_path, daemon, monkeypatch):
+    source = tmp_path / "logo.dxf"
+    source.write_text("0\nEOF\n")
+
+    assert cli.main(["dxf", str(source), "--dpi", "72", "--socket", str(daemon.socket_path)]) == 0
+    assert daemon.converter.names == ["logo.dxf"]
+    assert (tmp_path / "logo.png").read_text() == "dpi=72"
+
+    assert DaemonClient(tmp_path / "missing.sock").convert("dxf", source) is None
+
+
+def test_in_process_daemon_rejects_request_timeouts(tmp_path, daemon):
+    source = tmp_path / "plan.dxf"
+    source.write_text("0\nEOF\n")
+
+    with pytest.raises(ConversionError, match="more than one worker"):
+        DaemonClient(daemon.socket_path).convert("dxf", source, options=DXFOptions(), timeout=5)
+    assert daemon.converter.calls == []
+
+
+def test_daemon_renders_repeated_dxf_requests_identically(tmp_path, monkeypatch, real_drawing):
+    monkeypatch.setattr(documents_module, "_shared", None)
+    monkeypatch.setattr(batch_module, "_CONVERTERS", {})
+    monkeypatch.setattr(dxf_module, "_modules", None)
+    converter = dxf_module.DXFConverter()
+    expected = {dpi: converter.convert_bytes(real_drawing.read_bytes(), DXFOptions(dpi=dpi)) for dpi in (36, 50)}
+    server = ConversionDaemon(tmp_path / "v2p.sock")
+    server.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = DaemonClient(server.socket_path)
+        outputs = [
+            client.convert("dxf", real_drawing, tmp_path / f"{index}.png", DXFOptions(dpi=dpi)).read_bytes()
+            for index, dpi in enumerate((50, 36, 50))
+        ]
+        documents = client.ping()["documents"]
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+
+    assert outputs == [expected[50], expected[36], expected[50]]
+    assert documents["hits"] == 2
@@ -0,0 +1,95 @@
+"""Tests for DXF format sniffing and compressed input."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import sys
+import types
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from vector2png.batch import expand_sources, source_kind
+from vector2png.converters.dxf import DXFConverter
+from vector2png.exceptions import ConversionError
+from vector2png.sniff import BINARY_DXF_SENTINEL, GZIP, ZIP, dxf_member, open_decompressed, sniff_bytes, sniff_dxf
+from vector2png.utils import ensure_output_path
+
+DXF_TEXT = "0\nSECTION\n2\nENTITIES\n0\nENDSEC\n0\nEOF\n"
+
+
+def zipped(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def register_reader_stubs(monkeypatch, modules):
+    monkeypatch.setattr(modules["ezdxf"], "readfile", lambda path: pytest.fail("compressed file passed to readfile"))
+    lldxf_pkg = types.ModuleType("ezdxf.lldxf")
+    lldxf_pkg.__path__ = []
+    validator_mod = types.ModuleType("ezdxf.lldxf.validator")
+    validator_mod.dxf_info = lambda stream: types.SimpleNamespace(encoding="utf8" if stream.read(1) else "cp1252")
+    tagger_mod = types.ModuleType("ezdxf.lldxf.tagger")
+    tagger_mod.binary_tags_loader = lambda content: content
+    document_mod = types.ModuleType("ezdxf.document")
+    document_mod.Drawing = types.SimpleNamespace(load=lambda tags: types.SimpleNamespace(binary=tags, entitydb={}))
+    for name, module in {
+        "ezdxf.lldxf": lldxf_pkg,
+        "ezdxf.lldxf.validator": validator_mod,
+        "ezdxf.lldxf.tagger": tagger_mod,
+        "ezdxf.document": document_mod,
+    }.items():
+        monkeypatch.setitem(sys.modules, name, module)
+
+
+def test_sniff_routes_by_leading_bytes(tmp_path):
+    assert sniff_bytes(DXF_TEXT.encode()) == "ascii"
+    assert sniff_bytes(BINARY_DXF_SENTINEL + b"\0") == "binary"
+    assert sniff_bytes(gzip.compress(b"0\n")) == GZIP
+    assert sniff_bytes(zipped({"a.dxf": DXF_TEXT})) == ZIP
+    archive = tmp_path / "plan.dxfz"
+    archive.write_bytes(zipped({"readme.txt": "x", "plans/plan.DXF": DXF_TEXT}))
+    assert sniff_dxf(archive) == ZIP
+
+
+def test_open_decompressed_streams_the_dxf_member():
+    data = zipped({"readme.txt": "x", "plan.dxf": DXF_TEXT})
+    with open_decompressed(ZIP, lambda: io.BytesIO(data)) as stream:
+        assert stream.read() == DXF_TEXT.encode()
+    with open_decompressed(GZIP, lambda: io.BytesIO(gzip.compress(DXF_TEXT.encode()))) as stream:
+        assert stream.read(9) == b"0\nSECTION"
+    with zipfile.ZipFile(io.BytesIO(zipped({"a.txt": "", "b.txt": ""}))) as archive:
+        with pytest.raises(ConversionError, match="no .dxf member"):
+            dxf_member(archive)
+
+
+def test_compressed_and_binary_inputs_reach_the_loader(tmp_path, monkeypatch, dxf_stubs):
+    register_reader_stubs(monkeypatch, dxf_stubs)
+    converter = DXFConverter()
+    source = tmp_path / "plan.dxf.gz"
+    source.write_bytes(gzip.compress(DXF_TEXT.encode()))
+
+    with converter.open(source) as session:
+        assert session.doc.path == Path(DXF_TEXT)
+        assert session.name == "plan"
+    assert converter.convert(source).name == "plan.png"
+
+    binary = BINARY_DXF_SENTINEL + b"\x00tags"
+    with converter.open_bytes(zipped({"b.dxf": binary})) as session:
+        assert session.doc.binary == binary
+    with pytest.raises(ConversionError, match="in-memory DXF data"):
+        converter.open_bytes(gzip.compress(b"")[:-4])
+
+
+def test_batch_discovers_compressed_drawings(tmp_path):
+    for name in ("a.dxf", "b.dxf.gz", "c.dxfz", "d.gz", "e.txt"):
+        (tmp_path / name).write_bytes(b"")
+
+    assert [path.name for path in expand_sources(tmp_path)] == ["a.dxf", "b.dxf.gz", "c.dxfz"]
+    assert source_kind("plans/b.DXF.GZ") == "dxf" and source_kind("d.gz") is None
+    assert ensure_output_path(tmp_path / "b.dxf.gz", None).name == "b.png"
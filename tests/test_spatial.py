@@ -0,0 +1,122 @@
+"""Tests for the DXF spatial index."""
+
+from __future__ import annotations
+
+import sys
+import types
+
+import pytest
+
+import vector2png.converters.dxf as dxf_module
+from vector2png.converters.dxf import DXFConverter
+from vector2png.options import DXFOptions
+from vector2png.spatial import LayoutView, SpatialIndex, index_path, load_index, save_index
+
+
+class Entity:
+    def __init__(self, handle, box):
+        self.box = box
+        self.dxf = types.SimpleNamespace(handle=handle, layer="0")
+
+    def dxftype(self):
+        return "LINE"
+
+
+class CountingDict(dict):
+    def __init__(self, cells, calls):
+        super().__init__(cells)
+        self.calls = calls
+
+    def get(self, key, default=None):
+        self.calls.append(key)
+        return super().get(key, default)
+
+
+def grid_entities(count=100):
+    return [Entity(f"{n:X}", (n % 10 * 10, n // 10 * 10, n % 10 * 10 + 5, n // 10 * 10 + 5)) for n in range(count)]
+
+
+def test_query_returns_intersecting_handles_in_entity_order():
+    entities = grid_entities()
+    huge = Entity("BIG", (-1000, -1000, 1000, 1000))
+    index = SpatialIndex.build(entities + [huge, Entity("NONE", None)], lambda entity: entity.box)
+
+    assert index.query((12, 12, 27, 14)) == ["B", "C", "BIG", "NONE"]
+    assert index.query((500, 500, 600, 600)) == ["BIG", "NONE"]
+    assert len(index) == 102
+
+
+def test_flat_extents_size_cells_from_the_longer_side():
+    line = Entity("L", (0.0, 0.0, 10.0, 0.0))
+    index = SpatialIndex.build([line], lambda entity: entity.box)
+
+    assert index.cell_size == 10.0
+    assert index.query((0, -5, 10, 5)) == ["L"]
+    assert index.query((20, -5, 30, 5)) == []
+
+
+def test_query_far_larger_than_the_drawing_only_walks_indexed_cells():
+    index = SpatialIndex.build(grid_entities(), lambda entity: entity.box)
+    calls = []
+    index._cells = CountingDict(index._cells, calls)
+
+    assert len(index.query((-1e9, -1e9, 1e9, 1e9))) == 100
+    assert len(calls) <= len(index._span[0]) * len(index._span[1]) <= 16
+
+
+def test_persisted_index_is_invalidated_when_the_drawing_changes(tmp_path):
+    source = tmp_path / "plan.dxf"
+    source.write_text("0\nEOF\n")
+    index = SpatialIndex.build(grid_entities(4), lambda entity: entity.box)
+
+    save_index(source, "modelspace", index)
+    assert index_path(source).exists()
+    assert load_index(source, "modelspace").query((0, 0, 5, 5)) == ["0"]
+    assert load_index(source, "Layout1") is None
+
+    source.write_text("0\nSECTION\n0\nEOF\n")
+    assert load_index(source, "modelspace") is None
+
+
+def test_region_render_feeds_only_intersecting_entities(tmp_path, monkeypatch, dxf_stubs):
+    entities = grid_entities()
+    doc = dxf_stubs["ezdxf"].readfile(str(tmp_path / "site.dxf"))
+    doc.modelspace = lambda: entities
+    doc.entitydb = {entity.dxf.handle: entity for entity in entities}
+    monkeypatch.setattr(dxf_stubs["ezdxf"], "readfile", lambda path: doc)
+    drawn = []
+    frontend = dxf_stubs["ezdxf.addons.drawing"].Frontend
+    monkeypatch.setattr(frontend, "draw_layout", lambda self, layout, filter_func=None: drawn.append(layout))
+    bbox_mod = types.ModuleType("ezdxf.bbox")
+    bbox_mod.extents = lambda items, fast=False: types.SimpleNamespace(
+        has_data=True,
+        extmin=types.SimpleNamespace(x=items[0].box[0], y=items[0].box[1]),
+        extmax=types.SimpleNamespace(x=items[0].box[2], y=items[0].box[3]),
+    )
+    monkeypatch.setitem(sys.modules, "ezdxf.bbox", bbox_mod)
+    source = tmp_path / "site.dxf"
+    source.write_text("0\nSECTION\n")
+
+    with DXFConverter().open(source) as session:
+        session.render(tmp_path / "a.png", DXFOptions(dpi=72, bbox=(0, 0, 12, 12), persist_index=True))
+        session.render(tmp_path / "b.png", DXFOptions(dpi=72, bbox=(40, 40, 41, 41)))
+
+    first, second = drawn
+    assert isinstance(first, LayoutView)
+    assert [entity.dxf.handle for entity in first] == ["0", "1", "A", "B"]
+    assert [entity.dxf.handle for entity in second] == ["2C"]
+    assert load_index(source, "modelspace") is not None
+
+
+def test_region_render_of_a_single_line_with_real_ezdxf(tmp_path, monkeypatch):
+    ezdxf = pytest.importorskip("ezdxf")
+    pytest.importorskip("fitz")
+    monkeypatch.setattr(dxf_module, "_modules", None)
+    doc = ezdxf.new()
+    doc.modelspace().add_line((0, 0), (10, 0))
+    source = tmp_path / "line.dxf"
+    doc.saveas(source)
+
+    for bbox in ((0, -5, 10, 5), (-1e5, -1e5, 1e5, 1e5)):
+        DXFConverter().convert(source, tmp_path / "line.png", DXFOptions(dpi=72, bbox=bbox))
+        assert (tmp_path / "line.png").stat().st_size > 0
@@ -0,0 +1,171 @@
+"""Tests for streaming large DXF files."""
+
+from __future__ import annotations
+
+import sys
+import types
+
+import pytest
+
+import vector2png.converters.dxf as dxf_module
+import vector2png.streaming as streaming_module
+from vector2png.converters.dxf import DXFConverter, DXFStreamSession
+from vector2png.exceptions import ConversionError
+from vector2png.options import DXFOptions
+from vector2png.sniff import BINARY_DXF_SENTINEL
+from vector2png.streaming import has_block_references, stream_blockers
+
+
+class MText:
+    def __init__(self, text):
+        self.text = text
+        self.dxf = types.SimpleNamespace(handle="M", layer="0", char_height=2.0)
+
+    def dxftype(self):
+        return "MTEXT"
+
+
+def register_stream_stubs(monkeypatch, modules, entities):
+    opened = []
+
+    class Stream:
+        def __init__(self, path):
+            self.path = path
+            self.closed = False
+            opened.append(self)
+
+        def modelspace(self):
+            return iter(entities)
+
+        def close(self):
+            self.closed = True
+
+    iterdxf = types.ModuleType("ezdxf.addons.iterdxf")
+    iterdxf.opendxf = Stream
+    properties = types.ModuleType("ezdxf.addons.drawing.properties")
+    properties.LayoutProperties = types.SimpleNamespace(modelspace=lambda: "modelspace-properties")
+    properties.LayerProperties = types.SimpleNamespace
+    properties.layer_key = str.lower
+    monkeypatch.setitem(sys.modules, "ezdxf.addons.iterdxf", iterdxf)
+    monkeypatch.setitem(sys.modules, "ezdxf.addons.drawing.properties", properties)
+    monkeypatch.setattr(modules["ezdxf"], "readfile", lambda path: pytest.fail("document was loaded"))
+    drawn = []
+
+    def draw_layout(self, layout, filter_func=None, layout_properties=None):
+        drawn.append((list(layout), layout_properties))
+
+    monkeypatch.setattr(modules["ezdxf.addons.drawing"].Frontend, "draw_layout", draw_layout)
+    return opened, drawn
+
+
+def test_should_stream_selects_by_size_and_options(tmp_path):
+    source = tmp_path / "survey.dxf"
+    source.write_text("0\nSECTION\n" * 100)
+    converter = DXFConverter()
+
+    assert not converter.should_stream(source, DXFOptions())
+    assert converter.should_stream(source, DXFOptions(stream_threshold=100))
+    assert not converter.should_stream(source, DXFOptions(stream_threshold=100, bbox=(0, 0, 1, 1)))
+    assert not converter.should_stream(source, DXFOptions(stream=False, stream_threshold=100))
+    assert converter.should_stream(source, DXFOptions(stream=True, layout_name="Model"))
+    with pytest.raises(ConversionError, match="lod"):
+        converter.should_stream(source, DXFOptions(stream=True, lod=True))
+
+    binary = tmp_path / "binary.dxf"
+    binary.write_bytes(BINARY_DXF_SENTINEL + b"\0" * 200)
+    assert not converter.should_stream(binary, DXFOptions(stream_threshold=100))
+    assert stream_blockers(DXFOptions(layout_name="Layout1")) == ["layout 'Layout1'"]
+
+
+def test_large_file_is_drawn_from_the_stream(tmp_path, monkeypatch, dxf_stubs):
+    entities = [MText("\\H2x;Title"), MText("plain")]
+    opened, drawn = register_stream_stubs(monkeypatch, dxf_stubs, entities)
+    source = tmp_path / "survey.dxf"
+    source.write_text("0\nSECTION\n")
+
+    opts = DXFOptions(dpi=72, stream_threshold=1, normalize_relative_size=True)
+    DXFConverter().convert(source, tmp_path / "out.png", opts)
+
+    assert [entity.text for entity in drawn[0][0]] == ["\\H4;Title", "plain"]
+    assert drawn[0][1] == "modelspace-properties"
+    assert len(opened) == 1 and opened[0].closed
+
+
+def test_stream_session_replays_recordings_and_rejects_other_layouts(tmp_path, monkeypatch, dxf_stubs):
+    opened, drawn = register_stream_stubs(monkeypatch, dxf_stubs, [MText("a")])
+    source = tmp_path / "survey.dxf"
+    source.write_text("0\nSECTION\n")
+
+    with DXFConverter().open_stream(source) as session:
+        assert isinstance(session, DXFStreamSession)
+        session.render(tmp_path / "a.png", DXFOptions(dpi=72))
+        session.render(tmp_path / "b.png", DXFOptions(dpi=150))
+        with pytest.raises(ConversionError, match="Layout1"):
+            session.render(tmp_path / "c.png", DXFOptions(layout_name="Layout1"))
+
+    assert len(opened) == len(drawn) == 1
+
+
+def test_stream_session_draws_through_the_real_frontend(tmp_path, monkeypatch):
+    ezdxf = pytest.importorskip("ezdxf")
+    pytest.importorskip("fitz")
+    monkeypatch.setattr(dxf_module, "_modules", None)
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (100, 30))
+    msp.add_circle((50, 15), 10)
+    source = tmp_path / "survey.dxf"
+    doc.saveas(source)
+    converter = DXFConverter()
+
+    loaded = converter.convert_bytes(source.read_bytes(), DXFOptions(dpi=50))
+    with converter.open_stream(source) as session:
+        assert session.render_bytes(DXFOptions(dpi=50)) == loaded
+
+
+def write_block_drawing(path, ezdxf):
+    doc = ezdxf.new()
+    block = doc.blocks.new("B")
+    block.add_circle((0, 0), 5)
+    block.add_blockref("C", (0, 0))
+    doc.blocks.new("C").add_line((0, 0), (5, 5))
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (100, 30))
+    msp.add_blockref("B", (50, 15))
+    doc.saveas(path)
+
+
+def test_has_block_references_only_looks_at_modelspace(tmp_path, monkeypatch):
+    ezdxf = pytest.importorskip("ezdxf")
+    # Small chunks so markers straddle chunk boundaries.
+    monkeypatch.setattr(streaming_module, "SCAN_CHUNK_SIZE", 7)
+    with_insert = tmp_path / "blocks.dxf"
+    write_block_drawing(with_insert, ezdxf)
+    nested_only = tmp_path / "nested.dxf"
+    doc = ezdxf.new()
+    doc.blocks.new("C").add_line((0, 0), (5, 5))
+    doc.blocks.new("B").add_blockref("C", (0, 0))
+    doc.modelspace().add_line((0, 0), (1, 1))
+    doc.saveas(nested_only)
+
+    assert has_block_references(with_insert)
+    assert not has_block_references(nested_only)
+
+
+def test_drawings_with_block_references_load_instead_of_streaming(tmp_path, monkeypatch):
+    ezdxf = pytest.importorskip("ezdxf")
+    pytest.importorskip("fitz")
+    monkeypatch.setattr(dxf_module, "_modules", None)
+    source = tmp_path / "survey.dxf"
+    write_block_drawing(source, ezdxf)
+    converter = DXFConverter()
+
+    assert not converter.should_stream(source, DXFOptions(stream_threshold=1))
+    loaded = converter.convert_bytes(source.read_bytes(), DXFOptions(dpi=50))
+    converter.convert(source, tmp_path / "auto.png", DXFOptions(dpi=50, stream_threshold=1))
+    assert (tmp_path / "auto.png").read_bytes() == loaded
+
+    with pytest.raises(ConversionError, match="INSERT"):
+        converter.convert(source, tmp_path / "forced.png", DXFOptions(dpi=50, stream=True))
+    with converter.open_stream(source) as session, pytest.raises(ConversionError, match="INSERT"):
+        session.render_bytes(DXFOptions(dpi=50))
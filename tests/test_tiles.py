@@ -0,0 +1,76 @@
+"""Unit tests for tile pyramid generation."""
+
+from __future__ import annotations
+
+import pytest
+
+from vector2png.exceptions import ConversionError
+from vector2png.tiles import TilePyramid, pyramid_levels
+
+
+class RecordingPage:
+    """Real PyMuPDF page wrapper recording the zoom of every render."""
+
+    def __init__(self, page):
+        self.page = page
+        self.rect = page.rect
+        self.renders = []
+
+    def get_pixmap(self, matrix, alpha=False, clip=None):
+        self.renders.append(matrix.a)
+        return self.page.get_pixmap(matrix=matrix, alpha=alpha, clip=clip)
+
+
+def make_pyramid(tmp_path, layout="dzi", on_close=None):
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    source = doc.new_page(width=300, height=100)
+    source.draw_rect(fitz.Rect(280, 0, 300, 100), color=None, fill=(0, 0, 1))
+    page = RecordingPage(source)
+    pyramid = TilePyramid(
+        fitz, page, tmp_path / "tiles", "plan", zoom=2.0, tile_size=256, layout=layout, on_close=on_close
+    )
+    return pyramid, page
+
+
+def test_pyramid_levels_dzi_and_xyz():
+    dzi = pyramid_levels(600, 200, 256, "dzi")
+    xyz = pyramid_levels(600, 200, 256, "xyz")
+
+    assert [level.width for level in dzi] == [1, 2, 3, 5, 10, 19, 38, 75, 150, 300, 600]
+    assert (dzi[-1].columns, dzi[-1].rows) == (3, 1)
+    assert [(level.width, level.columns) for level in xyz] == [(150, 1), (300, 2), (600, 3)]
+    with pytest.raises(ValueError):
+        pyramid_levels(10, 10, 256, "tms")
+
+
+def test_lazy_pyramid_renders_only_requested_tiles(tmp_path):
+    closed = []
+    pyramid, page = make_pyramid(tmp_path, on_close=lambda: closed.append(True))
+    descriptor = pyramid.write_descriptor()
+
+    tile = pyramid.tile(10, 2, 0)
+    again = pyramid.tile(10, 2, 0)
+    pyramid.close()
+
+    assert 'Width="600" Height="200"' in descriptor.read_text()
+    assert tile == tmp_path / "tiles" / "plan_files" / "10" / "2_0.png"
+    pix = pytest.importorskip("fitz").Pixmap(str(tile))
+    assert (pix.width, pix.height) == (88, 200)
+    assert pix.pixel(87, 199) == (0, 0, 255) and pix.pixel(0, 0) == (255, 255, 255)
+    assert again == tile
+    assert page.renders == [2.0]
+    assert closed == [True]
+    with pytest.raises(ConversionError):
+        pyramid.tile(10, 1, 0)
+
+
+def test_xyz_pyramid_generates_every_tile(tmp_path):
+    pyramid, page = make_pyramid(tmp_path, layout="xyz")
+
+    rendered = pyramid.generate()
+
+    assert rendered == 1 + 2 + 3
+    assert (tmp_path / "tiles" / "2" / "2" / "0.png").exists()
+    assert (tmp_path / "tiles" / "tiles.json").exists()
+    assert page.renders[0] == 0.5
@@ -0,0 +1,70 @@
+"""Tests for the incremental directory watcher."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from vector2png.watch import DirectoryWatcher, Manifest
+
+
+def age(path: Path, seconds: float = 60) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_watcher_converts_only_new_or_changed_files(tmp_path, stub_converter):
+    inbox = tmp_path / "inbox"
+    (inbox / "sub").mkdir(parents=True)
+    plan = inbox / "plan.dxf"
+    plan.write_text("0\nEOF\n")
+    logo = inbox / "sub" / "logo.ai"
+    logo.write_bytes(b"%PDF-1.4")
+    age(plan)
+    age(logo)
+
+    with DirectoryWatcher(inbox, output_dir=tmp_path / "out", workers=1, settle=1) as watcher:
+        first = watcher.poll()
+        assert sorted(stub_converter.names) == ["logo.ai", "plan.dxf"]
+        assert all(result.ok for result in first)
+        assert (tmp_path / "out" / "sub" / "logo.png").exists()
+
+        assert watcher.poll() == []
+
+        # Touched without changes: recognized by hash, not reconverted.
+        age(plan, 30)
+        assert watcher.poll() == []
+
+        plan.write_text("0\nSECTION\n0\nEOF\n")
+        age(plan, 10)
+        (result,) = watcher.poll()
+        assert result.source == plan
+    assert stub_converter.names.count("plan.dxf") == 2
+
+
+def test_watcher_debounces_files_still_being_written(tmp_path, stub_converter):
+    upload = tmp_path / "upload.dxf"
+    upload.write_text("0\nEOF\n")
+
+    with DirectoryWatcher(tmp_path, workers=1, settle=30) as watcher:
+        assert watcher.poll() == []
+        age(upload)
+        assert len(watcher.poll()) == 1
+
+
+def test_manifest_survives_restarts(tmp_path, stub_converter):
+    drawing = tmp_path / "drawing.dxf"
+    drawing.write_text("0\nEOF\n")
+    age(drawing)
+    manifest_path = tmp_path / "state" / "manifest.sqlite"
+
+    with DirectoryWatcher(tmp_path, workers=1, settle=1, manifest=manifest_path) as watcher:
+        watcher.run(max_polls=1)
+    with DirectoryWatcher(tmp_path, workers=1, settle=1, manifest=manifest_path) as watcher:
+        assert watcher.poll() == []
+
+    with Manifest(manifest_path) as manifest:
+        entry = manifest.get(drawing.resolve())
+    assert entry is not None and entry.error is None
+    assert stub_converter.names == ["drawing.dxf"]
@@ -1,26 +1,72 @@
-"""Public API for the vector2png package."""
+"""Public API for the vector2png package.
+
+Converters, batching and the cache are imported on first attribute access so
+``import vector2png`` (and the CLI) stays cheap until a conversion is requested.
+"""
 
 from __future__ import annotations
 
+import importlib
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
+
+from .options import AIOptions, DXFOptions, OutputSpec
 
-from .converters.ai import AIConverter
-from .converters.dxf import DXFConverter
-from .options import AIOptions, DXFOptions
+if TYPE_CHECKING:  # pragma: no cover - imports for type checkers only
+    from .batch import BatchResult, convert_batch
+    from .cache import RenderCache
+    from .converters.ai import AIConverter
+    from .converters.dxf import DXFConverter, DXFDocumentSession, DXFStreamSession
+    from .documents import DocumentCache
+    from .inspection import Inspection, inspect
 
 __all__ = [
     "AIConverter",
     "DXFConverter",
+    "DXFDocumentSession",
+    "DXFStreamSession",
     "AIOptions",
     "DXFOptions",
+    "OutputSpec",
+    "BatchResult",
+    "RenderCache",
+    "DocumentCache",
+    "Inspection",
     "ai_to_png",
+    "convert_batch",
     "dxf_to_png",
+    "inspect",
     "__version__",
 ]
 
 __version__ = "0.2.2"
 
+_LAZY_ATTRIBUTES = {
+    "AIConverter": ".converters.ai",
+    "DXFConverter": ".converters.dxf",
+    "DXFDocumentSession": ".converters.dxf",
+    "DXFStreamSession": ".converters.dxf",
+    "BatchResult": ".batch",
+    "convert_batch": ".batch",
+    "RenderCache": ".cache",
+    "DocumentCache": ".documents",
+    "Inspection": ".inspection",
+    "inspect": ".inspection",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
+
 
 def ai_to_png(
     source: str | Path,
@@ -28,6 +74,8 @@ def ai_to_png(
     options: Optional[AIOptions] = None,
 ) -> Path:
     """Convert an AI file to PNG using default converter settings."""
+    from .converters.ai import AIConverter
+
     return AIConverter().convert(source, target=target, options=options)
 
 
@@ -37,5 +85,6 @@ def dxf_to_png(
     options: Optional[DXFOptions] = None,
 ) -> Path:
     """Convert a DXF file to PNG using default converter settings."""
-    return DXFConverter().convert(source, target=target, options=options)
+    from .converters.dxf import DXFConverter
 
+    return DXFConverter().convert(source, target=target, options=options)
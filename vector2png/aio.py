@@ -0,0 +1,178 @@
+"""Asyncio API that offloads CPU-bound conversions to a shared executor."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Tuple
+
+from .batch import BatchResult, _build_jobs, _time_limit, expand_sources, get_converter, infer_kind
+from .cache import RenderCache
+from .exceptions import ConversionError
+from .metrics import StageEvent
+from .options import AIOptions, DXFOptions
+
+_EXECUTOR: Optional[Executor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+# Extra time granted to the event-loop side of a timeout so the worker's own limit fires first.
+_TIMEOUT_GRACE = 1.0
+
+
+def get_executor() -> Executor:
+    """Return the process pool shared by every asyncio conversion, creating it on first use."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _EXECUTOR
+
+
+def set_executor(executor: Optional[Executor]) -> Optional[Executor]:
+    """Replace the shared executor (e.g. with a custom pool); return the previous one."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        previous, _EXECUTOR = _EXECUTOR, executor
+        return previous
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Shut down the shared executor; a new one is created on the next conversion."""
+    previous = set_executor(None)
+    if previous is not None:
+        previous.shutdown(wait=wait)
+
+
+async def convert(
+    source: str | Path,
+    target: str | Path | None = None,
+    options: AIOptions | DXFOptions | None = None,
+    kind: Optional[str] = None,
+    timeout: Optional[float] = None,
+    executor: Optional[Executor] = None,
+    cache: Optional[RenderCache] = None,
+    on_stage: Optional[Callable[[StageEvent], None]] = None,
+    documents: bool = True,
+) -> Path:
+    """Convert *source* without blocking the event loop and return the PNG path.
+
+    The converter is picked from the suffix unless *kind* is given. *timeout* defaults
+    to ``options.timeout`` when the options define one; it is enforced inside the worker
+    (``SIGALRM`` on POSIX process pools) and on the awaiting side, raising ``TimeoutError``.
+    Cancelling the awaiting task drops conversions that have not started yet.
+
+    The worker records the stage events of the conversion and *on_stage* receives them
+    here once it finishes. ``documents=False`` bypasses the worker's document cache.
+    """
+    kind = kind or infer_kind(source)
+    if timeout is None:
+        timeout = getattr(options, "timeout", None)
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        executor or get_executor(),
+        _convert_in_worker,
+        kind,
+        Path(source),
+        None if target is None else Path(target),
+        options,
+        timeout,
+        cache,
+        on_stage is not None,
+        documents,
+    )
+    try:
+        output, events = await (asyncio.wait_for(future, timeout + _TIMEOUT_GRACE) if timeout else future)
+    except asyncio.TimeoutError as exc:
+        raise TimeoutError(f"Conversion of '{source}' timed out after {timeout:g}s") from exc
+    for event in events:
+        on_stage(event)
+    return output
+
+
+async def convert_many(
+    sources: str | Path | Iterable[str | Path],
+    output_dir: str | Path | None = None,
+    ai_options: Optional[AIOptions] = None,
+    dxf_options: Optional[DXFOptions] = None,
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    executor: Optional[Executor] = None,
+    cache: Optional[RenderCache] = None,
+) -> AsyncIterator[BatchResult]:
+    """Convert many files with at most *concurrency* in flight, yielding results as they finish.
+
+    Errors (including timeouts) are reported on the yielded :class:`BatchResult` rather
+    than raised. Closing the iterator early cancels the conversions still pending.
+    """
+    semaphore = asyncio.Semaphore(concurrency or os.cpu_count() or 1)
+
+    async def run(job) -> BatchResult:
+        kind, path, target = job
+        async with semaphore:
+            start = time.perf_counter()
+            options = ai_options if kind == "ai" else dxf_options
+            try:
+                output = await convert(
+                    path,
+                    target,
+                    options,
+                    kind=kind or None,
+                    timeout=timeout,
+                    executor=executor,
+                    cache=cache,
+                )
+            except (ConversionError, FileNotFoundError, TimeoutError) as exc:
+                return BatchResult(path, target=target, error=str(exc), duration=time.perf_counter() - start)
+            return BatchResult(path, target=output, duration=time.perf_counter() - start)
+
+    async def conflict(job, error: str) -> BatchResult:
+        return BatchResult(job[1], target=job[2], error=error)
+
+    jobs, conflicts = _build_jobs(expand_sources(sources), output_dir)
+    tasks = [
+        asyncio.ensure_future(conflict(job, conflicts[index]) if index in conflicts else run(job))
+        for index, job in enumerate(jobs)
+    ]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _convert_in_worker(
+    kind: str,
+    source: Path,
+    target: Optional[Path],
+    options: Any,
+    timeout: Optional[float],
+    cache: Optional[RenderCache],
+    record: bool = False,
+    documents: bool = True,
+) -> Tuple[Path, List[StageEvent]]:
+    events: List[StageEvent] = []
+    converter = get_converter(kind, cache)
+    if record or not documents:
+        # A copy keeps the warm converter untouched for conversions running alongside.
+        converter = copy.copy(converter)
+        converter.observers = [_EventList(events)] if record else []
+        if not documents:
+            converter.documents = None
+    with _time_limit(timeout):
+        return converter.convert(source, target=target, options=options), events
+
+
+class _EventList:
+    """Observer collecting events in a worker so they can be returned to the caller."""
+
+    def __init__(self, events: List[StageEvent]) -> None:
+        self.on_stage = events.append
+
+
+__all__ = ["convert", "convert_many", "get_executor", "set_executor", "shutdown_executor"]
@@ -0,0 +1,289 @@
+"""Batch conversion of many AI/DXF files over a process pool."""
+
+from __future__ import annotations
+
+import glob
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .cache import RenderCache
+from .converters.base import BaseConverter
+from .exceptions import ConversionError
+from .options import AIOptions, DXFOptions
+from .utils import source_stem
+
+SUFFIX_KINDS = {".ai": "ai", ".dxf": "dxf", ".dxf.gz": "dxf", ".dxfz": "dxf"}
+
+# Converter instances are reused for every file handled by the same worker process.
+_CONVERTERS: Dict[Tuple[str, Optional[str]], BaseConverter] = {}
+
+Job = Tuple[str, Path, Optional[Path]]
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Outcome of converting a single file inside a batch."""
+
+    source: Path
+    target: Optional[Path] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def expand_sources(sources: str | Path | Iterable[str | Path]) -> List[Path]:
+    """Expand glob patterns and directories into a sorted, de-duplicated file list."""
+    if isinstance(sources, (str, Path)):
+        sources = [sources]
+
+    expanded: List[Path] = []
+    seen = set()
+    for item in sources:
+        text = str(item)
+        if glob.has_magic(text):
+            matches = [Path(match) for match in sorted(glob.glob(text, recursive=True))]
+        elif Path(text).is_dir():
+            matches = sorted(p for p in Path(text).iterdir() if source_kind(p) is not None)
+        else:
+            matches = [Path(text)]
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                expanded.append(match)
+    return expanded
+
+
+def source_kind(source: str | Path) -> Optional[str]:
+    """Return the converter kind for *source* from its suffix (``.dxf.gz`` included), or ``None``."""
+    path = Path(source)
+    return SUFFIX_KINDS.get("".join(path.suffixes[-2:]).lower()) or SUFFIX_KINDS.get(path.suffix.lower())
+
+
+def infer_kind(source: str | Path) -> str:
+    """Return the converter kind (``ai`` or ``dxf``) for *source* based on its suffix."""
+    kind = source_kind(source)
+    if kind is None:
+        raise ConversionError(f"Unsupported input type for batch conversion: {source}")
+    return kind
+
+
+def get_converter(kind: str, cache: Optional[RenderCache] = None) -> BaseConverter:
+    """Return the converter cached for *kind* (and render cache) in the current process."""
+    key = (kind, str(cache.directory) if cache is not None else None)
+    converter = _CONVERTERS.get(key)
+    if converter is None:
+        if kind == "ai":
+            from .converters.ai import AIConverter
+            from .documents import shared_document_cache
+
+            converter = AIConverter(cache=cache, documents=shared_document_cache())
+        elif kind == "dxf":
+            from .converters.dxf import DXFConverter
+            from .documents import shared_document_cache
+
+            converter = DXFConverter(cache=cache, documents=shared_document_cache())
+        else:
+            raise ConversionError(f"Unknown converter kind: {kind}")
+        _CONVERTERS[key] = converter
+    return converter
+
+
+def convert_batch(
+    sources: str | Path | Iterable[str | Path],
+    output_dir: str | Path | None = None,
+    ai_options: Optional[AIOptions] = None,
+    dxf_options: Optional[DXFOptions] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    timeout: Optional[float] = None,
+    cache: Optional[RenderCache] = None,
+) -> List[BatchResult]:
+    """Convert every source and return one :class:`BatchResult` per file, in input order."""
+    return list(
+        iter_batch(
+            sources,
+            output_dir=output_dir,
+            ai_options=ai_options,
+            dxf_options=dxf_options,
+            workers=workers,
+            chunksize=chunksize,
+            timeout=timeout,
+            cache=cache,
+        )
+    )
+
+
+def iter_batch(
+    sources: str | Path | Iterable[str | Path],
+    output_dir: str | Path | None = None,
+    ai_options: Optional[AIOptions] = None,
+    dxf_options: Optional[DXFOptions] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    timeout: Optional[float] = None,
+    cache: Optional[RenderCache] = None,
+) -> Iterator[BatchResult]:
+    """Yield batch results in input order as they become available.
+
+    ``workers`` defaults to the CPU count; ``workers <= 1`` converts in-process.
+    ``chunksize`` controls how many files are sent to a worker per round-trip and
+    ``timeout`` bounds each file individually (enforced with ``SIGALRM`` where available).
+    Failures are reported through :attr:`BatchResult.error` instead of being raised,
+    including a worker process that dies (a crash or the OOM killer): its file fails and
+    the rest continue in a new pool. Sources whose PNG an earlier source already writes
+    fail without being converted.
+    Passing a :class:`~vector2png.cache.RenderCache` lets workers skip unchanged inputs.
+    """
+    jobs, conflicts = _build_jobs(expand_sources(sources), output_dir)
+    runnable = [job for index, job in enumerate(jobs) if index not in conflicts]
+
+    worker = partial(_run_job, ai_options=ai_options, dxf_options=dxf_options, timeout=timeout, cache=cache)
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    workers = max(1, min(workers, len(runnable)))
+
+    if workers == 1:
+        results = map(worker, runnable)
+    else:
+        results = _pool_results(worker, runnable, workers, max(1, chunksize))
+    for index, (_kind, source, target) in enumerate(jobs):
+        if index in conflicts:
+            yield BatchResult(source, target=target, error=conflicts[index])
+        else:
+            yield next(results)
+
+
+def summarize(results: Sequence[BatchResult]) -> Dict[str, float]:
+    """Return aggregate counters for a finished batch."""
+    succeeded = sum(1 for result in results if result.ok)
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "seconds": sum(result.duration for result in results),
+    }
+
+
+# ----------------------------------------------------------------------
+# Worker helpers
+# ----------------------------------------------------------------------
+def _build_jobs(sources: Sequence[Path], output_dir: str | Path | None) -> Tuple[List[Job], Dict[int, str]]:
+    """Return one job per source plus errors for sources whose PNG another source already claims.
+
+    Under *output_dir* every PNG keeps the path of its source relative to the deepest
+    directory shared by all sources, like the watcher's mirrored tree, so same-named
+    files from different directories do not overwrite each other. Without it PNGs go
+    next to their sources, where ``plan.ai`` and ``plan.dxf`` still collide.
+    """
+    root = None
+    if output_dir is not None and sources:
+        root = Path(os.path.commonpath([source.resolve().parent for source in sources]))
+    jobs: List[Job] = []
+    conflicts: Dict[int, str] = {}
+    claimed: Dict[Path, Path] = {}
+    for index, source in enumerate(sources):
+        name = f"{source_stem(source)}.png"
+        if root is None:
+            target, output = None, source.resolve().with_name(name)
+        else:
+            target = output = Path(output_dir) / source.resolve().parent.relative_to(root) / name
+        jobs.append((source_kind(source) or "", source, target))
+        first = claimed.setdefault(output, source)
+        if first is not source:
+            conflicts[index] = f"Output {output} is already written for {first}"
+    return jobs, conflicts
+
+
+def _pool_results(
+    worker: Callable[[Job], BatchResult], jobs: Sequence[Job], workers: int, chunksize: int
+) -> Iterator[BatchResult]:
+    """Yield the result of every job in order from a process pool, surviving dead workers.
+
+    A worker that dies breaks the pool and fails every unfinished job with it. The first
+    of those is retried alone, so it is only reported as failed if it kills a worker by
+    itself; the jobs after it continue in a new pool.
+    """
+    done = 0
+    while done < len(jobs):
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs) - done)) as executor:
+                for result in executor.map(worker, jobs[done:], chunksize=chunksize):
+                    done += 1
+                    yield result
+        except BrokenProcessPool:
+            _kind, source, target = job = jobs[done]
+            try:
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    result = executor.submit(worker, job).result()
+            except BrokenProcessPool:
+                result = BatchResult(source, target=target, error="Worker process died (crashed or out of memory)")
+            done += 1
+            yield result
+
+
+def _run_job(
+    job: Job,
+    ai_options: Optional[AIOptions] = None,
+    dxf_options: Optional[DXFOptions] = None,
+    timeout: Optional[float] = None,
+    cache: Optional[RenderCache] = None,
+) -> BatchResult:
+    kind, source, target = job
+    start = time.perf_counter()
+    try:
+        with _time_limit(timeout):
+            converter = get_converter(kind or infer_kind(source), cache)
+            options = ai_options if kind == "ai" else dxf_options
+            output = converter.convert(source, target=target, options=options)
+        return BatchResult(source, target=output, duration=time.perf_counter() - start)
+    except (ConversionError, FileNotFoundError, TimeoutError) as exc:
+        message = str(exc)
+    except Exception as exc:  # pragma: no cover - defensive
+        message = f"Unexpected error: {exc}"
+    return BatchResult(source, target=target, error=message, duration=time.perf_counter() - start)
+
+
+@contextmanager
+def _time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """Raise ``TimeoutError`` once *seconds* elapse (main thread with ``SIGALRM`` only)."""
+    if (
+        not seconds
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def expire(_signum, _frame) -> None:
+        raise TimeoutError(f"Conversion timed out after {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+__all__ = [
+    "BatchResult",
+    "convert_batch",
+    "expand_sources",
+    "get_converter",
+    "infer_kind",
+    "iter_batch",
+    "source_kind",
+    "summarize",
+]
@@ -0,0 +1,296 @@
+"""Synthetic corpora and throughput benchmarks for the AI and DXF pipelines."""
+
+from __future__ import annotations
+
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from . import __version__
+from .cache import library_versions
+from .exceptions import ConversionError, DependencyMissingError
+from .options import AIOptions, DXFOptions
+
+AI_METHODS = ("pymupdf", "pdf2image")
+DEFAULT_DPIS = (72, 150, 300)
+
+# A render callable converts one file to one target and returns its stage durations.
+RenderFn = Callable[[Path, Path], Dict[str, float]]
+
+
+@dataclass(slots=True)
+class CorpusSpec:
+    """Size of a synthetic benchmark corpus."""
+
+    files: int = 5
+    pages: int = 1
+    entities: int = 500
+    text_density: float = 0.1
+    seed: int = 0
+
+
+@dataclass(slots=True)
+class Corpus:
+    """Generated benchmark inputs."""
+
+    directory: Path
+    spec: CorpusSpec
+    ai_files: List[Path]
+    dxf_files: List[Path]
+
+
+def write_synthetic_pdf(
+    path: Path,
+    pages: int = 1,
+    entities: int = 500,
+    text_density: float = 0.1,
+    seed: int = 0,
+) -> Path:
+    """Write a PDF-based ``.ai`` file with *entities* strokes/text runs on every page.
+
+    *text_density* is the fraction of entities emitted as text instead of line work.
+    """
+    rng = random.Random(seed)
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for _ in range(max(1, pages)):
+        lines = ["0.5 w"]
+        for index in range(entities):
+            x, y = rng.uniform(20, 575), rng.uniform(20, 822)
+            if rng.random() < text_density:
+                lines.append(f"BT /F1 {rng.randint(4, 18)} Tf {x:.2f} {y:.2f} Td (Label {index}) Tj ET")
+            else:
+                dx, dy = rng.uniform(-80, 80), rng.uniform(-80, 80)
+                red, green, blue = rng.random(), rng.random(), rng.random()
+                lines.append(f"{red:.2f} {green:.2f} {blue:.2f} RG {x:.2f} {y:.2f} m {x + dx:.2f} {y + dy:.2f} l S")
+        stream = "\n".join(lines).encode("ascii")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % number for number in kids),
+        len(kids),
+    )
+
+    body = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, content in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += b"%d 0 obj\n%s\nendobj\n" % (number, content)
+    xref = len(body)
+    body += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        body += b"%010d 00000 n \n" % offset
+    body += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(body))
+    return path
+
+
+def write_synthetic_dxf(path: Path, entities: int = 500, text_density: float = 0.1, seed: int = 0) -> Path:
+    """Write an R12 ASCII DXF with a random mix of LINE, CIRCLE and TEXT entities."""
+    rng = random.Random(seed)
+    tags = ["0", "SECTION", "2", "HEADER", "9", "$ACADVER", "1", "AC1009", "0", "ENDSEC"]
+    tags += ["0", "SECTION", "2", "ENTITIES"]
+    for index in range(entities):
+        x, y = rng.uniform(0, 1000), rng.uniform(0, 700)
+        color = str(rng.randint(1, 7))
+        if rng.random() < text_density:
+            tags += ["0", "TEXT", "8", "0", "62", color, "10", f"{x:.3f}", "20", f"{y:.3f}", "30", "0.0"]
+            tags += ["40", f"{rng.uniform(1, 8):.2f}", "1", f"Label {index}"]
+        elif rng.random() < 0.2:
+            tags += ["0", "CIRCLE", "8", "0", "62", color, "10", f"{x:.3f}", "20", f"{y:.3f}", "30", "0.0"]
+            tags += ["40", f"{rng.uniform(1, 40):.3f}"]
+        else:
+            x2, y2 = x + rng.uniform(-60, 60), y + rng.uniform(-60, 60)
+            tags += ["0", "LINE", "8", "0", "62", color, "10", f"{x:.3f}", "20", f"{y:.3f}", "30", "0.0"]
+            tags += ["11", f"{x2:.3f}", "21", f"{y2:.3f}", "31", "0.0"]
+    tags += ["0", "ENDSEC", "0", "EOF"]
+    path.write_text("\n".join(tags) + "\n", encoding="ascii")
+    return path
+
+
+def generate_corpus(directory: str | Path, spec: CorpusSpec | None = None) -> Corpus:
+    """Create ``spec.files`` AI and DXF inputs inside *directory*."""
+    spec = spec or CorpusSpec()
+    root = Path(directory).expanduser().resolve()
+    root.mkdir(parents=True, exist_ok=True)
+    ai_files, dxf_files = [], []
+    for index in range(spec.files):
+        seed = spec.seed + index
+        ai_files.append(
+            write_synthetic_pdf(
+                root / f"bench-{index:03d}.ai", spec.pages, spec.entities, spec.text_density, seed=seed
+            )
+        )
+        dxf_files.append(
+            write_synthetic_dxf(root / f"bench-{index:03d}.dxf", spec.entities, spec.text_density, seed=seed)
+        )
+    return Corpus(directory=root, spec=spec, ai_files=ai_files, dxf_files=dxf_files)
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile (``fraction`` in ``0..1``) of *values*."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, round(fraction * len(ordered) + 0.5 - 1e-9))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Return the peak resident set size of this process, or ``None`` when unavailable."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_benchmark(
+    corpus: Corpus,
+    dpis: Sequence[int] = DEFAULT_DPIS,
+    ai_methods: Sequence[str] = AI_METHODS,
+    include_dxf: bool = True,
+    output_dir: str | Path | None = None,
+) -> dict:
+    """Render the corpus with every AI method and the DXF pipeline at each DPI.
+
+    Returns a JSON-serializable report. Cases whose dependencies are missing are
+    reported as skipped; peak RSS is the process high-water mark after each case.
+    """
+    from .converters.ai import AIConverter
+    from .converters.dxf import DXFConverter
+
+    with tempfile.TemporaryDirectory(prefix="vector2png-bench-") as scratch:
+        out_root = Path(output_dir).expanduser().resolve() if output_dir else Path(scratch)
+        cases = []
+        for dpi in dpis:
+            for method in ai_methods:
+                converter = AIConverter()
+                render = _ai_render(converter, AIOptions(dpi=dpi, prefer_method=method, fallback=False))
+                skip = None
+                if method == "pdf2image" and not converter.pdf2image_available:
+                    skip = "pdf2image is not installed"
+                cases.append(
+                    _run_case(f"ai-{method}-{dpi}", "ai", method, dpi, corpus.ai_files, out_root, render, skip)
+                )
+            if include_dxf:
+                render = _dxf_render(DXFConverter(), DXFOptions(dpi=dpi))
+                cases.append(_run_case(f"dxf-{dpi}", "dxf", "ezdxf", dpi, corpus.dxf_files, out_root, render))
+
+    return {
+        "vector2png": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "libraries": dict(library_versions()),
+        "corpus": asdict(corpus.spec),
+        "cases": cases,
+    }
+
+
+def _ai_render(converter, opts: AIOptions) -> RenderFn:
+    """Return a render callable timing a whole AI conversion."""
+
+    def render(source: Path, target: Path) -> Dict[str, float]:
+        started = time.perf_counter()
+        converter.convert(source, target, opts)
+        return {"render": time.perf_counter() - started}
+
+    return render
+
+
+def _dxf_render(converter, opts: DXFOptions) -> RenderFn:
+    """Return a render callable timing DXF parsing and rasterization separately."""
+
+    def render(source: Path, target: Path) -> Dict[str, float]:
+        started = time.perf_counter()
+        with converter.open(source, opts) as session:
+            parsed = time.perf_counter()
+            session.render(target, opts)
+        finished = time.perf_counter()
+        return {"parse": parsed - started, "render": finished - parsed}
+
+    return render
+
+
+def _run_case(
+    name: str,
+    kind: str,
+    method: str,
+    dpi: int,
+    files: Sequence[Path],
+    out_root: Path,
+    render: RenderFn,
+    skip: Optional[str] = None,
+) -> dict:
+    result: dict = {"name": name, "kind": kind, "method": method, "dpi": dpi, "files": len(files)}
+    if skip:
+        result["skipped"] = skip
+        return result
+
+    out_dir = out_root / name
+    out_dir.mkdir(parents=True, exist_ok=True)
+    latencies: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    errors = 0
+    started = time.perf_counter()
+    for source in files:
+        file_started = time.perf_counter()
+        try:
+            timings = render(source, out_dir / f"{source.stem}.png")
+        except DependencyMissingError as exc:
+            result["skipped"] = str(exc)
+            return result
+        except ConversionError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - file_started)
+        for stage, seconds in timings.items():
+            stages.setdefault(stage, []).append(seconds)
+    elapsed = time.perf_counter() - started
+
+    result.update(
+        errors=errors,
+        seconds=round(elapsed, 6),
+        files_per_sec=round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        p50_ms=round(percentile(latencies, 0.5) * 1000, 3),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 3),
+        peak_rss_bytes=peak_rss_bytes(),
+        stages={
+            stage: {
+                "p50_ms": round(percentile(values, 0.5) * 1000, 3),
+                "total_s": round(sum(values), 6),
+            }
+            for stage, values in stages.items()
+        },
+    )
+    return result
+
+
+__all__ = [
+    "AI_METHODS",
+    "Corpus",
+    "CorpusSpec",
+    "DEFAULT_DPIS",
+    "generate_corpus",
+    "peak_rss_bytes",
+    "percentile",
+    "run_benchmark",
+    "write_synthetic_dxf",
+    "write_synthetic_pdf",
+]
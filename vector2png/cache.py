@@ -0,0 +1,213 @@
+"""Content-addressed on-disk cache for rendered PNGs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass, is_dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB
+
+# Option fields that never change the rendered pixels and are left out of cache keys.
+IGNORED_OPTION_FIELDS = frozenset({"timeout", "normalize_workers", "persist_index"})
+
+_VERSIONED_PACKAGES = ("vector2png", "pymupdf", "ezdxf", "pdf2image", "Pillow")
+_SIZE_PATTERN = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Summary of the cache directory contents."""
+
+    directory: Path
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int = 0
+    misses: int = 0
+
+
+def default_cache_dir() -> Path:
+    """Return ``$VECTOR2PNG_CACHE_DIR`` or the per-user cache directory."""
+    env = os.environ.get("VECTOR2PNG_CACHE_DIR")
+    if env:
+        return Path(env).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "vector2png"
+
+
+def parse_size(value: str | int) -> int:
+    """Parse sizes such as ``512M`` or ``2G`` into bytes."""
+    if isinstance(value, int):
+        return value
+    match = _SIZE_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Invalid size '{value}'; use e.g. 500M or 2G")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " kmgt".index(unit.lower() or " "))
+
+
+@lru_cache(maxsize=1)
+def library_versions() -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Return installed versions of the packages that influence rendering."""
+    from importlib import metadata
+
+    versions = []
+    for package in _VERSIONED_PACKAGES:
+        try:
+            versions.append((package, metadata.version(package)))
+        except metadata.PackageNotFoundError:
+            versions.append((package, None))
+    return tuple(versions)
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the BLAKE2b digest of the file contents."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_options(options: Any) -> Dict[str, Any]:
+    """Return a JSON-friendly mapping of the render-affecting option fields."""
+    if options is None:
+        return {}
+    data = asdict(options) if is_dataclass(options) else dict(vars(options))
+    return {key: value for key, value in sorted(data.items()) if key not in IGNORED_OPTION_FIELDS}
+
+
+class RenderCache:
+    """Size-bounded LRU cache of PNG outputs keyed by input content and options.
+
+    Entries are stored as ``<directory>/<aa>/<key>.png``. A hit hardlinks (or copies,
+    across filesystems) the cached PNG to the requested target and refreshes its
+    modification time, which doubles as the LRU timestamp used by :meth:`prune`.
+    """
+
+    def __init__(self, directory: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory).expanduser() if directory else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._approx_bytes: Optional[int] = None
+
+    def key_for(self, source: Path, namespace: str, options: Any) -> str:
+        """Return the cache key for rendering *source* with *options*."""
+        payload = json.dumps(
+            {
+                "source": hash_file(source),
+                "converter": namespace,
+                "options": normalize_options(options),
+                "versions": library_versions(),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.png"
+
+    def fetch(self, key: str, target: Path) -> bool:
+        """Materialize the cached PNG for *key* at *target*; return ``False`` on a miss."""
+        entry = self.path_for(key)
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() or target.is_symlink():
+            target.unlink()
+        try:
+            os.link(entry, target)
+        except OSError:
+            shutil.copyfile(entry, target)
+        self.hits += 1
+        return True
+
+    def store(self, key: str, png_path: Path) -> None:
+        """Copy a freshly rendered PNG into the cache and evict old entries if needed."""
+        entry = self.path_for(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(png_path, tmp_name)
+            os.replace(tmp_name, entry)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        if self._approx_bytes is None:
+            self._approx_bytes = sum(size for _, size, _ in self._entries())
+        else:
+            self._approx_bytes += entry.stat().st_size
+        if self._approx_bytes > self.max_bytes:
+            self.prune()
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Evict least recently used entries until the cache fits *max_bytes*; return the count."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._approx_bytes = total
+        return removed
+
+    def clear(self) -> int:
+        """Remove every cache entry and return the count."""
+        return self.prune(max_bytes=0)
+
+    def stats(self) -> CacheStats:
+        entries = self._entries()
+        return CacheStats(
+            directory=self.directory,
+            entries=len(entries),
+            bytes=sum(size for _, size, _ in entries),
+            max_bytes=self.max_bytes,
+            hits=self.hits,
+            misses=self.misses,
+        )
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        if not self.directory.exists():
+            return []
+        entries = []
+        for path in self.directory.glob("*/*.png"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+
+__all__ = [
+    "CacheStats",
+    "RenderCache",
+    "default_cache_dir",
+    "hash_file",
+    "library_versions",
+    "normalize_options",
+    "parse_size",
+]
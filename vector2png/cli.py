@@ -3,13 +3,22 @@
 from __future__ import annotations
 
 import argparse
+import json
 import logging
 import sys
+import tempfile
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Sequence
 
-from . import AIConverter, AIOptions, DXFConverter, DXFOptions, __version__
+from . import __version__
+from .cache import DEFAULT_MAX_BYTES, RenderCache, parse_size
 from .exceptions import ConversionError, DependencyMissingError
+from .metrics import JSONLinesExporter, PrometheusExporter
+from .options import DEFAULT_STREAM_THRESHOLD, AIOptions, DXFOptions
+
+# Converters and the batch runner are imported inside their subcommands so that
+# PyMuPDF, ezdxf and multiprocessing are only loaded when a conversion needs them.
 
 
 def parse_rgb(value: str | None):
@@ -25,13 +34,84 @@ def parse_rgb(value: str | None):
         raise argparse.ArgumentTypeError("Color values must be integers") from exc
 
 
+def parse_int_list(value: str) -> list:
+    """Parse a comma separated list of integers such as ``72,150,600``."""
+    try:
+        return [int(part) for part in value.split(",") if part.strip()]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("Expected comma separated integers, e.g. 72,150,600") from exc
+
+
+def parse_name_list(value: str) -> tuple:
+    """Parse a comma separated list of names such as ``WALLS,DOORS``."""
+    names = tuple(part.strip() for part in value.split(",") if part.strip())
+    if not names:
+        raise argparse.ArgumentTypeError("Expected comma separated names, e.g. WALLS,DOORS")
+    return names
+
+
+def parse_bbox(value: str) -> tuple:
+    """Parse ``xmin,ymin,xmax,ymax`` drawing coordinates."""
+    try:
+        box = tuple(float(part) for part in value.split(","))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("Bounding box values must be numbers") from exc
+    if len(box) != 4 or box[0] >= box[2] or box[1] >= box[3]:
+        raise argparse.ArgumentTypeError("Bounding box must look like 'xmin,ymin,xmax,ymax' with min < max")
+    return box
+
+
+def parse_size_arg(value: str) -> int:
+    """Parse a human readable size such as ``500M`` for argparse."""
+    try:
+        return parse_size(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Convert vector graphics to PNG")
     parser.add_argument("--version", action="version", version=f"vector2png {__version__}")
 
+    cache_options = argparse.ArgumentParser(add_help=False)
+    cache_options.add_argument("--cache", action="store_true", help="Reuse cached PNGs for unchanged inputs")
+    cache_options.add_argument("--cache-dir", type=Path, help="Render cache directory (implies --cache)")
+    cache_options.add_argument(
+        "--cache-max-size",
+        type=parse_size_arg,
+        default=DEFAULT_MAX_BYTES,
+        help="Evict least recently used entries beyond this size (e.g. 500M, 2G)",
+    )
+
+    profile_options = argparse.ArgumentParser(add_help=False)
+    profile_options.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="Report per-stage timings to FILE (default: stderr)",
+    )
+    profile_options.add_argument(
+        "--profile-format",
+        choices=["jsonl", "prometheus"],
+        default="jsonl",
+        help="Profile output: one JSON event per line, or Prometheus text metrics",
+    )
+
+    daemon_options = argparse.ArgumentParser(add_help=False)
+    daemon_options.add_argument("--socket", type=Path, help="Daemon socket (default: $VECTOR2PNG_SOCKET)")
+    daemon_options.add_argument(
+        "--no-daemon",
+        dest="daemon",
+        action="store_false",
+        help="Always convert in-process, even when a 'vector2png serve' daemon is running",
+    )
+
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    ai_parser = subparsers.add_parser("ai", help="Convert Adobe Illustrator files")
+    ai_parser = subparsers.add_parser(
+        "ai", help="Convert Adobe Illustrator files", parents=[cache_options, profile_options, daemon_options]
+    )
     ai_parser.add_argument("source", type=Path)
     ai_parser.add_argument("target", type=Path, nargs="?")
     ai_parser.add_argument("--dpi", type=int, default=300)
@@ -44,12 +124,35 @@ def build_parser() -> argparse.ArgumentParser:
         help="Preferred rendering method",
     )
     ai_parser.add_argument("--no-fallback", dest="fallback", action="store_false")
+    ai_parser.add_argument(
+        "--pages",
+        help="Pages to render, e.g. 'all' or '1-3,5'; writes <stem>-<page>.png per page",
+    )
+    ai_parser.add_argument("--workers", type=int, help="Worker processes for multi-page rendering")
+    ai_parser.add_argument(
+        "--pyramid",
+        choices=["dzi", "xyz"],
+        help="Write a tile pyramid (target is the output directory) instead of a single PNG",
+    )
+    ai_parser.add_argument("--pyramid-tile-size", type=int, default=256, help="Pyramid tile edge in pixels")
+    ai_parser.add_argument(
+        "--tile-size",
+        type=int,
+        help="Render in bands of this many pixel rows to bound memory on very large outputs",
+    )
     ai_parser.set_defaults(fallback=True)
 
-    dxf_parser = subparsers.add_parser("dxf", help="Convert DXF drawings")
+    dxf_parser = subparsers.add_parser(
+        "dxf", help="Convert DXF drawings", parents=[cache_options, profile_options, daemon_options]
+    )
     dxf_parser.add_argument("source", type=Path)
     dxf_parser.add_argument("target", type=Path, nargs="?")
     dxf_parser.add_argument("--dpi", type=int, default=300)
+    dxf_parser.add_argument(
+        "--dpis",
+        type=parse_int_list,
+        help="Comma separated DPIs rendered from one drawing pass, e.g. 72,150,600 (<stem>-<dpi>dpi.png)",
+    )
     dxf_parser.add_argument("--background", choices=["white", "black", "default", "off"], default="white")
     dxf_parser.add_argument(
         "--color",
@@ -58,6 +161,11 @@ def build_parser() -> argparse.ArgumentParser:
     )
     dxf_parser.add_argument("--scale", type=float, default=1.0)
     dxf_parser.add_argument("--layout", dest="layout_name")
+    dxf_parser.add_argument(
+        "--all-layouts",
+        action="store_true",
+        help="Render every non-empty layout to <stem>-<layout>.png (target is a directory)",
+    )
     dxf_parser.add_argument("--page-width", type=float, default=0)
     dxf_parser.add_argument("--page-height", type=float, default=0)
     dxf_parser.add_argument("--margins", type=float, default=20)
@@ -69,30 +177,314 @@ def build_parser() -> argparse.ArgumentParser:
         type=float,
         help="POINT entity size; values <=0 will be set to 1 to avoid ezdxf relative point size warning",
     )
+    dxf_parser.add_argument(
+        "--pyramid",
+        choices=["dzi", "xyz"],
+        help="Write a tile pyramid (target is the output directory) instead of a single PNG",
+    )
+    dxf_parser.add_argument("--pyramid-tile-size", type=int, default=256, help="Pyramid tile edge in pixels")
+    dxf_parser.add_argument(
+        "--tile-size",
+        type=int,
+        help="Render in bands of this many pixel rows to bound memory on very large outputs",
+    )
     dxf_parser.add_argument(
         "--normalize-relative-size",
         action="store_true",
         help="Normalize MTEXT relative height markers (\\H...x) to absolute sizes to avoid ezdxf notice",
     )
+    dxf_parser.add_argument(
+        "--normalize-workers",
+        type=int,
+        default=1,
+        help="Processes for --normalize-relative-size on drawings with very many MTEXT entities",
+    )
+    dxf_parser.add_argument("--layers", type=parse_name_list, help="Only draw these layers, e.g. WALLS,DOORS")
+    dxf_parser.add_argument("--exclude-layers", type=parse_name_list, help="Skip these layers")
+    dxf_parser.add_argument("--entity-types", type=parse_name_list, help="Only draw these types, e.g. LINE,ARC")
+    dxf_parser.add_argument(
+        "--bbox",
+        type=parse_bbox,
+        help="Only draw entities intersecting 'xmin,ymin,xmax,ymax' (drawing units)",
+    )
+    dxf_parser.add_argument(
+        "--lod",
+        action="store_true",
+        help="Drop sub-pixel entities, box illegible text and decimate polylines (fast thumbnails)",
+    )
+    dxf_parser.add_argument(
+        "--lod-threshold", type=float, default=1.0, help="LOD size threshold in output pixels (default 1)"
+    )
+    dxf_parser.add_argument(
+        "--lod-text-height", type=float, default=4.0, help="Text shorter than this many pixels is boxed (default 4)"
+    )
+    dxf_parser.add_argument(
+        "--persist-index",
+        action="store_true",
+        help="Save the --bbox spatial index next to the drawing for later region renders",
+    )
+    dxf_parser.add_argument(
+        "--stream",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Draw modelspace while reading the file instead of loading the document "
+        "(default: only files of at least --stream-threshold)",
+    )
+    dxf_parser.add_argument(
+        "--stream-threshold",
+        type=parse_size_arg,
+        default=DEFAULT_STREAM_THRESHOLD,
+        help="File size from which DXF files are streamed, e.g. 256M (default 256M)",
+    )
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="Convert many AI/DXF files in parallel", parents=[cache_options]
+    )
+    batch_parser.add_argument("sources", nargs="+", help="Files, directories or glob patterns")
+    batch_parser.add_argument(
+        "--output-dir", type=Path, help="Directory for PNGs, keeping relative subdirectories (default: next to sources)"
+    )
+    batch_parser.add_argument("--dpi", type=int, default=300)
+    batch_parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    batch_parser.add_argument("--chunksize", type=int, default=1, help="Files sent to a worker at once")
+    batch_parser.add_argument("--timeout", type=float, help="Per-file timeout in seconds")
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="Convert new or changed files in a directory as they arrive", parents=[cache_options]
+    )
+    watch_parser.add_argument("directory", type=Path)
+    watch_parser.add_argument("--output-dir", type=Path, help="Mirror PNGs here (default: next to sources)")
+    watch_parser.add_argument("--dpi", type=int, default=300)
+    watch_parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    watch_parser.add_argument("--interval", type=float, default=2.0, help="Seconds between scans")
+    watch_parser.add_argument(
+        "--settle",
+        type=float,
+        default=2.0,
+        help="Only convert files left unmodified for this many seconds",
+    )
+    watch_parser.add_argument("--manifest", type=Path, help="SQLite manifest path (default: inside the directory)")
+    watch_parser.add_argument("--timeout", type=float, help="Per-file timeout in seconds")
+    watch_parser.add_argument("--no-recursive", dest="recursive", action="store_false", help="Ignore subdirectories")
+    watch_parser.add_argument("--once", action="store_true", help="Scan and convert once, then exit")
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a warm conversion daemon on a Unix socket", parents=[cache_options]
+    )
+    serve_parser.add_argument("--socket", type=Path, help="Socket path (default: $VECTOR2PNG_SOCKET)")
+    serve_parser.add_argument("--workers", type=int, default=1, help="Worker processes (default 1: in-process)")
+    serve_parser.add_argument("--status", action="store_true", help="Report whether a daemon is running")
+    serve_parser.add_argument("--stop", action="store_true", help="Stop the running daemon")
+
+    bench_parser = subparsers.add_parser("bench", help="Benchmark the AI and DXF rendering paths")
+    bench_parser.add_argument("--output", "-o", type=Path, help="Write the JSON report here (default: stdout)")
+    bench_parser.add_argument("--corpus-dir", type=Path, help="Keep the generated corpus in this directory")
+    bench_parser.add_argument("--files", type=int, default=5, help="Files generated per kind")
+    bench_parser.add_argument("--pages", type=int, default=1, help="Pages per AI file")
+    bench_parser.add_argument("--entities", type=int, default=500, help="Entities per page/drawing")
+    bench_parser.add_argument("--text-density", type=float, default=0.1, help="Fraction of entities that are text")
+    bench_parser.add_argument(
+        "--dpis", type=parse_int_list, default=[72, 150, 300], help="Comma separated DPIs (default 72,150,300)"
+    )
+    bench_parser.add_argument(
+        "--methods",
+        type=lambda value: [part.strip() for part in value.split(",") if part.strip()],
+        default=["pymupdf", "pdf2image"],
+        help="AI methods to benchmark (default pymupdf,pdf2image; empty skips AI)",
+    )
+    bench_parser.add_argument("--no-dxf", dest="dxf", action="store_false", help="Skip the DXF pipeline")
+
+    info_parser = subparsers.add_parser(
+        "info", help="Report pages, layouts, extents and entity counts without rendering"
+    )
+    info_parser.add_argument("sources", nargs="+", help="Files, directories or glob patterns")
+    info_parser.add_argument(
+        "--header-only",
+        action="store_true",
+        help="Only read DXF headers and AI page boxes (no entity counts or cost estimate)",
+    )
+    info_parser.add_argument("--output", "-o", type=Path, help="Write the JSON lines here (default: stdout)")
+
+    cache_parser = subparsers.add_parser("cache", help="Inspect or prune the render cache")
+    cache_parser.add_argument("action", choices=["stats", "prune", "clear"])
+    cache_parser.add_argument("--cache-dir", type=Path, help="Render cache directory")
+    cache_parser.add_argument(
+        "--max-size",
+        type=parse_size_arg,
+        default=DEFAULT_MAX_BYTES,
+        help="Size limit used by 'prune' (e.g. 500M, 2G)",
+    )
 
     return parser
 
 
+def build_cache(args: argparse.Namespace) -> RenderCache | None:
+    """Return the render cache requested on the command line, if any."""
+    if not (getattr(args, "cache", False) or getattr(args, "cache_dir", None)):
+        return None
+    return RenderCache(args.cache_dir, max_bytes=args.cache_max_size)
+
+
+def build_profiler(args: argparse.Namespace) -> JSONLinesExporter | PrometheusExporter | None:
+    """Return the stage observer requested with ``--profile``, if any."""
+    target = getattr(args, "profile", None)
+    if target is None:
+        return None
+    if args.profile_format == "prometheus":
+        return PrometheusExporter()
+    return JSONLinesExporter(None if target == "-" else target)
+
+
+def finish_profiler(profiler: JSONLinesExporter | PrometheusExporter | None, args: argparse.Namespace) -> None:
+    """Flush the ``--profile`` output."""
+    if isinstance(profiler, PrometheusExporter):
+        if args.profile == "-":
+            sys.stderr.write(profiler.render())
+        else:
+            profiler.write(args.profile)
+    elif profiler is not None:
+        profiler.close()
+
+
+def forward_to_daemon(kind: str, args: argparse.Namespace, options) -> bool:
+    """Convert through a running daemon if this is a plain single-file conversion.
+
+    Returns ``False`` (convert in-process) when no daemon answers or the request uses
+    features the daemon protocol does not cover.
+    """
+    if not args.daemon or args.profile is not None or build_cache(args) is not None:
+        return False
+    if args.pyramid or getattr(args, "pages", None) or getattr(args, "dpis", None):
+        return False
+    if getattr(args, "all_layouts", False):
+        return False
+
+    from .server import DaemonClient
+
+    output = DaemonClient(args.socket).convert(kind, args.source, args.target, options)
+    if output is None:
+        return False
+    logging.debug("Converted %s via daemon -> %s", args.source, output)
+    return True
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
     logging.basicConfig(level=logging.INFO)
+    profiler = build_profiler(args)
+    observers = [profiler] if profiler is not None else None
 
     try:
-        if args.command == "ai":
+        if args.command == "cache":
+            cache = RenderCache(args.cache_dir, max_bytes=args.max_size)
+            if args.action == "prune":
+                logging.info("Removed %d cache entries", cache.prune())
+            elif args.action == "clear":
+                logging.info("Removed %d cache entries", cache.clear())
+            stats = cache.stats()
+            print(f"directory: {stats.directory}")
+            print(f"entries:   {stats.entries}")
+            print(f"size:      {stats.bytes} bytes (limit {stats.max_bytes})")
+        elif args.command == "serve":
+            from .server import ConversionDaemon, DaemonClient
+
+            client = DaemonClient(args.socket)
+            if args.status or args.stop:
+                status = client.ping()
+                if status is None:
+                    logging.info("No daemon is listening on %s", client.socket_path)
+                    return 1 if args.status else 0
+                if args.stop:
+                    client.shutdown()
+                    logging.info("Stopped daemon (pid %s)", status["pid"])
+                else:
+                    logging.info("Daemon pid %s listening on %s", status["pid"], client.socket_path)
+                    documents = status.get("documents")
+                    if documents:
+                        logging.info(
+                            "Document cache: %d documents, %d hits, %d misses, %d evictions",
+                            documents["documents"],
+                            documents["hits"] + documents["revived"],
+                            documents["misses"],
+                            documents["evictions"],
+                        )
+                return 0
+            daemon = ConversionDaemon(args.socket, workers=args.workers, cache=build_cache(args))
+            try:
+                daemon.serve_forever()
+            except KeyboardInterrupt:
+                logging.info("Daemon stopped")
+        elif args.command == "watch":
+            from .watch import DirectoryWatcher
+
+            with DirectoryWatcher(
+                args.directory,
+                output_dir=args.output_dir,
+                ai_options=AIOptions(dpi=args.dpi),
+                dxf_options=DXFOptions(dpi=args.dpi),
+                workers=args.workers,
+                interval=args.interval,
+                settle=args.settle,
+                recursive=args.recursive,
+                manifest=args.manifest,
+                timeout=args.timeout,
+                cache=build_cache(args),
+            ) as watcher:
+                logging.info("Watching %s (Ctrl+C to stop)", watcher.directory)
+                try:
+                    watcher.run(max_polls=1 if args.once else None)
+                except KeyboardInterrupt:
+                    logging.info("Stopped watching %s", watcher.directory)
+        elif args.command == "info":
+            from .inspection import inspect_many
+
+            failed = 0
+            with open(args.output, "w", encoding="utf-8") if args.output else nullcontext(sys.stdout) as stream:
+                for inspection in inspect_many(args.sources, header_only=args.header_only):
+                    stream.write(json.dumps(inspection.to_dict()) + "\n")
+                    if not inspection.ok:
+                        failed += 1
+                        logging.error("%s: %s", inspection.source, inspection.error)
+            if failed:
+                return 1
+        elif args.command == "bench":
+            from .bench import CorpusSpec, generate_corpus, run_benchmark
+
+            spec = CorpusSpec(
+                files=args.files, pages=args.pages, entities=args.entities, text_density=args.text_density
+            )
+            with tempfile.TemporaryDirectory(prefix="vector2png-corpus-") as scratch:
+                corpus = generate_corpus(args.corpus_dir or scratch, spec)
+                report = run_benchmark(corpus, dpis=args.dpis, ai_methods=args.methods, include_dxf=args.dxf)
+            text = json.dumps(report, indent=2)
+            if args.output:
+                args.output.write_text(text + "\n", encoding="utf-8")
+            else:
+                print(text)
+        elif args.command == "ai":
             options = AIOptions(
                 dpi=args.dpi,
                 transparent=args.transparent,
                 background_color=args.background,
                 prefer_method=args.prefer,
                 fallback=args.fallback,
+                pages=args.pages,
+                tile_size=args.tile_size,
             )
-            AIConverter().convert(args.source, target=args.target, options=options)
+            if forward_to_daemon("ai", args, options):
+                return 0
+            from .converters.ai import AIConverter
+
+            converter = AIConverter(cache=build_cache(args), observers=observers)
+            if args.pyramid:
+                converter.convert_tiles(
+                    args.source, args.target, options, tile_size=args.pyramid_tile_size, layout=args.pyramid
+                )
+            elif args.pages:
+                converter.convert_pages(args.source, target=args.target, options=options, workers=args.workers)
+            else:
+                converter.convert(args.source, target=args.target, options=options)
         elif args.command == "dxf":
             options = DXFOptions(
                 dpi=args.dpi,
@@ -108,8 +500,56 @@ def main(argv: Sequence[str] | None = None) -> int:
                 max_height=args.max_height,
                 pdsize=args.pdsize,
                 normalize_relative_size=args.normalize_relative_size,
+                normalize_workers=args.normalize_workers,
+                layers=args.layers,
+                exclude_layers=args.exclude_layers,
+                entity_types=args.entity_types,
+                bbox=args.bbox,
+                persist_index=args.persist_index,
+                lod=args.lod,
+                lod_threshold=args.lod_threshold,
+                lod_text_height=args.lod_text_height,
+                stream=args.stream,
+                stream_threshold=args.stream_threshold,
+                tile_size=args.tile_size,
+            )
+            if forward_to_daemon("dxf", args, options):
+                return 0
+            from .converters.dxf import DXFConverter
+
+            converter = DXFConverter(cache=build_cache(args), observers=observers)
+            if args.pyramid:
+                converter.convert_tiles(
+                    args.source, args.target, options, tile_size=args.pyramid_tile_size, layout=args.pyramid
+                )
+            elif args.all_layouts:
+                converter.convert_all_layouts(args.source, target_dir=args.target, options=options)
+            elif args.dpis:
+                converter.convert_multi(args.source, args.dpis, target=args.target, options=options)
+            else:
+                converter.convert(args.source, target=args.target, options=options)
+        elif args.command == "batch":
+            from .batch import convert_batch, summarize
+
+            results = convert_batch(
+                args.sources,
+                output_dir=args.output_dir,
+                ai_options=AIOptions(dpi=args.dpi),
+                dxf_options=DXFOptions(dpi=args.dpi),
+                workers=args.workers,
+                chunksize=args.chunksize,
+                timeout=args.timeout,
+                cache=build_cache(args),
+            )
+            for result in results:
+                if not result.ok:
+                    logging.error("%s: %s", result.source, result.error)
+            stats = summarize(results)
+            logging.info(
+                "Converted %d/%d files (%d failed)", stats["succeeded"], stats["total"], stats["failed"]
             )
-            DXFConverter().convert(args.source, target=args.target, options=options)
+            if stats["failed"]:
+                return 1
     except (ConversionError, DependencyMissingError, FileNotFoundError) as exc:
         logging.error("%s", exc)
         return 1
@@ -117,6 +557,8 @@ def main(argv: Sequence[str] | None = None) -> int:
         logging.debug("Unexpected error", exc_info=True)
         logging.error("Unexpected error: %s", exc)
         return 1
+    finally:
+        finish_profiler(profiler, args)
 
     return 0
 
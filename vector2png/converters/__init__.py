@@ -1,7 +1,32 @@
-"""Conversion helpers exposed for advanced use cases."""
+"""Conversion helpers exposed for advanced use cases.
 
-from .ai import AIConverter
-from .dxf import DXFConverter
+The converter modules are imported on first access so that importing
+:mod:`vector2png.converters.base` does not pull in the AI and DXF stacks.
+"""
 
-__all__ = ["AIConverter", "DXFConverter"]
+from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - imports for type checkers only
+    from .ai import AIConverter
+    from .dxf import DXFConverter, DXFDocumentSession, DXFStreamSession
+
+__all__ = ["AIConverter", "DXFConverter", "DXFDocumentSession", "DXFStreamSession"]
+
+_LAZY_ATTRIBUTES = {
+    "AIConverter": ".ai",
+    "DXFConverter": ".dxf",
+    "DXFDocumentSession": ".dxf",
+    "DXFStreamSession": ".dxf",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -2,27 +2,67 @@
 
 from __future__ import annotations
 
+import importlib.util
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
-
-try:  # pragma: no cover - import guard for test environments
-    import fitz  # PyMuPDF
-except ModuleNotFoundError:  # pragma: no cover - fall back to dependency error
-    fitz = None  # type: ignore[assignment]
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
 
+from ..cache import RenderCache
+from ..documents import DocumentCache
 from ..exceptions import ConversionError, DependencyMissingError
+from ..metrics import Observer
 from ..options import AIOptions
-from ..utils import ensure_input_path, ensure_output_path, optional_import
+from ..raster import DisplayListPage, backdrop, render_banded, render_banded_to_path
+from ..tiles import LAYOUTS, TilePyramid, default_tile_dir
+from ..utils import (
+    BinarySource,
+    ensure_input_path,
+    ensure_output_path,
+    ensure_page_output_path,
+    optional_import,
+    parse_page_selection,
+    read_binary,
+)
 from .base import BaseConverter
 
+_UNLOADED: Any = object()
+
+# PyMuPDF is imported on first use (see _load_fitz) so importing this module stays cheap;
+# None means it is not installed. Tests replace this attribute with a stub.
+fitz: Any = _UNLOADED
+
+ResultT = TypeVar("ResultT")
+
+# A document source is a path on disk or the raw bytes of an in-memory document.
+SourceT = Union[Path, bytes]
+# Rendered PNGs are written either to a path or to a binary stream.
+SinkT = Union[Path, BinaryIO]
+
+# Per-process state for page rendering workers: one converter and one open document.
+_WORKER_STATE: Dict[str, object] = {}
+
 
 class AIConverter(BaseConverter[AIOptions]):
     """Convert Adobe Illustrator (AI) files to PNG images."""
 
-    def __init__(self) -> None:
-        super().__init__()
+    kind = "ai"
+
+    def __init__(
+        self,
+        cache: Optional[RenderCache] = None,
+        observers: Optional[Iterable[Observer]] = None,
+        documents: Optional[DocumentCache] = None,
+    ) -> None:
+        super().__init__(cache=cache, observers=observers)
         self.logger.debug("Initializing AIConverter")
         self.pdf2image_available = self._check_pdf2image()
+        #: Per-page display lists reused by ``convert`` and friends; ``None`` interprets every call.
+        self.documents = documents
 
     def convert(
         self,
@@ -34,44 +74,136 @@ class AIConverter(BaseConverter[AIOptions]):
         ai_path = ensure_input_path(source)
         png_path = ensure_output_path(ai_path, target)
 
-        methods = self._resolve_methods(ai_path, opts)
-        last_error: Optional[Exception] = None
+        handlers = {
+            "pymupdf": lambda: self._convert_with_pymupdf(ai_path, png_path, opts),
+            "pdf2image": lambda: self._convert_with_pdf2image(ai_path, png_path, opts),
+        }
+        self._cached_render(ai_path, png_path, opts, lambda: self._run_methods(ai_path, opts, handlers))
+        return png_path
 
-        for method in methods:
-            try:
-                if method == "pymupdf" and self._convert_with_pymupdf(ai_path, png_path, opts):
-                    return png_path
-                if method == "pdf2image" and self._convert_with_pdf2image(ai_path, png_path, opts):
-                    return png_path
-            except DependencyMissingError as exc:  # pragma: no cover - runtime specific
-                last_error = exc
-                self.logger.debug("Dependency missing when using %s: %s", method, exc)
-                if not opts.fallback:
-                    raise
-            except ConversionError as exc:  # pragma: no cover - integration heavy
-                last_error = exc
-                self.logger.debug("Conversion error via %s: %s", method, exc)
-                if not opts.fallback:
-                    raise
-            except Exception as exc:  # pragma: no cover - defensive
-                wrapped = ConversionError(str(exc))
-                last_error = wrapped
-                self.logger.debug("Unexpected error via %s: %s", method, exc)
-                if not opts.fallback:
-                    raise wrapped
-
-        if last_error:
-            raise last_error
-
-        raise ConversionError(f"Conversion failed for {ai_path} - no method succeeded")
+    def convert_pages(
+        self,
+        source: str | Path,
+        target: str | Path | None = None,
+        options: AIOptions | None = None,
+        workers: Optional[int] = None,
+    ) -> List[Path]:
+        """Render the pages selected by ``options.pages`` (default: all) to ``<stem>-<page>.png``.
+
+        The document is opened once per worker process and every page is written to disk
+        as soon as it is rasterized. ``workers`` defaults to the CPU count; ``1`` renders
+        sequentially in-process.
+        """
+        opts = options or AIOptions()
+        if opts.pages is None:
+            opts = replace(opts, pages="all")
+        ai_path = ensure_input_path(source)
+
+        handlers = {
+            "pymupdf": lambda: self._convert_pages_with_pymupdf(ai_path, target, opts, workers),
+            "pdf2image": lambda: self._convert_pages_with_pdf2image(ai_path, target, opts),
+        }
+        return self._run_methods(ai_path, opts, handlers)
+
+    def convert_bytes(self, data: BinarySource, options: AIOptions | None = None) -> bytes:
+        """Render in-memory AI/PDF content and return the PNG bytes without touching disk.
+
+        *data* may be ``bytes``, ``bytearray``, ``memoryview`` or a binary file object.
+        ``options.pages`` selects the page (default: the first one).
+        """
+        opts = options or AIOptions()
+        content = read_binary(data)
+        handlers = {
+            "pymupdf": lambda: self._convert_bytes_with_pymupdf(content, opts),
+            "pdf2image": lambda: self._convert_bytes_with_pdf2image(content, opts),
+        }
+        return self._run_methods(content, opts, handlers)
+
+    def convert_tiles(
+        self,
+        source: str | Path,
+        target_dir: str | Path | None = None,
+        options: AIOptions | None = None,
+        tile_size: int = 256,
+        layout: str = "dzi",
+        lazy: bool = False,
+    ) -> TilePyramid:
+        """Render a page (the first of ``options.pages``) into a DZI or XYZ tile pyramid.
+
+        ``options.dpi`` sets the full-resolution level. With ``lazy=True`` only the
+        descriptor is written and the returned pyramid keeps the document open so
+        :meth:`TilePyramid.tile` can render tiles on demand; close it when done.
+        """
+        opts = options or AIOptions()
+        if layout not in LAYOUTS:
+            raise ConversionError(f"Unknown tile layout '{layout}'; expected one of {', '.join(LAYOUTS)}")
+        ai_path = ensure_input_path(source)
+        doc = self._open_document(ai_path)
+        try:
+            with self._pymupdf_errors(ai_path):
+                number = self._select_pages(opts.pages, doc.page_count)[0]
+                pyramid = TilePyramid(
+                    _load_fitz(),
+                    self._page(doc, ai_path, number, opts),
+                    default_tile_dir(ai_path, target_dir),
+                    ai_path.stem,
+                    zoom=opts.dpi / 72.0,
+                    tile_size=tile_size,
+                    layout=layout,
+                    alpha=opts.transparent,
+                    on_close=partial(_close_quietly, doc),
+                )
+                pyramid.write_descriptor()
+                if not lazy:
+                    pyramid.generate()
+        except BaseException:
+            _close_quietly(doc)
+            raise
+        if not lazy:
+            pyramid.close()
+        return pyramid
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
-    def _resolve_methods(self, ai_path: Path, opts: AIOptions) -> List[str]:
+    def _run_methods(self, source: SourceT, opts: AIOptions, handlers: Dict[str, Callable[[], ResultT]]) -> ResultT:
+        """Try each resolved method in order and return the first successful result."""
+        methods = self._resolve_methods(source, opts)
+        with self.stage("convert", _describe(source)) as info:
+            last_error: Optional[Exception] = None
+
+            for method in methods:
+                try:
+                    result = handlers[method]()
+                    if result:
+                        info["method"] = method
+                        return result
+                except DependencyMissingError as exc:  # pragma: no cover - runtime specific
+                    last_error = exc
+                    self.logger.debug("Dependency missing when using %s: %s", method, exc)
+                    if not opts.fallback:
+                        raise
+                except ConversionError as exc:  # pragma: no cover - integration heavy
+                    last_error = exc
+                    self.logger.debug("Conversion error via %s: %s", method, exc)
+                    if not opts.fallback:
+                        raise
+                except Exception as exc:  # pragma: no cover - defensive
+                    wrapped = ConversionError(str(exc))
+                    last_error = wrapped
+                    self.logger.debug("Unexpected error via %s: %s", method, exc)
+                    if not opts.fallback:
+                        raise wrapped
+
+            if last_error:
+                raise last_error
+
+            raise ConversionError(f"Conversion failed for {_describe(source)} - no method succeeded")
+
+    def _resolve_methods(self, source: SourceT, opts: AIOptions) -> List[str]:
         """Return a prioritized list of conversion methods."""
         prefer = opts.prefer_method
-        is_pdf_based = self._is_pdf_based(ai_path)
+        is_pdf_based = self._is_pdf_based(source)
 
         if prefer == "auto":
             return ["pymupdf", "pdf2image"] if is_pdf_based else ["pdf2image", "pymupdf"]
@@ -81,85 +213,235 @@ class AIConverter(BaseConverter[AIOptions]):
             return ["pdf2image", "pymupdf"] if opts.fallback else ["pdf2image"]
         return ["pymupdf", "pdf2image"]
 
-    def _convert_with_pymupdf(self, ai_path: Path, png_path: Path, opts: AIOptions) -> bool:
-        """Render the AI file with PyMuPDF."""
+    def _select_pages(self, spec: Optional[str], page_count: int) -> List[int]:
+        """Resolve a page selector, raising ``ConversionError`` for empty documents or bad specs."""
+        if page_count == 0:
+            raise ConversionError("AI file contains no pages")
+        try:
+            return parse_page_selection(spec, page_count)
+        except ValueError as exc:
+            raise ConversionError(str(exc)) from exc
+
+    def _open_document(self, source: SourceT):
+        fitz = _load_fitz()
         if fitz is None:
             raise DependencyMissingError("PyMuPDF", "Install the base vector2png package dependencies.")
+        with self.stage("open", _describe(source)) as info:
+            try:
+                if isinstance(source, bytes):
+                    doc = fitz.open(stream=source, filetype="pdf")
+                else:
+                    doc = fitz.open(source)
+            except Exception as exc:
+                raise ConversionError(f"Failed to open AI file with PyMuPDF: {exc}") from exc
+            info["pages"] = doc.page_count
+        return doc
 
-        try:
-            doc = fitz.open(ai_path)
-        except Exception as exc:
-            raise ConversionError(f"Failed to open AI file with PyMuPDF: {exc}") from exc
+    def _page(self, doc, ai_path: Optional[Path], number: int, opts: AIOptions):
+        """Return page *number* of *doc*, replayed from a cached display list when possible.
 
-        try:
-            if doc.page_count == 0:
-                raise ConversionError("AI file contains no pages")
-
-            page = doc[0]
-            zoom = opts.dpi / 72.0
-            mat = fitz.Matrix(zoom, zoom)
-            require_alpha = opts.transparent or bool(opts.background_color)
-            pix = page.get_pixmap(matrix=mat, alpha=require_alpha)
-
-            if opts.background_color and not opts.transparent:
-                pil = optional_import("PIL.Image", package="Pillow")
-                mode = "RGBA" if getattr(pix, "alpha", False) else "RGB"
-                image = pil.frombytes(mode, (pix.width, pix.height), pix.samples)
-                background = pil.new("RGB", image.size, opts.background_color)
-                if mode == "RGBA":
-                    background.paste(image, mask=image.split()[3])
+        Without a document cache (or a path to key it by) the page itself is returned and
+        rendered directly. An opaque ``background_color`` is drawn under the page here.
+        """
+        background = None if opts.transparent else opts.background_color
+        if self.documents is None or ai_path is None:
+            page = doc[number - 1]
+            return backdrop(_load_fitz(), page, background) if background else page
+        key = self.documents.key_for(ai_path, ("displaylist", number, background))
+        with self.stage("displaylist", ai_path, page=number) as info:
+            display_list = self.documents.get(key)
+            info["hit"] = display_list is not None
+            if display_list is None:
+                page = doc[number - 1]
+                if background:
+                    display_list = backdrop(_load_fitz(), page, background).display_list
                 else:
-                    background.paste(image)
-                background.save(png_path, "PNG")
-                return True
+                    display_list = page.get_displaylist()
+                self.documents.put(key, display_list)
+        return DisplayListPage(display_list)
 
-            pix.save(png_path)
-            return True
+    @contextmanager
+    def _pymupdf_errors(self, source: SourceT) -> Iterator[None]:
+        """Translate PyMuPDF rendering failures into ``ConversionError``."""
+        label = _describe(source)
+        try:
+            yield
         except ConversionError:
             raise
         except ValueError as exc:
             self.logger.debug("PyMuPDF rendering failed (value error): %s", exc, exc_info=True)
             raise ConversionError(
-                f"PyMuPDF failed to render '{ai_path}': invalid page geometry or empty content ({exc})."
+                f"PyMuPDF failed to render '{label}': invalid page geometry or empty content ({exc})."
             ) from exc
         except Exception as exc:
             self.logger.debug("PyMuPDF rendering failed: %s", exc, exc_info=True)
-            raise ConversionError(f"PyMuPDF failed to render '{ai_path}': {exc}") from exc
+            raise ConversionError(f"PyMuPDF failed to render '{label}': {exc}") from exc
+
+    def _convert_with_pymupdf(self, ai_path: Path, png_path: Path, opts: AIOptions) -> bool:
+        """Render the AI file with PyMuPDF."""
+        doc = self._open_document(ai_path)
+        try:
+            with self._pymupdf_errors(ai_path):
+                number = self._select_pages(opts.pages, doc.page_count)[0]
+                self._render_page(self._page(doc, ai_path, number, opts), png_path, opts)
+                return True
         finally:
-            try:
-                doc.close()
-            except Exception:
+            _close_quietly(doc)
+
+    def _convert_bytes_with_pymupdf(self, content: bytes, opts: AIOptions) -> bytes:
+        """Render in-memory content with PyMuPDF and return PNG bytes."""
+        doc = self._open_document(content)
+        try:
+            with self._pymupdf_errors(content):
+                number = self._select_pages(opts.pages, doc.page_count)[0]
+                buffer = io.BytesIO()
+                self._render_page(self._page(doc, None, number, opts), buffer, opts)
+                return buffer.getvalue()
+        finally:
+            _close_quietly(doc)
+
+    def _convert_pages_with_pymupdf(
+        self,
+        ai_path: Path,
+        target: str | Path | None,
+        opts: AIOptions,
+        workers: Optional[int],
+    ) -> List[Path]:
+        """Render several pages with PyMuPDF, fanning out to worker processes when useful."""
+        doc = self._open_document(ai_path)
+        try:
+            with self._pymupdf_errors(ai_path):
+                numbers = self._select_pages(opts.pages, doc.page_count)
+                jobs = [(number, ensure_page_output_path(ai_path, target, number)) for number in numbers]
+                workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+                if workers == 1:
+                    for number, png_path in jobs:
+                        self._render_page(self._page(doc, ai_path, number, opts), png_path, opts)
+                    return [png_path for _, png_path in jobs]
+        finally:
+            _close_quietly(doc)
+
+        # Interleave pages so every worker gets a similar mix of light and heavy pages.
+        chunks = [jobs[index::workers] for index in range(workers)]
+        render = partial(_render_pages_worker, str(ai_path), opts=opts)
+        with self._pymupdf_errors(ai_path), ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(render, chunks):
                 pass
+        return [png_path for _, png_path in jobs]
+
+    def _render_page(self, page, sink: SinkT, opts: AIOptions) -> None:
+        """Rasterize a single PyMuPDF page to *sink*, a PNG path or binary stream."""
+        fitz = _load_fitz()
+        zoom = opts.dpi / 72.0
+        if opts.tile_size:
+            with self.stage("rasterize", dpi=opts.dpi, banded=True) as info:
+                if isinstance(sink, Path):
+                    width, height = render_banded_to_path(
+                        fitz, page, sink, zoom, opts.tile_size, alpha=opts.transparent
+                    )
+                else:
+                    width, height = render_banded(fitz, page, sink, zoom, opts.tile_size, alpha=opts.transparent)
+                info.update(width=width, height=height, pixels=width * height)
+            return
+
+        mat = fitz.Matrix(zoom, zoom)
+        with self.stage("rasterize", dpi=opts.dpi) as info:
+            pix = page.get_pixmap(matrix=mat, alpha=opts.transparent)
+            info.update(width=pix.width, height=pix.height, pixels=pix.width * pix.height)
+
+        with self.stage("write") as info:
+            if isinstance(sink, Path):
+                pix.save(sink)
+                info["bytes"] = sink.stat().st_size if self.observers else None
+            else:
+                info["bytes"] = sink.write(pix.tobytes("png"))
 
     def _convert_with_pdf2image(self, ai_path: Path, png_path: Path, opts: AIOptions) -> bool:
         """Render the AI file through pdf2image when available."""
         if not self.pdf2image_available:
             return False
 
-        pdf2image = optional_import(
+        pdf2image = self._import_pdf2image()
+        number = 1
+        if opts.pages is not None:
+            number = self._select_pages(opts.pages, self._pdf2image_page_count(pdf2image, ai_path))[0]
+        self._render_pdf2image_page(pdf2image, ai_path, number, png_path, opts)
+        return True
+
+    def _convert_bytes_with_pdf2image(self, content: bytes, opts: AIOptions) -> bytes:
+        """Render in-memory content through pdf2image and return PNG bytes."""
+        if not self.pdf2image_available:
+            return b""
+
+        pdf2image = self._import_pdf2image()
+        number = 1
+        if opts.pages is not None:
+            number = self._select_pages(opts.pages, self._pdf2image_page_count(pdf2image, content))[0]
+        buffer = io.BytesIO()
+        self._render_pdf2image_page(pdf2image, content, number, buffer, opts)
+        return buffer.getvalue()
+
+    def _convert_pages_with_pdf2image(
+        self,
+        ai_path: Path,
+        target: str | Path | None,
+        opts: AIOptions,
+    ) -> List[Path]:
+        """Render several pages through pdf2image, one page per Poppler call."""
+        if not self.pdf2image_available:
+            return []
+
+        pdf2image = self._import_pdf2image()
+        outputs = []
+        for number in self._select_pages(opts.pages, self._pdf2image_page_count(pdf2image, ai_path)):
+            png_path = ensure_page_output_path(ai_path, target, number)
+            self._render_pdf2image_page(pdf2image, ai_path, number, png_path, opts)
+            outputs.append(png_path)
+        return outputs
+
+    def _import_pdf2image(self):
+        return optional_import(
             "pdf2image",
             hint="Install the 'pdf2image' extra and ensure Poppler is present",
         )
+
+    def _pdf2image_page_count(self, pdf2image, source: SourceT) -> int:
         try:
-            images = pdf2image.convert_from_path(
-                str(ai_path),
-                dpi=opts.dpi,
-                first_page=1,
-                last_page=1,
-                fmt="png",
-                transparent=opts.transparent,
-            )
+            if isinstance(source, bytes):
+                info = pdf2image.pdfinfo_from_bytes(source)
+            else:
+                info = pdf2image.pdfinfo_from_path(str(source))
+            return int(info["Pages"])
         except Exception as exc:
-            self.logger.debug("pdf2image rendering failed: %s", exc, exc_info=True)
-            raise ConversionError(
-                f"pdf2image failed to render '{ai_path}': {exc}. "
-                "Ensure Poppler is installed and the AI/PDF content is valid."
-            ) from exc
+            raise ConversionError(f"pdf2image failed to read page count of '{_describe(source)}': {exc}") from exc
+
+    def _render_pdf2image_page(self, pdf2image, source: SourceT, number: int, sink: SinkT, opts: AIOptions) -> None:
+        if isinstance(source, bytes):
+            render = partial(pdf2image.convert_from_bytes, source)
+        else:
+            render = partial(pdf2image.convert_from_path, str(source))
+        with self.stage("rasterize", dpi=opts.dpi) as info:
+            try:
+                images = render(
+                    dpi=opts.dpi,
+                    first_page=number,
+                    last_page=number,
+                    fmt="png",
+                    transparent=opts.transparent,
+                )
+            except Exception as exc:
+                self.logger.debug("pdf2image rendering failed: %s", exc, exc_info=True)
+                raise ConversionError(
+                    f"pdf2image failed to render '{_describe(source)}': {exc}. "
+                    "Ensure Poppler is installed and the AI/PDF content is valid."
+                ) from exc
 
-        if not images:
-            raise ConversionError("pdf2image returned no images")
+            if not images:
+                raise ConversionError("pdf2image returned no images")
+            image = images[0]
+            width, height = image.size
+            info.update(width=width, height=height, pixels=width * height)
 
-        image = images[0]
         if opts.background_color and not opts.transparent:
             pil = optional_import("PIL.Image", package="Pillow")
             background = pil.new("RGB", image.size, opts.background_color)
@@ -168,20 +450,21 @@ class AIConverter(BaseConverter[AIOptions]):
             else:
                 background.paste(image)
             image = background
-        image.save(png_path, "PNG")
-        return True
+        with self.stage("write"):
+            image.save(sink, "PNG")
 
     def _check_pdf2image(self) -> bool:
+        # find_spec locates the package without importing it (and Pillow with it).
         try:
-            import pdf2image  # noqa: F401
-
-            return True
-        except ImportError:
+            return importlib.util.find_spec("pdf2image") is not None
+        except (ImportError, ValueError):
             return False
 
-    def _is_pdf_based(self, ai_path: Path) -> bool:
+    def _is_pdf_based(self, source: SourceT) -> bool:
+        if isinstance(source, bytes):
+            return source[:8].startswith(b"%PDF-")
         try:
-            with open(ai_path, "rb") as handle:
+            with open(source, "rb") as handle:
                 return handle.read(8).startswith(b"%PDF-")
         except OSError:
             return False
@@ -200,6 +483,7 @@ class AIConverter(BaseConverter[AIOptions]):
             return info
 
         info["is_pdf_based"] = self._is_pdf_based(source)
+        fitz = _load_fitz()
         if fitz is None:
             return info
         try:
@@ -212,3 +496,47 @@ class AIConverter(BaseConverter[AIOptions]):
         except Exception:
             pass
         return info
+
+
+def _load_fitz() -> Any:
+    """Import PyMuPDF on first use; return ``None`` when it is not installed."""
+    global fitz
+    if fitz is _UNLOADED:
+        try:
+            import fitz as module  # PyMuPDF
+        except ModuleNotFoundError:
+            module = None
+        fitz = module
+    return fitz
+
+
+def _describe(source: SourceT) -> str:
+    return "<in-memory document>" if isinstance(source, bytes) else str(source)
+
+
+def _close_quietly(doc) -> None:
+    try:
+        doc.close()
+    except Exception:
+        pass
+
+
+def _render_pages_worker(ai_path: str, jobs: Sequence[Tuple[int, Path]], opts: AIOptions) -> List[Path]:
+    """Render a chunk of pages in a worker process, reusing its document handle."""
+    converter = _WORKER_STATE.get("converter")
+    if converter is None:
+        converter = _WORKER_STATE["converter"] = AIConverter()
+
+    if _WORKER_STATE.get("path") != ai_path:
+        _WORKER_STATE.pop("path", None)
+        previous = _WORKER_STATE.pop("document", None)
+        if previous is not None:
+            _close_quietly(previous)
+        _WORKER_STATE["document"] = converter._open_document(Path(ai_path))
+        _WORKER_STATE["path"] = ai_path
+
+    doc = _WORKER_STATE["document"]
+    with converter._pymupdf_errors(Path(ai_path)):
+        for number, png_path in jobs:
+            converter._render_page(converter._page(doc, None, number, opts), png_path, opts)
+    return [png_path for _, png_path in jobs]
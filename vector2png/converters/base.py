@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 import logging
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Generic, TypeVar
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+from ..cache import RenderCache
+from ..metrics import Observer, StageEvent
 
 OptionsT = TypeVar("OptionsT")
 
@@ -13,9 +19,101 @@ OptionsT = TypeVar("OptionsT")
 class BaseConverter(ABC, Generic[OptionsT]):
     """Provide a thin abstraction that all converters inherit from."""
 
-    def __init__(self) -> None:
+    #: Short name used to select the converter in batch/async/CLI helpers.
+    kind: str = ""
+
+    def __init__(self, cache: Optional[RenderCache] = None, observers: Optional[Iterable[Observer]] = None) -> None:
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache = cache
+        self.observers: List[Observer] = list(observers or ())
+
+    def add_observer(self, observer: Observer) -> None:
+        """Register *observer* to receive a :class:`StageEvent` for every stage."""
+        self.observers.append(observer)
+
+    @contextmanager
+    def stage(self, name: str, source: Any = None, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block as stage *name* and report it to the observers.
+
+        The yielded dict may be updated with attributes only known after the work ran
+        (sizes, counts, the chosen method). Without observers nothing is measured.
+        """
+        if not self.observers:
+            yield attributes
+            return
+        started = time.perf_counter()
+        error = None
+        try:
+            yield attributes
+        except BaseException as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            event = StageEvent(
+                kind=self.kind,
+                stage=name,
+                duration=time.perf_counter() - started,
+                source=None if source is None else str(source),
+                attributes=attributes,
+                error=error,
+            )
+            self._notify(event)
+
+    def _notify(self, event: StageEvent) -> None:
+        for observer in self.observers:
+            try:
+                observer.on_stage(event)
+            except Exception:  # pragma: no cover - observers must not break conversions
+                self.logger.debug("Observer %r failed", observer, exc_info=True)
 
     @abstractmethod
     def convert(self, source: str | Path, target: str | Path | None = None, options: OptionsT | None = None) -> Path:
         """Convert the given vector file to PNG and return the PNG path."""
+
+    async def aconvert(
+        self,
+        source: str | Path,
+        target: str | Path | None = None,
+        options: OptionsT | None = None,
+        timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ) -> Path:
+        """Asynchronous :meth:`convert` running on the shared executor of :mod:`vector2png.aio`.
+
+        The conversion runs in a warm worker-side converter of the same kind that shares
+        this converter's render cache. Its stage events are delivered to this converter's
+        observers, and it caches documents only if this converter does (in the worker's
+        own document cache, as a process pool cannot share this one).
+        """
+        from .. import aio
+
+        return await aio.convert(
+            source,
+            target,
+            options,
+            kind=self.kind,
+            timeout=timeout,
+            executor=executor,
+            cache=self.cache,
+            on_stage=self._notify if self.observers else None,
+            documents=getattr(self, "documents", None) is not None,
+        )
+
+    def _cached_render(self, source: Path, png_path: Path, options: OptionsT, render: Callable[[], object]) -> None:
+        """Run *render* unless the render cache already holds the PNG for these inputs."""
+        if self.cache is None:
+            render()
+            return
+
+        with self.stage("cache", source) as info:
+            key = self.cache.key_for(source, self.__class__.__name__, options)
+            info["hit"] = self.cache.fetch(key, png_path)
+        if info["hit"]:
+            self.logger.debug("Render cache hit for %s", source)
+            return
+
+        # A previous hit may have hardlinked the target to a cache entry; never write through it.
+        if png_path.exists():
+            png_path.unlink()
+        render()
+        self.cache.store(key, png_path)
@@ -2,27 +2,127 @@
 
 from __future__ import annotations
 
-import logging
+import copy
+import io
 import re
-from dataclasses import replace
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, replace
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Tuple
+from types import SimpleNamespace
+from typing import BinaryIO, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from ..exceptions import ConversionError
-from ..options import DXFOptions
-from ..utils import ensure_input_path, ensure_output_path, optional_import
+from ..cache import RenderCache
+from ..documents import DocumentCache
+from ..exceptions import ConversionError, DependencyMissingError
+from ..lod import simplify_entities, units_per_pixel
+from ..metrics import Observer
+from ..options import DXFOptions, OutputSpec
+from ..raster import png_dimensions, render_banded, render_banded_to_path
+from ..sniff import ASCII, BINARY, BINARY_DXF_SENTINEL, SNIFF_SIZE, open_decompressed, sniff_bytes, sniff_dxf
+from ..spatial import LayoutView, SpatialIndex, ezdxf_extents, load_index, save_index
+from ..streaming import StreamedLayout, has_block_references, stream_blockers
+from ..tiles import LAYOUTS, TilePyramid, default_tile_dir
+from ..utils import BinarySource, ensure_input_path, ensure_output_path, optional_import, read_binary, source_stem
 from .base import BaseConverter
 
+# Distinct drawing configurations kept by the process-wide configuration cache.
+CONFIG_CACHE_SIZE = 64
+
+# Recorded layouts a session keeps (per drawing configuration, bbox and LOD resolution).
+DEFAULT_MAX_RECORDINGS = 8
+
+# Minimum MTEXT candidates before ``normalize_workers`` > 1 fans out to processes.
+PARALLEL_NORMALIZE_THRESHOLD = 20_000
+
+# Capture \H<factor>x or \H<factor>x; (case-insensitive), used for relative text height.
+RELATIVE_SIZE_PATTERN = re.compile(r"\\H([0-9]*\.?[0-9]+)x;?", re.IGNORECASE)
+
+_modules_lock = threading.Lock()
+_modules: Optional[SimpleNamespace] = None
+
+
+def load_ezdxf_modules() -> SimpleNamespace:
+    """Resolve the ezdxf drawing modules once per process and share them across converters."""
+    global _modules
+    modules = _modules
+    if modules is None:
+        with _modules_lock:
+            if _modules is None:
+                _modules = SimpleNamespace(
+                    ezdxf=optional_import("ezdxf"),
+                    drawing=optional_import("ezdxf.addons.drawing", package="ezdxf"),
+                    layout=optional_import("ezdxf.addons.drawing.layout", package="ezdxf"),
+                    config=optional_import("ezdxf.addons.drawing.config", package="ezdxf"),
+                    pymupdf=optional_import("ezdxf.addons.drawing.pymupdf", package="ezdxf"),
+                )
+            modules = _modules
+    return modules
+
+
+def expand_relative_heights(items: Sequence[Tuple[str, float]]) -> List[Optional[str]]:
+    """Make the relative ``\\H<factor>x`` heights of each ``(text, base_size)`` absolute.
+
+    Returns the rewritten text per item, or ``None`` when it had no relative marker.
+    """
+    split = RELATIVE_SIZE_PATTERN.split
+    results: List[Optional[str]] = []
+    for text, base_size in items:
+        # split() interleaves the surrounding text with the captured factors.
+        parts = split(text)
+        if len(parts) == 1:
+            results.append(None)
+            continue
+        for index in range(1, len(parts), 2):
+            parts[index] = f"\\H{base_size * float(parts[index]):g};"
+        results.append("".join(parts))
+    return results
+
+
+@lru_cache(maxsize=CONFIG_CACHE_SIZE)
+def drawing_config(config_module, background: str, color_policy: str, lineweight_scaling: float, pdsize: float):
+    """Build (once) the ezdxf ``Configuration`` for the render-affecting option values.
+
+    Configurations are immutable, so one instance is shared by every converter,
+    session and thread that renders with the same values.
+    """
+    background_policy = {
+        "white": config_module.BackgroundPolicy.WHITE,
+        "black": config_module.BackgroundPolicy.BLACK,
+        "off": config_module.BackgroundPolicy.OFF,
+    }.get(background, config_module.BackgroundPolicy.DEFAULT)
+    color = {
+        "black": config_module.ColorPolicy.BLACK,
+        "white": config_module.ColorPolicy.WHITE,
+        "monochrome": config_module.ColorPolicy.MONOCHROME,
+    }.get(color_policy, config_module.ColorPolicy.COLOR)
+    return config_module.Configuration().with_changes(
+        background_policy=background_policy,
+        color_policy=color,
+        lineweight_scaling=lineweight_scaling,
+        pdsize=pdsize,
+    )
+
 
 class DXFConverter(BaseConverter[DXFOptions]):
     """Convert DXF drawings into PNG previews."""
 
-    # Capture \H<factor>x or \H<factor>x; (case-insensitive), used for relative text height.
-    _RELATIVE_SIZE_PATTERN = re.compile(r"\\H([0-9]*\\.?[0-9]+)x;?", re.IGNORECASE)
+    kind = "dxf"
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._config_cache: Dict[Tuple, object] = {}
+    _RELATIVE_SIZE_PATTERN = RELATIVE_SIZE_PATTERN
+
+    def __init__(
+        self,
+        cache: Optional[RenderCache] = None,
+        observers: Optional[Iterable[Observer]] = None,
+        documents: Optional[DocumentCache] = None,
+    ) -> None:
+        super().__init__(cache=cache, observers=observers)
+        #: Parsed sessions reused by ``convert`` and friends; ``None`` parses every call.
+        self.documents = documents
 
     def convert(
         self,
@@ -33,50 +133,605 @@ class DXFConverter(BaseConverter[DXFOptions]):
         opts = options or DXFOptions()
         dxf_path = ensure_input_path(source)
         png_path = ensure_output_path(dxf_path, target)
+        self._cached_render(dxf_path, png_path, opts, lambda: self._render(dxf_path, png_path, opts))
+        return png_path
+
+    def _render(self, dxf_path: Path, png_path: Path, opts: DXFOptions) -> None:
+        """Parse, draw and rasterize *dxf_path* into *png_path*."""
+        with self._session(dxf_path, opts) as session:
+            session.render(png_path, opts)
+
+    @contextmanager
+    def _session(self, dxf_path: Path, opts: DXFOptions) -> Iterator["DXFDocumentSession"]:
+        """Yield a session for *dxf_path*: streamed, from the document cache, or freshly parsed.
+
+        Cached sessions stay open for later calls and are locked while in use.
+        """
+        if self.should_stream(dxf_path, opts):
+            with self.open_stream(dxf_path, opts) as session:
+                yield session
+            return
+        if self.documents is None:
+            with self.open(dxf_path, opts) as session:
+                yield session
+            return
+        # Normalization rewrites the document, so normalized and raw parses are cached apart.
+        key = self.documents.key_for(dxf_path, opts.normalize_relative_size)
+        with self.stage("documents", dxf_path) as info:
+            session = self.documents.get(key)
+            info["hit"] = session is not None
+        if session is None:
+            session = self.open(dxf_path, opts)
+            self.documents.put(key, session)
+        with session.lock:
+            yield session
+
+    def should_stream(self, source: str | Path, options: DXFOptions | None = None) -> bool:
+        """Decide whether converting *source* with *options* streams modelspace.
+
+        ``stream=None`` streams ASCII files of at least ``stream_threshold`` bytes unless
+        an option or a block reference in modelspace needs the full document;
+        ``stream=True`` insists and raises if it cannot.
+        """
+        opts = options or DXFOptions()
+        if opts.stream is False:
+            return False
+        dxf_path = ensure_input_path(source)
+        if opts.stream is None and dxf_path.stat().st_size < opts.stream_threshold:
+            return False
+        blockers = stream_blockers(opts)
+        kind = sniff_dxf(dxf_path)
+        if kind != ASCII:
+            blockers.append(f"{kind} DXF")
+        elif not blockers and has_block_references(dxf_path):
+            blockers.append("INSERT")
+        if not blockers:
+            return True
+        if opts.stream:
+            raise ConversionError(f"Cannot stream '{dxf_path.name}': {', '.join(blockers)} needs the full document")
+        self.logger.debug("Loading large DXF '%s' fully for %s", dxf_path.name, ", ".join(blockers))
+        return False
 
-        ezdxf = optional_import("ezdxf")
-        drawing = optional_import("ezdxf.addons.drawing", package="ezdxf")
-        layout_module = optional_import("ezdxf.addons.drawing.layout", package="ezdxf")
-        config_module = optional_import("ezdxf.addons.drawing.config", package="ezdxf")
-        pymupdf_backend = optional_import("ezdxf.addons.drawing.pymupdf", package="ezdxf")
-        Frontend = drawing.Frontend
-        RenderContext = drawing.RenderContext
+    def open_stream(self, source: str | Path, options: DXFOptions | None = None) -> "DXFStreamSession":
+        """Return a session that draws modelspace straight from the file on each new recording.
 
-        doc = ezdxf.readfile(str(dxf_path))
+        No entity database is built: memory stays bounded by the recorded drawing output
+        instead of the document size. See :class:`DXFStreamSession` for what it cannot do.
+        """
+        opts = options or DXFOptions()
+        dxf_path = ensure_input_path(source)
+        modules = self._load_modules()
+        iterdxf = optional_import("ezdxf.addons.iterdxf", package="ezdxf")
+        session = DXFStreamSession(self, dxf_path, iterdxf, modules)
         if opts.normalize_relative_size:
-            self._normalize_relative_point_sizes(doc)
+            session.normalize_relative_sizes(opts.normalize_workers)
+        return session
+
+    def open(self, source: str | Path, options: DXFOptions | None = None) -> "DXFDocumentSession":
+        """Parse *source* once and return a session that can render it many times.
+
+        ASCII and binary DXF files go to ``ezdxf.readfile``; gzip files and zip archives
+        are sniffed from their first bytes and decompressed while ezdxf reads them.
+        """
+        opts = options or DXFOptions()
+        dxf_path = ensure_input_path(source)
+        modules = self._load_modules()
+        kind = sniff_dxf(dxf_path)
+        with self.stage("read", dxf_path, format=kind) as info:
+            if kind in (ASCII, BINARY):
+                doc = modules.ezdxf.readfile(str(dxf_path))
+            else:
+                opener = partial(open_decompressed, kind, partial(dxf_path.open, "rb"))
+                doc = self._read_stream(modules, opener, f"'{dxf_path.name}'")
+            if self.observers:
+                info["entities"] = len(doc.entitydb)
+        session = DXFDocumentSession(self, dxf_path, doc, modules)
+        if opts.normalize_relative_size:
+            session.normalize_relative_sizes(opts.normalize_workers)
+        return session
+
+    def open_bytes(self, data: BinarySource, options: DXFOptions | None = None) -> "DXFDocumentSession":
+        """Parse in-memory DXF content (ASCII, binary, gzip or zip) into a session without disk I/O.
+
+        Such sessions have no source path, so file outputs need an explicit target.
+        """
+        opts = options or DXFOptions()
+        modules = self._load_modules()
+        content = read_binary(data)
+        kind = sniff_bytes(content[:SNIFF_SIZE])
+        with self.stage("read", bytes=len(content), format=kind) as info:
+            opener = partial(open_decompressed, kind, partial(io.BytesIO, content))
+            doc = self._read_stream(modules, opener, "in-memory DXF data")
+            if self.observers:
+                info["entities"] = len(doc.entitydb)
+        session = DXFDocumentSession(self, None, doc, modules)
+        if opts.normalize_relative_size:
+            session.normalize_relative_sizes(opts.normalize_workers)
+        return session
+
+    def convert_bytes(self, data: BinarySource, options: DXFOptions | None = None) -> bytes:
+        """Render in-memory DXF content and return the PNG bytes.
+
+        *data* may be ``bytes``, ``bytearray``, ``memoryview`` or a binary file object.
+        """
+        opts = options or DXFOptions()
+        with self.open_bytes(data, opts) as session:
+            return session.render_bytes(opts)
+
+    def convert_layout(
+        self,
+        source: str | Path,
+        layout_name: str,
+        target: str | Path | None = None,
+        options: DXFOptions | None = None,
+    ) -> Path:
+        """Convert a specific layout to PNG."""
+        opts = options or DXFOptions()
+        patched = replace(opts, layout_name=layout_name)
+        return self.convert(source, target=target, options=patched)
+
+    def convert_multi(
+        self,
+        source: str | Path,
+        outputs: Sequence[int | OutputSpec],
+        target: str | Path | None = None,
+        options: DXFOptions | None = None,
+    ) -> List[Path]:
+        """Draw the layout once and rasterize it at several resolutions.
+
+        *outputs* holds DPIs or :class:`OutputSpec` items; outputs without an explicit
+        target are written to ``<stem>-<dpi>dpi.png`` (based on *target* when given).
+        """
+        opts = options or DXFOptions()
+        dxf_path = ensure_input_path(source)
+        jobs = []
+        for spec in outputs:
+            if not isinstance(spec, OutputSpec):
+                spec = OutputSpec(dpi=int(spec))
+            if spec.target is not None:
+                png_path = ensure_output_path(dxf_path, spec.target)
+            else:
+                base = ensure_output_path(dxf_path, target)
+                png_path = base.with_name(f"{base.stem}-{spec.dpi}dpi.png")
+            jobs.append((png_path, replace(opts, dpi=spec.dpi)))
+
+        # The document is only parsed if at least one output misses the render cache.
+        sessions: List[DXFDocumentSession] = []
+
+        with ExitStack() as stack:
+            def render(png_path: Path, spec_opts: DXFOptions) -> None:
+                if not sessions:
+                    sessions.append(stack.enter_context(self._session(dxf_path, opts)))
+                sessions[0].render(png_path, spec_opts)
+
+            for png_path, spec_opts in jobs:
+                self._cached_render(dxf_path, png_path, spec_opts, partial(render, png_path, spec_opts))
+        return [png_path for png_path, _ in jobs]
+
+    def convert_all_layouts(
+        self,
+        source: str | Path,
+        target_dir: str | Path | None = None,
+        options: DXFOptions | None = None,
+    ) -> Dict[str, Path]:
+        """Render every non-empty layout to ``<stem>-<layout>.png`` from a single parse."""
+        opts = options or DXFOptions()
+        # Other layouts are only in the full document, so this never streams.
+        with self._session(ensure_input_path(source), replace(opts, stream=False)) as session:
+            return session.render_all_layouts(target_dir, opts)
+
+    def convert_tiles(
+        self,
+        source: str | Path,
+        target_dir: str | Path | None = None,
+        options: DXFOptions | None = None,
+        tile_size: int = 256,
+        layout: str = "dzi",
+        lazy: bool = False,
+    ) -> TilePyramid:
+        """Render the selected layout into a DZI or XYZ tile pyramid.
+
+        See :meth:`DXFDocumentSession.tiles`; with ``lazy=True`` the returned pyramid
+        renders tiles on demand and must be closed by the caller.
+        """
+        opts = options or DXFOptions()
+        with self._session(ensure_input_path(source), opts) as session:
+            return session.tiles(target_dir, opts, tile_size=tile_size, layout=layout, lazy=lazy)
+
+    def _load_modules(self) -> SimpleNamespace:
+        return load_ezdxf_modules()
+
+    def _read_stream(self, modules: SimpleNamespace, opener: Callable[[], ContextManager[BinaryIO]], label: str):
+        """Load a document from the byte stream *opener* yields, detecting binary DXF and the encoding.
+
+        *opener* is entered once per pass (sniff, header, load) so compressed input is
+        inflated as it is read instead of being unpacked up front.
+        """
+        try:
+            with opener() as stream:
+                binary = stream.read(SNIFF_SIZE) == BINARY_DXF_SENTINEL
+                if binary:
+                    # The binary tag loader needs the whole buffer.
+                    content = BINARY_DXF_SENTINEL + stream.read()
+            if binary:
+                tagger = optional_import("ezdxf.lldxf.tagger", package="ezdxf")
+                document = optional_import("ezdxf.document", package="ezdxf")
+                return document.Drawing.load(tagger.binary_tags_loader(content))
+
+            # The header names the codepage (or implies UTF-8 from R2007 on); sniff it
+            # first, then decode lazily while ezdxf tokenizes the stream.
+            validator = optional_import("ezdxf.lldxf.validator", package="ezdxf")
+            with opener() as stream:
+                info = validator.dxf_info(io.TextIOWrapper(stream, encoding="cp1252", errors="ignore"))
+            with opener() as stream:
+                return modules.ezdxf.read(io.TextIOWrapper(stream, encoding=info.encoding, errors="surrogateescape"))
+        except (ConversionError, DependencyMissingError):
+            raise
+        except Exception as exc:
+            self.logger.debug("Reading %s failed: %s", label, exc, exc_info=True)
+            raise ConversionError(f"Failed to read {label}: {exc}") from exc
+
+    def _get_config(self, config_module, opts: DXFOptions, pdsize: float):
+        return drawing_config(config_module, opts.background, opts.color_policy, opts.lineweight_scaling, pdsize)
+
+    def _normalize_relative_point_sizes(self, doc, workers: int = 1) -> int:
+        """Replace MTEXT relative height markers with absolute values to avoid ezdxf warnings.
+
+        Only MTEXT whose text contains ``\\H``/``\\h`` is rewritten. With ``workers > 1``
+        and at least :data:`PARALLEL_NORMALIZE_THRESHOLD` candidates the regex pass runs
+        on a process pool.
+        """
+        default_size = doc.header.get("$TEXTSIZE", 2.5) or 2.5
+        entities = []
+        items: List[Tuple[str, float]] = []
+
+        # Drawing.query() covers modelspace, paperspace layouts and block definitions.
+        for entity in doc.query("MTEXT"):
+            text = entity.text
+            if "\\H" not in text and "\\h" not in text:
+                continue
+            dxf = entity.dxf
+            entities.append(entity)
+            items.append((text, dxf.char_height or getattr(dxf, "height", 0) or default_size))
 
+        if workers > 1 and len(items) >= PARALLEL_NORMALIZE_THRESHOLD:
+            chunk = -(-len(items) // workers)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                batches = executor.map(
+                    expand_relative_heights, [items[start : start + chunk] for start in range(0, len(items), chunk)]
+                )
+                replaced = [text for batch in batches for text in batch]
+        else:
+            replaced = expand_relative_heights(items)
+
+        updated = 0
+        for entity, text in zip(entities, replaced):
+            if text is not None:
+                entity.text = text
+                updated += 1
+        self.logger.debug("Normalized relative text height for %d of %d MTEXT candidates", updated, len(items))
+        return updated
+
+
+class DXFDocumentSession:
+    """A parsed DXF document that renders any number of layouts and option sets.
+
+    The ezdxf document and its ``RenderContext`` are built once. The recorded frontend
+    output of each layout is kept per drawing configuration (background, color policy,
+    lineweight scaling, point size, entity filters), so renders that only change DPI or
+    page settings skip the frontend pass entirely. At most ``max_recordings`` are kept,
+    least recently used first out.
+    """
+
+    def __init__(self, converter: DXFConverter, path: Optional[Path], doc, modules: SimpleNamespace) -> None:
+        self.converter = converter
+        self.path = path
+        self.name = source_stem(path) if path is not None else "drawing"
+        self.doc = doc
+        self.modules = modules
+        self.context = modules.drawing.RenderContext(doc)
+        self._recordings: "OrderedDict[Tuple, object]" = OrderedDict()
+        #: Recorded layouts kept for reuse; each bbox or LOD resolution is one more.
+        self.max_recordings = DEFAULT_MAX_RECORDINGS
+        self._indexes: Dict[str, SpatialIndex] = {}
+        self._normalized = False
+        #: Held while a converter renders a session shared through its document cache.
+        self.lock = threading.RLock()
+
+    def __enter__(self) -> "DXFDocumentSession":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the recorded layouts; the session must not be used afterwards."""
+        self._recordings.clear()
+        self._indexes.clear()
+
+    @property
+    def cache_weight(self) -> int:
+        """How many times its file size this session counts towards ``DocumentCache.max_bytes``."""
+        return 1 + len(self._recordings)
+
+    def layout_names(self) -> List[str]:
+        """Return the names of all layouts, modelspace included."""
+        return list(self.doc.layouts.names())
+
+    def normalize_relative_sizes(self, workers: int = 1) -> None:
+        """Expand MTEXT relative heights in this document (applies to all later renders)."""
+        if not self._normalized:
+            with self.converter.stage("normalize", self.path) as info:
+                info["updated"] = self.converter._normalize_relative_point_sizes(self.doc, workers)
+            self._normalized = True
+            self._recordings.clear()
+
+    def render(
+        self,
+        target: str | Path | None = None,
+        options: DXFOptions | None = None,
+        layout_name: Optional[str] = None,
+    ) -> Path:
+        """Render a layout (default: ``options.layout_name`` or modelspace) to *target*."""
+        opts = options or DXFOptions()
+        if layout_name is not None:
+            opts = replace(opts, layout_name=layout_name)
+        if self.path is None and target is None:
+            raise ConversionError("In-memory DXF documents need an explicit output path")
+        png_path = ensure_output_path(self.path, target)
+        if opts.tile_size:
+            backend = self._prepare(opts)
+            with self._replayed_page(backend, opts) as (fitz, page):
+                with self.converter.stage("rasterize", self.path, dpi=opts.dpi, banded=True) as info:
+                    width, height = render_banded_to_path(fitz, page, png_path, opts.dpi / 72.0, opts.tile_size)
+                    info.update(width=width, height=height, pixels=width * height)
+            return png_path
+        data = self.render_bytes(opts)
+        with self.converter.stage("write", self.path) as info:
+            info["bytes"] = png_path.write_bytes(data)
+        return png_path
+
+    def render_bytes(self, options: DXFOptions | None = None) -> bytes:
+        """Render the layout selected by ``options.layout_name`` and return PNG bytes."""
+        opts = options or DXFOptions()
+        backend = self._prepare(opts)
+        if opts.tile_size:
+            buffer = io.BytesIO()
+            with self._replayed_page(backend, opts) as (fitz, page):
+                with self.converter.stage("rasterize", self.path, dpi=opts.dpi, banded=True) as info:
+                    width, height = render_banded(fitz, page, buffer, opts.dpi / 72.0, opts.tile_size)
+                    info.update(width=width, height=height, pixels=width * height)
+            return buffer.getvalue()
+        return self._rasterize(backend, opts)
+
+    def tiles(
+        self,
+        target_dir: str | Path | None = None,
+        options: DXFOptions | None = None,
+        tile_size: int = 256,
+        layout: str = "dzi",
+        lazy: bool = False,
+    ) -> TilePyramid:
+        """Build a tile pyramid whose deepest level is rendered at ``options.dpi``.
+
+        The recorded layout is replayed once into a vector PDF page; each tile is then
+        rasterized from that page with a clipped draw device.
+        """
+        opts = options or DXFOptions()
+        if layout not in LAYOUTS:
+            raise ConversionError(f"Unknown tile layout '{layout}'; expected one of {', '.join(LAYOUTS)}")
+        if self.path is None and target_dir is None:
+            raise ConversionError("In-memory DXF documents need an explicit tile directory")
+        backend = self._prepare(opts)
+        fitz, pdf = self._replay_pdf(backend, opts)
+        try:
+            with self._raster_errors(opts):
+                pyramid = TilePyramid(
+                    fitz,
+                    pdf[0],
+                    default_tile_dir(self.path, target_dir),
+                    self.name,
+                    zoom=opts.dpi / 72.0,
+                    tile_size=tile_size,
+                    layout=layout,
+                    on_close=pdf.close,
+                )
+                pyramid.write_descriptor()
+                if not lazy:
+                    pyramid.generate()
+        except BaseException:
+            pdf.close()
+            raise
+        if not lazy:
+            pyramid.close()
+        return pyramid
+
+    def render_all_layouts(
+        self,
+        target_dir: str | Path | None = None,
+        options: DXFOptions | None = None,
+    ) -> Dict[str, Path]:
+        """Render every layout that has drawable entities; return ``{layout: png_path}``."""
+        opts = options or DXFOptions()
+        if self.path is None and target_dir is None:
+            raise ConversionError("In-memory DXF documents need an explicit output directory")
+        directory = Path(target_dir).expanduser().resolve() if target_dir else self.path.parent
+        outputs: Dict[str, Path] = {}
+        for name in self.layout_names():
+            if not any(self.doc.layouts.get(name)):
+                self.converter.logger.debug("Skipping empty layout '%s'", name)
+                continue
+            safe_name = re.sub(r"[^\w.-]+", "_", name)
+            outputs[name] = self.render(directory / f"{self.name}-{safe_name}.png", opts, layout_name=name)
+        if not outputs:
+            raise ConversionError(f"No layout in '{self.path or self.name}' contains drawable entities")
+        return outputs
+
+    def _layout(self, opts: DXFOptions):
         if opts.layout_name:
-            if opts.layout_name not in doc.layouts:
-                available = ", ".join(doc.layouts.names())
+            if opts.layout_name not in self.doc.layouts:
+                available = ", ".join(self.doc.layouts.names())
                 raise ConversionError(f"Layout '{opts.layout_name}' not found. Available: {available}")
-            drawing_source = doc.layouts.get(opts.layout_name)
-        else:
-            drawing_source = doc.modelspace()
+            return self.doc.layouts.get(opts.layout_name)
+        return self.doc.modelspace()
 
-        cfg = self._get_config(config_module, opts)
+    def _recording(self, opts: DXFOptions):
+        """Return the recorded backend for the layout and drawing configuration in *opts*."""
         # ezdxf frontend does not support relative pdsize (<=0 means relative) and logs an INFO.
         # Set an explicit positive value ahead of time to suppress the message, preferring CLI option
         # and falling back to DXF header $PDSIZE.
-        pdsize = opts.pdsize if opts.pdsize is not None else (doc.header.get("$PDSIZE", 0) or 0)
+        pdsize = opts.pdsize if opts.pdsize is not None else self._header_pdsize()
         if pdsize <= 0:
             pdsize = 1.0
-        cfg = cfg.with_changes(pdsize=pdsize)
 
-        context = RenderContext(doc)
-        backend = pymupdf_backend.PyMuPdfBackend()
-        frontend = Frontend(context, backend, config=cfg)
+        key = (
+            opts.layout_name,
+            opts.background,
+            opts.color_policy,
+            opts.lineweight_scaling,
+            pdsize,
+            opts.layers,
+            opts.exclude_layers,
+            opts.entity_types,
+            opts.bbox,
+            # LOD output depends on the pixel size, so such recordings are per resolution.
+            self._lod_key(opts),
+        )
+        backend = self._recordings.get(key)
+        if backend is not None:
+            self._recordings.move_to_end(key)
+            return backend
+
+        cfg = self.converter._get_config(self.modules.config, opts, pdsize)
+        backend = self.modules.pymupdf.PyMuPdfBackend()
+        frontend = self.modules.drawing.Frontend(self.context, backend, config=cfg)
         layout_label = opts.layout_name or "modelspace"
         try:
-            if not any(drawing_source):
-                raise ConversionError(f"Layout '{layout_label}' contains no drawable entities")
-            frontend.draw_layout(drawing_source)
+            self._draw(frontend, opts, layout_label)
         except ConversionError:
             raise
         except Exception as exc:
-            self.logger.debug("Drawing layout '%s' failed: %s", layout_label, exc, exc_info=True)
+            self.converter.logger.debug("Drawing layout '%s' failed: %s", layout_label, exc, exc_info=True)
             raise ConversionError(f"Failed to render layout '{layout_label}': {exc}") from exc
 
+        self._recordings[key] = backend
+        while len(self._recordings) > max(1, self.max_recordings):
+            self._recordings.popitem(last=False)
+        return backend
+
+    def _header_pdsize(self) -> float:
+        return self.doc.header.get("$PDSIZE", 0) or 0
+
+    def _draw(self, frontend, opts: DXFOptions, layout_label: str) -> None:
+        """Feed the selected layout, narrowed by region, LOD and entity filters, to *frontend*."""
+        drawing_source = self._layout(opts)
+        if opts.bbox:
+            drawing_source = self._region(drawing_source, opts)
+        if opts.lod:
+            drawing_source = self._level_of_detail(drawing_source, opts)
+        if not any(drawing_source):
+            raise ConversionError(f"Layout '{layout_label}' contains no drawable entities")
+        filter_func = self._entity_filter(opts)
+        with self.converter.stage("draw", self.path, layout=layout_label):
+            if filter_func is None:
+                frontend.draw_layout(drawing_source)
+            else:
+                frontend.draw_layout(drawing_source, filter_func=filter_func)
+
+    def spatial_index(self, layout_name: Optional[str] = None, persist: bool = False) -> SpatialIndex:
+        """Return the bounding-box index of a layout, built once per session.
+
+        With a source path, an up-to-date index persisted next to the drawing is
+        loaded instead of rebuilt; ``persist=True`` writes a freshly built one there.
+        """
+        label = layout_name or "modelspace"
+        index = self._indexes.get(label)
+        if index is not None:
+            return index
+        if self.path is not None:
+            index = load_index(self.path, label)
+        if index is None:
+            layout = self._layout(DXFOptions(layout_name=layout_name))
+            with self.converter.stage("index", self.path, layout=label) as info:
+                extents = ezdxf_extents(optional_import("ezdxf.bbox", package="ezdxf"))
+                index = SpatialIndex.build(layout, extents)
+                info["entities"] = len(index)
+            if persist and self.path is not None:
+                save_index(self.path, label, index)
+        self._indexes[label] = index
+        return index
+
+    def _region(self, layout, opts: DXFOptions) -> LayoutView:
+        """Restrict *layout* to the entities whose extents intersect ``opts.bbox``."""
+        if len(opts.bbox) != 4 or opts.bbox[0] >= opts.bbox[2] or opts.bbox[1] >= opts.bbox[3]:
+            raise ConversionError("bbox must be (xmin, ymin, xmax, ymax) with xmin < xmax and ymin < ymax")
+        index = self.spatial_index(opts.layout_name, persist=opts.persist_index)
+        lookup = self.doc.entitydb.get
+        entities = [entity for entity in map(lookup, index.query(opts.bbox)) if entity is not None]
+        return LayoutView(layout, entities)
+
+    @staticmethod
+    def _lod_key(opts: DXFOptions) -> Optional[tuple]:
+        if not opts.lod:
+            return None
+        return (
+            opts.dpi,
+            opts.scale,
+            opts.page_width,
+            opts.page_height,
+            opts.margins,
+            opts.max_width,
+            opts.max_height,
+            opts.lod_threshold,
+            opts.lod_text_height,
+        )
+
+    def _level_of_detail(self, layout, opts: DXFOptions):
+        """Drop, box or decimate entities too small to show at the output resolution."""
+        index = self.spatial_index(opts.layout_name, persist=opts.persist_index)
+        pixel = units_per_pixel(index.extents, opts)
+        if pixel is None:
+            return layout
+        lwpolyline = optional_import("ezdxf.entities", package="ezdxf").LWPolyline
+        with self.converter.stage("lod", self.path, units_per_pixel=pixel) as info:
+            entities, stats = simplify_entities(
+                list(layout), index.box_lookup(), pixel, opts.lod_threshold, opts.lod_text_height, lwpolyline
+            )
+            info.update(asdict(stats))
+        self.converter.logger.debug(
+            "LOD at %.4g units/pixel: dropped %d, boxed %d text, decimated %d polylines",
+            pixel,
+            stats.dropped,
+            stats.boxed,
+            stats.decimated,
+        )
+        return LayoutView(getattr(layout, "_layout", layout), entities)
+
+    def _entity_filter(self, opts: DXFOptions) -> Optional[Callable[[object], bool]]:
+        """Build the frontend ``filter_func`` for the layer and type options, if any."""
+        if not (opts.layers or opts.exclude_layers or opts.entity_types):
+            return None
+        # DXF layer names and entity types are case-insensitive.
+        include = {name.upper() for name in opts.layers} if opts.layers else None
+        exclude = {name.upper() for name in opts.exclude_layers or ()}
+        types = {name.upper() for name in opts.entity_types} if opts.entity_types else None
+
+        def accept(entity) -> bool:
+            if types is not None and entity.dxftype() not in types:
+                return False
+            layer = entity.dxf.layer.upper()
+            return (include is None or layer in include) and layer not in exclude
+
+        return accept
+
+    def _prepare(self, opts: DXFOptions):
+        if opts.normalize_relative_size:
+            self.normalize_relative_sizes(opts.normalize_workers)
+        return self._recording(opts)
+
+    def _page_settings(self, opts: DXFOptions) -> Tuple[object, object]:
+        """Build the ezdxf output page and layout settings described by *opts*."""
+        layout_module = self.modules.layout
         margins = (
             layout_module.Margins.all(opts.margins)
             if isinstance(opts.margins, (int, float))
@@ -96,86 +751,142 @@ class DXFConverter(BaseConverter[DXFOptions]):
 
         page = layout_module.Page(**page_kwargs)
         settings = layout_module.Settings(scale=opts.scale, fit_page=True)
+        return page, settings
+
+    @contextmanager
+    def _raster_errors(self, opts: DXFOptions) -> Iterator[None]:
+        """Translate backend replay failures into ``ConversionError``."""
+        layout_label = opts.layout_name or "modelspace"
         try:
-            png_bytes = backend.get_pixmap_bytes(page, fmt="png", settings=settings, dpi=opts.dpi)
+            yield
+        except ConversionError:
+            raise
         except ValueError as exc:  # ezdxf reports empty/invalid bbox, etc.
-            self.logger.debug("Rendering failed for layout '%s': %s", layout_label, exc, exc_info=True)
+            self.converter.logger.debug("Rendering failed for layout '%s': %s", layout_label, exc, exc_info=True)
             raise ConversionError(
                 f"Failed to render layout '{layout_label}': empty or invalid bounding box "
                 "(no drawable content or bad extents)."
             ) from exc
         except Exception as exc:
-            self.logger.debug("Rendering failed for layout '%s': %s", layout_label, exc, exc_info=True)
+            self.converter.logger.debug("Rendering failed for layout '%s': %s", layout_label, exc, exc_info=True)
             raise ConversionError(f"Failed to render layout '{layout_label}': {exc}") from exc
 
-        png_path.write_bytes(png_bytes)
-        return png_path
+    def _rasterize(self, backend, opts: DXFOptions) -> bytes:
+        """Replay a recorded layout onto a page at ``opts.dpi`` and return PNG bytes."""
+        page, settings = self._page_settings(opts)
+        with self._raster_errors(opts), self.converter.stage("rasterize", self.path, dpi=opts.dpi) as info:
+            data = self._replica(backend).get_pixmap_bytes(page, fmt="png", settings=settings, dpi=opts.dpi)
+            size = png_dimensions(data)
+            if size is not None:
+                info.update(width=size[0], height=size[1], pixels=size[0] * size[1])
+            info["bytes"] = len(data)
+            return data
 
-    def convert_layout(
-        self,
-        source: str | Path,
-        layout_name: str,
-        target: str | Path | None = None,
-        options: DXFOptions | None = None,
-    ) -> Path:
-        """Convert a specific layout to PNG."""
-        opts = options or DXFOptions()
-        patched = replace(opts, layout_name=layout_name)
-        return self.convert(source, target=target, options=patched)
+    def _replay_pdf(self, backend, opts: DXFOptions) -> Tuple[object, object]:
+        """Replay a recorded layout into an in-memory vector PDF; return ``(fitz, document)``."""
+        fitz = optional_import("fitz", package="PyMuPDF")
+        page, settings = self._page_settings(opts)
+        with self._raster_errors(opts):
+            return fitz, fitz.open("pdf", self._replica(backend).get_pdf_bytes(page, settings=settings))
 
-    def _get_config(self, config_module, opts: DXFOptions):
-        key = (opts.background, opts.color_policy, opts.lineweight_scaling)
-        cached = self._config_cache.get(key)
-        if cached is not None:
-            return cached
-
-        cfg = config_module.Configuration()
-        background_policy = {
-            "white": config_module.BackgroundPolicy.WHITE,
-            "black": config_module.BackgroundPolicy.BLACK,
-            "off": config_module.BackgroundPolicy.OFF,
-        }.get(opts.background, config_module.BackgroundPolicy.DEFAULT)
-        cfg = cfg.with_changes(background_policy=background_policy)
-
-        color_policy = {
-            "black": config_module.ColorPolicy.BLACK,
-            "white": config_module.ColorPolicy.WHITE,
-            "monochrome": config_module.ColorPolicy.MONOCHROME,
-        }.get(opts.color_policy, config_module.ColorPolicy.COLOR)
-        cfg = cfg.with_changes(color_policy=color_policy)
-        cfg = cfg.with_changes(lineweight_scaling=opts.lineweight_scaling)
-        self._config_cache[key] = cfg
-        return cfg
-
-    def _normalize_relative_point_sizes(self, doc) -> None:
-        """Replace MTEXT relative height markers with absolute values to avoid ezdxf warnings."""
+    @staticmethod
+    def _replica(backend):
+        """Return a copy of a recorded backend that one replay may transform."""
+        # get_replay() moves the recordings into page coordinates in place and clears the
+        # initial y-flip, so replaying the cached backend itself breaks every later render.
+        replica = copy.copy(backend)
+        replica.records = copy.deepcopy(backend.records)
+        return replica
 
-        default_size = doc.header.get("$TEXTSIZE", 2.5) or 2.5
-        updated = 0
+    @contextmanager
+    def _replayed_page(self, backend, opts: DXFOptions) -> Iterator[Tuple[object, object]]:
+        """Yield the replayed vector page for band-wise rasterization."""
+        fitz, pdf = self._replay_pdf(backend, opts)
+        try:
+            with self._raster_errors(opts):
+                yield fitz, pdf[0]
+        finally:
+            pdf.close()
 
-        # Iterate all entities (modelspace, paperspace, block defs) to catch every MTEXT.
-        for entity in doc.entitydb.values():
-            if entity.dxftype() != "MTEXT":
-                continue
 
-            base_size = (
-                entity.dxf.char_height
-                or getattr(entity.dxf, "height", 0)
-                or default_size
-            )
-            base_size = base_size or default_size
+class DXFStreamSession(DXFDocumentSession):
+    """A session that reads modelspace entities from the file while drawing them.
 
-            original = entity.text
+    Built on ``ezdxf.addons.iterdxf``: entities are parsed one at a time and dropped
+    once drawn, so the entity database of huge drawings is never materialized. Each
+    new drawing configuration re-reads the file; DPI and page changes replay the
+    recording like a regular session.
 
-            def replace_match(match: re.Match) -> str:
-                factor = float(match.group(1))
-                absolute = base_size * factor
-                return f"\\H{absolute:g};"
+    Only what the entity stream carries is available: modelspace of ASCII DXF files,
+    without block references (INSERT, which raise), layer table properties or header
+    values such as ``$PDSIZE``. Other layouts, ``bbox`` and ``lod`` need
+    :class:`DXFDocumentSession`.
+    """
 
-            replaced = self._RELATIVE_SIZE_PATTERN.sub(replace_match, original)
-            if replaced != original:
-                entity.text = replaced
-                updated += 1
+    def __init__(self, converter: DXFConverter, path: Path, iterdxf, modules: SimpleNamespace) -> None:
+        super().__init__(converter, path, None, modules)
+        self.iterdxf = iterdxf
+
+    def layout_names(self) -> List[str]:
+        return ["Model"]
+
+    def normalize_relative_sizes(self, workers: int = 1) -> None:
+        """Expand MTEXT relative heights as entities stream past (applies to later recordings)."""
+        if not self._normalized:
+            self._normalized = True
+            self._recordings.clear()
+
+    def spatial_index(self, layout_name: Optional[str] = None, persist: bool = False) -> SpatialIndex:
+        raise ConversionError("Streaming DXF sessions have no spatial index; open the document instead")
+
+    def _layout(self, opts: DXFOptions):
+        blockers = stream_blockers(opts)
+        if blockers:
+            raise ConversionError(f"Streaming DXF sessions cannot render {', '.join(blockers)}")
+        return None
+
+    def _header_pdsize(self) -> float:
+        return 0
+
+    def _draw(self, frontend, opts: DXFOptions, layout_label: str) -> None:
+        """Stream modelspace into *frontend* as a one-shot layout in file order."""
+        self._layout(opts)  # rejects options that need the document
+        properties = optional_import("ezdxf.addons.drawing.properties", package="ezdxf")
+        kwargs = {"layout_properties": properties.LayoutProperties.modelspace()}
+        filter_func = self._entity_filter(opts)
+        if filter_func is not None:
+            kwargs["filter_func"] = filter_func
+        with self.converter.stage("draw", self.path, layout=layout_label, streamed=True) as info:
+            stream = self.iterdxf.opendxf(str(self.path))
+            try:
+                source = StreamedLayout(self._stream_entities(stream.modelspace()))
+                frontend.draw_layout(source, **kwargs)
+            finally:
+                stream.close()
+            info["entities"] = source.count
+        if not source.count:
+            raise ConversionError(f"Layout '{layout_label}' contains no drawable entities")
 
-        if updated:
-            logging.debug("Normalized relative text height for %d MTEXT entities", updated)
+    def _stream_entities(self, entities: Iterable) -> Iterator:
+        # The stream has no layer table: layers get the properties of a new layer (ACI 7,
+        # continuous), so BYLAYER colors follow the background as in a loaded document.
+        properties = optional_import("ezdxf.addons.drawing.properties", package="ezdxf")
+        layers = self.context.layers
+        for entity in entities:
+            if entity.dxftype() == "INSERT":
+                raise ConversionError(
+                    f"Cannot stream '{self.path.name}': INSERT needs the block definitions of the full document"
+                )
+            key = properties.layer_key(entity.dxf.layer)
+            if key not in layers:
+                layers[key] = default = properties.LayerProperties()
+                default.layer = entity.dxf.layer
+                default.has_aci_color_7 = True
+            if self._normalized and entity.dxftype() == "MTEXT":
+                # No header here, so $TEXTSIZE falls back to its default like an unset value.
+                text = entity.text
+                base_size = entity.dxf.char_height or getattr(entity.dxf, "height", 0) or 2.5
+                (replaced,) = expand_relative_heights([(text, base_size)])
+                if replaced is not None:
+                    entity.text = replaced
+            yield entity
@@ -0,0 +1,142 @@
+"""In-process LRU of parsed documents for repeated renders of the same files."""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Hashable, Optional, Tuple
+
+DEFAULT_MAX_DOCUMENTS = 8
+# Bounded by the summed on-disk size of the cached files (a proxy for parsed size).
+DEFAULT_MAX_DOCUMENT_BYTES = 256 * 1024 * 1024
+
+DocumentKey = Tuple[str, int, int, Hashable]
+
+_shared: Optional["DocumentCache"] = None
+_shared_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class DocumentCacheStats:
+    """Counters of a :class:`DocumentCache`."""
+
+    hits: int = 0
+    misses: int = 0
+    revived: int = 0
+    evictions: int = 0
+    documents: int = 0
+    bytes: int = 0
+
+
+class DocumentCache:
+    """Keep recently used parsed documents, keyed by path, mtime and size.
+
+    DXF converters store parsed sessions; AI converters store one PyMuPDF display
+    list per page, told apart by the key's variant.
+
+    Entries are evicted least recently used first once ``max_documents`` or
+    ``max_bytes`` (file sizes) is exceeded. A value with a ``cache_weight`` counts its
+    file size that many times, so a DXF session grows with its recorded layouts; the
+    limits are checked again on every lookup. An evicted document that is still
+    referenced elsewhere stays reachable through a weak reference and is revived
+    on the next lookup instead of being parsed again. Safe to share across threads.
+    """
+
+    def __init__(
+        self,
+        max_documents: int = DEFAULT_MAX_DOCUMENTS,
+        max_bytes: int = DEFAULT_MAX_DOCUMENT_BYTES,
+    ) -> None:
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[DocumentKey, Any]" = OrderedDict()
+        self._evicted: "weakref.WeakValueDictionary[DocumentKey, Any]" = weakref.WeakValueDictionary()
+        self._stats = DocumentCacheStats()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(path: Path, variant: Hashable = None) -> DocumentKey:
+        """Return the key of *path* as it is on disk now; *variant* separates load modes."""
+        stat = path.stat()
+        return (str(path), stat.st_mtime_ns, stat.st_size, variant)
+
+    def get(self, key: DocumentKey) -> Optional[Any]:
+        """Return the cached document for *key* (marking it recently used) or ``None``."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                self._evict()  # cached sessions grow as they record layouts
+                return value
+            value = self._evicted.pop(key, None)
+            if value is not None:
+                self._stats.revived += 1
+                self._insert(key, value)
+                return value
+            self._stats.misses += 1
+            return None
+
+    def put(self, key: DocumentKey, value: Any) -> None:
+        """Cache *value* under *key*, dropping entries of older versions of the same file."""
+        with self._lock:
+            for stale in [other for other in self._entries if other[0] == key[0] and other[1:3] != key[1:3]]:
+                del self._entries[stale]
+            self._insert(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._evicted.clear()
+
+    def stats(self) -> DocumentCacheStats:
+        """Return a snapshot of the hit/miss counters and the current size."""
+        with self._lock:
+            return replace(self._stats, documents=len(self._entries), bytes=self._size())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _insert(self, key: DocumentKey, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > 1 and (len(self._entries) > self.max_documents or self._size() > self.max_bytes):
+            old_key, old_value = self._entries.popitem(last=False)
+            self._stats.evictions += 1
+            try:
+                self._evicted[old_key] = old_value
+            except TypeError:  # not weak-referenceable
+                pass
+
+    def _size(self) -> int:
+        return sum(key[2] * getattr(value, "cache_weight", 1) for key, value in self._entries.items())
+
+
+def shared_document_cache() -> Optional[DocumentCache]:
+    """Return the process-wide cache enabled by :func:`enable_shared_document_cache`, if any."""
+    return _shared
+
+
+def enable_shared_document_cache(**limits: int) -> DocumentCache:
+    """Create (once) the process-wide document cache picked up by new converters."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DocumentCache(**limits)
+        return _shared
+
+
+__all__ = [
+    "DEFAULT_MAX_DOCUMENTS",
+    "DEFAULT_MAX_DOCUMENT_BYTES",
+    "DocumentCache",
+    "DocumentCacheStats",
+    "enable_shared_document_cache",
+    "shared_document_cache",
+]
@@ -18,6 +18,10 @@ class DependencyMissingError(ConversionError):
         self.package = package
         self.hint = hint
 
+    def __reduce__(self):
+        # Keep the original arguments so the error survives pickling across worker processes.
+        return (self.__class__, (self.package, self.hint))
+
 
 class FileInferenceError(ConversionError):
     """Raised when the converter cannot inspect the provided file."""
@@ -0,0 +1,335 @@
+"""Cheap metadata reads for sizing jobs before they are rendered.
+
+DXF files are scanned tag by tag without building entities (or only up to the
+end of the HEADER section with ``header_only``); PDF-based AI files are opened
+lazily and read page boxes without loading pages.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .exceptions import ConversionError, DependencyMissingError
+from .sniff import BINARY, open_decompressed, sniff_dxf
+from .utils import ensure_input_path, optional_import
+
+# Entity types that belong to a parent entity and are not counted on their own.
+SUB_ENTITIES = frozenset({"VERTEX", "SEQEND", "ATTRIB"})
+TEXT_ENTITIES = frozenset({"TEXT", "MTEXT", "ATTRIB"})
+# Structural markers in the ENTITIES and BLOCKS sections.
+_MARKERS = frozenset({"SECTION", "ENDSEC", "BLOCK", "ENDBLK", "EOF"})
+
+# Bytes of a PostScript-based AI file searched for its DSC comments.
+PS_HEADER_SIZE = 64 * 1024
+_BOUNDING_BOX = re.compile(rb"^%%(HiRes)?BoundingBox:\s*([-\d.]+)\s+([-\d.]+)\s+([-\d.]+)\s+([-\d.]+)", re.MULTILINE)
+_PS_VERSION = re.compile(rb"^%!PS-Adobe-(\S+)", re.MULTILINE)
+
+Extents = Tuple[float, float, float, float]
+
+
+@dataclass(slots=True)
+class PageInfo:
+    """Size of one AI page in points and the length of its content streams."""
+
+    number: int
+    width: float
+    height: float
+    content_bytes: Optional[int] = None
+
+
+@dataclass(slots=True)
+class Inspection:
+    """What :func:`inspect` learned about a file without rendering it.
+
+    ``cost`` is a unitless render cost estimate for comparing jobs of one kind:
+    entities drawn (block references count their block contents) for DXF and
+    content stream bytes for AI. Fields a read could not determine stay empty.
+    """
+
+    source: Path
+    kind: Optional[str] = None
+    format: Optional[str] = None
+    size: int = 0
+    version: Optional[str] = None
+    pages: List[PageInfo] = field(default_factory=list)
+    layouts: List[str] = field(default_factory=list)
+    extents: Optional[Extents] = None
+    units: Optional[int] = None
+    entities: Optional[int] = None
+    layers: Dict[str, int] = field(default_factory=dict)
+    texts: Optional[int] = None
+    cost: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable dict of the fields."""
+        data = asdict(self)
+        data["source"] = str(self.source)
+        return data
+
+
+def inspect(source: str | Path, header_only: bool = False) -> Inspection:
+    """Return page/layout lists, extents, entity counts and a cost estimate for *source*.
+
+    With ``header_only`` DXF files are read up to the end of their HEADER section
+    (version, units, extents) and AI page content lengths are skipped.
+    """
+    from .batch import source_kind
+
+    path = ensure_input_path(source)
+    kind = source_kind(path)
+    if kind is None:
+        raise ConversionError(f"Unsupported input type for inspection: {path}")
+    result = Inspection(source=path, kind=kind, size=path.stat().st_size)
+    if result.kind == "ai":
+        _inspect_ai(path, result, header_only)
+    else:
+        _inspect_dxf(path, result, header_only)
+    return result
+
+
+def inspect_many(sources: str | Path | Iterable[str | Path], header_only: bool = False) -> Iterator[Inspection]:
+    """Inspect files, directories or glob patterns, reporting failures in ``error``."""
+    from .batch import expand_sources
+
+    for path in expand_sources(sources):
+        try:
+            yield inspect(path, header_only=header_only)
+        except (ConversionError, DependencyMissingError, OSError) as exc:
+            yield Inspection(source=path, error=str(exc))
+
+
+# ----------------------------------------------------------------------
+# AI
+# ----------------------------------------------------------------------
+def _inspect_ai(path: Path, result: Inspection, header_only: bool) -> None:
+    with open(path, "rb") as handle:
+        head = handle.read(PS_HEADER_SIZE)
+    if not head.startswith(b"%PDF-"):
+        _inspect_postscript(head, result)
+        return
+
+    fitz = optional_import("fitz", package="PyMuPDF")
+    result.format = "pdf"
+    try:
+        doc = fitz.open(path)
+    except Exception as exc:
+        raise ConversionError(f"Failed to open AI file with PyMuPDF: {exc}") from exc
+    try:
+        result.version = (doc.metadata or {}).get("format")
+        for index in range(doc.page_count):
+            box = _page_box(doc, index)
+            content = None if header_only else _content_bytes(doc, index)
+            result.pages.append(PageInfo(index + 1, box.width, box.height, content))
+    finally:
+        doc.close()
+    if not header_only and all(page.content_bytes is not None for page in result.pages):
+        result.cost = sum(page.content_bytes for page in result.pages)
+
+
+def _page_box(doc: Any, index: int) -> Any:
+    # page_cropbox reads the page dictionary without loading (and parsing) the page.
+    if hasattr(doc, "page_cropbox"):
+        return doc.page_cropbox(index)
+    return doc[index].rect
+
+
+def _content_bytes(doc: Any, index: int) -> Optional[int]:
+    """Return the summed /Length of page *index*'s content streams, or ``None``."""
+    try:
+        kind, value = doc.xref_get_key(doc.page_xref(index), "Contents")
+        if kind not in ("xref", "array"):
+            return 0 if kind == "null" else None
+        total = 0
+        for xref in re.findall(r"(\d+) 0 R", value):
+            length_kind, length = doc.xref_get_key(int(xref), "Length")
+            if length_kind == "xref":
+                length_kind, length = "int", doc.xref_object(int(length.split()[0])).strip()
+            if length_kind != "int":
+                return None
+            total += int(length)
+        return total
+    except Exception:
+        return None
+
+
+def _inspect_postscript(head: bytes, result: Inspection) -> None:
+    """Read the DSC comments of a PostScript-based (pre-PDF) AI file."""
+    result.format = "postscript"
+    version = _PS_VERSION.search(head)
+    if version:
+        result.version = version.group(1).decode("ascii", "replace")
+    boxes = {bool(match.group(1)): match for match in _BOUNDING_BOX.finditer(head)}
+    box = boxes.get(True) or boxes.get(False)
+    if box is None:
+        return
+    x0, y0, x1, y1 = (float(value) for value in box.group(2, 3, 4, 5))
+    result.extents = (x0, y0, x1, y1)
+    result.pages.append(PageInfo(1, x1 - x0, y1 - y0))
+
+
+# ----------------------------------------------------------------------
+# DXF
+# ----------------------------------------------------------------------
+def _inspect_dxf(path: Path, result: Inspection, header_only: bool) -> None:
+    result.format = sniff_dxf(path)
+    if result.format == BINARY:
+        # The binary tag loader needs the whole buffer.
+        tagger = optional_import("ezdxf.lldxf.tagger", package="ezdxf")
+        tags = ((tag.code, tag.value) for tag in tagger.binary_tags_loader(path.read_bytes()))
+        _scan_dxf(tags, result, header_only)
+        return
+    with open_decompressed(result.format, lambda: open(path, "rb")) as stream:
+        _scan_dxf(_ascii_tags(stream), result, header_only)
+
+
+def _ascii_tags(stream: Iterable[bytes]) -> Iterator[Tuple[int, str]]:
+    """Yield ``(group code, value)`` pairs from the lines of an ASCII DXF byte stream."""
+    lines = iter(stream)
+    for code_line in lines:
+        value = next(lines, b"").strip()
+        try:
+            code = int(code_line)
+        except ValueError:
+            raise ConversionError(f"Malformed DXF group code {code_line.strip()[:20]!r}") from None
+        try:
+            yield code, value.decode("utf-8")
+        except UnicodeDecodeError:  # pre-R2007 files use an ANSI codepage
+            yield code, value.decode("cp1252", "replace")
+
+
+def _scan_dxf(tags: Iterable[Tuple[int, Any]], result: Inspection, header_only: bool) -> None:
+    """Fill *result* from a single pass over the group codes of a DXF file."""
+    header: Dict[str, Dict[int, Any]] = {}
+    layers: Counter = Counter()
+    texts = 0
+    layouts: List[Tuple[int, str]] = []
+    drawn: List[Optional[str]] = []  # per layout entity: the block it references, if any
+    blocks: Dict[str, List[Optional[str]]] = defaultdict(list)
+
+    section = None
+    naming = False
+    variable = None
+    entity = None
+    layer = "0"
+    name = None
+    subclass = None
+    tab_order = 0
+    block = None
+
+    def finish() -> None:
+        nonlocal texts, block
+        if entity is None:
+            return
+        if section == "BLOCKS" and entity == "BLOCK":
+            block = name
+        elif section == "BLOCKS" and entity == "ENDBLK":
+            block = None
+        elif section == "OBJECTS" and entity == "LAYOUT" and name is not None:
+            layouts.append((tab_order, name))
+        elif section in ("ENTITIES", "BLOCKS") and entity not in _MARKERS:
+            in_layout = _is_layout_block(block)
+            if entity in TEXT_ENTITIES and in_layout:
+                texts += 1
+            if entity in SUB_ENTITIES:
+                return
+            reference = name if entity == "INSERT" else None
+            if in_layout:
+                layers[layer] += 1
+                drawn.append(reference)
+            else:
+                blocks[block].append(reference)
+
+    for code, value in tags:
+        if code == 0:
+            finish()
+            entity, layer, name, subclass, tab_order = value, "0", None, None, 0
+            if value == "SECTION":
+                naming = True
+            elif value == "ENDSEC":
+                if section == "HEADER" and header_only:
+                    break
+                section = None
+            continue
+        if naming and code == 2:
+            section, naming = value, False
+        elif section == "HEADER":
+            if code == 9:
+                variable = value
+            elif variable is not None:
+                header.setdefault(variable, {})[code] = value
+        elif code == 8:
+            layer = value
+        elif code == 2 and entity in ("INSERT", "BLOCK"):
+            name = value
+        elif code == 100:
+            subclass = value
+        elif code == 1 and subclass == "AcDbLayout":
+            name = value
+        elif code == 71 and subclass == "AcDbLayout":
+            tab_order = int(value)
+    else:  # not stopped after the header: close the last entity
+        finish()
+
+    result.version = header.get("$ACADVER", {}).get(1)
+    units = header.get("$INSUNITS", {}).get(70)
+    result.units = int(units) if units is not None else None
+    result.extents = _header_extents(header)
+    if header_only:
+        return
+    result.layouts = [layout for _, layout in sorted(layouts)] or ["Model"]
+    result.layers = dict(layers)
+    result.entities = len(drawn)
+    result.texts = texts
+    result.cost = _drawing_cost(drawn, blocks)
+
+
+def _is_layout_block(block: Optional[str]) -> bool:
+    # Entities of inactive paperspace layouts live in *Paper_Space<n> block definitions.
+    return block is None or block.upper().startswith(("*MODEL_SPACE", "*PAPER_SPACE"))
+
+
+def _header_extents(header: Dict[str, Dict[int, Any]]) -> Optional[Extents]:
+    try:
+        lower, upper = header["$EXTMIN"], header["$EXTMAX"]
+        box = (float(lower[10]), float(lower[20]), float(upper[10]), float(upper[20]))
+    except (KeyError, ValueError):
+        return None
+    # New drawings store inverted sentinel extents (1e20 / -1e20) until they are updated.
+    return box if box[0] <= box[2] and box[1] <= box[3] else None
+
+
+def _drawing_cost(drawn: List[Optional[str]], blocks: Dict[str, List[Optional[str]]]) -> int:
+    """Count the entities drawn, expanding block references through their definitions."""
+    sizes: Dict[str, int] = {}
+
+    def weight(reference: Optional[str], visiting: Set[str]) -> int:
+        if reference is None:
+            return 1
+        if reference not in sizes:
+            if reference in visiting:  # recursive block definition
+                return 1
+            visiting.add(reference)
+            sizes[reference] = sum(weight(item, visiting) for item in blocks.get(reference, ()))
+            visiting.discard(reference)
+        return 1 + sizes[reference]
+
+    return sum(weight(reference, set()) for reference in drawn)
+
+
+__all__ = [
+    "Inspection",
+    "PageInfo",
+    "SUB_ENTITIES",
+    "TEXT_ENTITIES",
+    "inspect",
+    "inspect_many",
+]
@@ -0,0 +1,141 @@
+"""Level-of-detail simplification of DXF entities for low-resolution renders."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .options import DXFOptions
+from .spatial import Box
+
+TEXT_TYPES = frozenset({"TEXT", "MTEXT", "ATTRIB"})
+# Entities that are meaningful even with empty extents.
+ZERO_SIZE_TYPES = frozenset({"POINT"})
+# Polylines with fewer vertices are left alone.
+MIN_DECIMATE_VERTICES = 8
+
+
+@dataclass(slots=True)
+class LODStats:
+    """What a simplification pass did."""
+
+    dropped: int = 0
+    boxed: int = 0
+    decimated: int = 0
+    removed_vertices: int = 0
+
+
+def units_per_pixel(extents: Optional[Box], opts: DXFOptions) -> Optional[float]:
+    """Estimate how many drawing units one output pixel covers for *opts*.
+
+    Mirrors the page fitting: an auto-sized page maps one drawing unit to
+    ``scale`` millimetres, a fixed or clamped page scales the content to fit.
+    """
+    if extents is None:
+        return None
+    width = (extents[2] - extents[0]) * opts.scale
+    height = (extents[3] - extents[1]) * opts.scale
+    margin = 2 * opts.margins if isinstance(opts.margins, (int, float)) else 0
+    fits = []
+    for page, limit, size in (
+        (opts.page_width, opts.max_width, width),
+        (opts.page_height, opts.max_height, height),
+    ):
+        if size <= 0:
+            continue
+        if page:
+            fits.append((page - margin) / size)
+        elif limit:
+            fits.append(min(1.0, (limit - margin) / size))
+    fit = min(fits) if fits else 1.0
+    if fit <= 0 or opts.scale <= 0 or opts.dpi <= 0:
+        return None
+    return 25.4 / (opts.dpi * opts.scale * fit)
+
+
+def simplify_entities(
+    entities: Sequence[Any],
+    box_of: Callable[[Any], Optional[Box]],
+    pixel: float,
+    threshold: float,
+    text_height: float,
+    lwpolyline: Any,
+) -> Tuple[List[Any], LODStats]:
+    """Return *entities* with sub-pixel geometry removed or simplified.
+
+    *pixel* is the size of one output pixel in drawing units. Entities whose
+    extents stay below ``threshold`` pixels are dropped, text shorter than
+    ``text_height`` pixels becomes an outline box (built with *lwpolyline*, the
+    ezdxf ``LWPolyline`` class), and straight polyline runs lose vertices closer
+    than ``threshold`` pixels to the previous kept vertex. Replacements keep the
+    original handle so the layout's redraw order still applies.
+    """
+    stats = LODStats()
+    min_size = threshold * pixel
+    min_text = text_height * pixel
+    result: List[Any] = []
+    for entity in entities:
+        kind = entity.dxftype()
+        box = box_of(entity)
+        if box is not None and kind not in ZERO_SIZE_TYPES:
+            if max(box[2] - box[0], box[3] - box[1]) < min_size:
+                stats.dropped += 1
+                continue
+            if kind in TEXT_TYPES and _text_height(entity) < min_text:
+                result.append(_outline(entity, box, lwpolyline))
+                stats.boxed += 1
+                continue
+        if kind == "LWPOLYLINE":
+            simplified = _decimate(entity, min_size)
+            if simplified is not entity:
+                stats.decimated += 1
+                stats.removed_vertices += len(entity) - len(simplified)
+                entity = simplified
+        result.append(entity)
+    return result, stats
+
+
+def _text_height(entity: Any) -> float:
+    dxf = entity.dxf
+    return getattr(dxf, "height", None) or getattr(dxf, "char_height", None) or 0.0
+
+
+def _copy_attributes(entity: Any) -> Dict[str, Any]:
+    attributes = {"layer": entity.dxf.layer}
+    for name in ("color", "true_color", "linetype"):
+        if entity.dxf.hasattr(name):
+            attributes[name] = entity.dxf.get(name)
+    return attributes
+
+
+def _outline(entity: Any, box: Box, lwpolyline: Any) -> Any:
+    outline = lwpolyline.new(dxfattribs=_copy_attributes(entity))
+    outline.set_points([(box[0], box[1]), (box[2], box[1]), (box[2], box[3]), (box[0], box[3])], format="xy")
+    outline.closed = True
+    outline.dxf.handle = entity.dxf.handle
+    return outline
+
+
+def _decimate(entity: Any, min_step: float) -> Any:
+    """Return a virtual copy of an LWPOLYLINE without vertices closer than *min_step*."""
+    if len(entity) < MIN_DECIMATE_VERTICES or min_step <= 0:
+        return entity
+    points = entity.get_points("xyseb")
+    if any(point[4] for point in points):
+        return entity  # arc segments: leave to the frontend's own flattening
+    kept = [points[0]]
+    for point in points[1:-1]:
+        last = kept[-1]
+        if math.hypot(point[0] - last[0], point[1] - last[1]) >= min_step:
+            kept.append(point)
+    kept.append(points[-1])
+    if len(kept) == len(points):
+        return entity
+    simplified = entity.copy()
+    simplified.set_points(kept, format="xyseb")
+    simplified.dxf.handle = entity.dxf.handle
+    return simplified
+
+
+__all__ = ["LODStats", "simplify_entities", "units_per_pixel"]
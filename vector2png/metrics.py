@@ -0,0 +1,139 @@
+"""Per-stage instrumentation events and exporters for converters."""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol, TextIO, Tuple
+
+# Numeric event attributes that are summed into Prometheus counters.
+COUNTED_ATTRIBUTES = ("bytes", "entities", "pixels")
+
+
+@dataclass(slots=True)
+class StageEvent:
+    """Timing of one conversion stage (``read``, ``draw``, ``rasterize``, ``write``...).
+
+    ``attributes`` carries stage-specific facts such as entity counts, pixel
+    dimensions, bytes written or the AI method that produced the output.
+    """
+
+    kind: str
+    stage: str
+    duration: float
+    source: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "kind": self.kind,
+            "stage": self.stage,
+            "duration": self.duration,
+            "source": self.source,
+            "error": self.error,
+            **self.attributes,
+        }
+
+
+class Observer(Protocol):
+    """Receives a :class:`StageEvent` whenever a converter finishes a stage."""
+
+    def on_stage(self, event: StageEvent) -> None: ...
+
+
+class JSONLinesExporter:
+    """Write every event as one JSON object per line to a stream or file."""
+
+    def __init__(self, target: str | Path | TextIO | None = None) -> None:
+        self._owned = isinstance(target, (str, Path))
+        if self._owned:
+            self.stream: TextIO = open(target, "a", encoding="utf-8")  # noqa: SIM115 - closed in close()
+        else:
+            self.stream = target if target is not None else sys.stderr
+        self._lock = threading.Lock()
+
+    def on_stage(self, event: StageEvent) -> None:
+        line = json.dumps(event.to_dict(), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def close(self) -> None:
+        if self._owned:
+            self.stream.close()
+
+
+class PrometheusExporter:
+    """Aggregate events into counters rendered in the Prometheus text format."""
+
+    def __init__(self, prefix: str = "vector2png") -> None:
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._errors: Dict[Tuple[str, str], int] = defaultdict(int)
+        # Integer totals stay ints so large byte counters are rendered exactly.
+        self._totals: Dict[Tuple[str, str, str], float] = defaultdict(int)
+        self._methods: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def on_stage(self, event: StageEvent) -> None:
+        key = (event.kind, event.stage)
+        with self._lock:
+            self._seconds[key] += event.duration
+            self._counts[key] += 1
+            if event.error:
+                self._errors[key] += 1
+            for name in COUNTED_ATTRIBUTES:
+                value = event.attributes.get(name)
+                if isinstance(value, (int, float)):
+                    self._totals[(name, event.kind, event.stage)] += value
+            method = event.attributes.get("method")
+            if method and event.error is None and event.stage == "convert":
+                self._methods[(event.kind, str(method))] += 1
+
+    def render(self) -> str:
+        """Return the current metrics as Prometheus exposition text."""
+        prefix = self.prefix
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per conversion stage.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        with self._lock:
+            for (kind, stage), seconds in sorted(self._seconds.items()):
+                labels = f'kind="{kind}",stage="{stage}"'
+                lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {seconds:.6f}")
+                lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {self._counts[(kind, stage)]}")
+            lines += [f"# TYPE {prefix}_stage_errors_total counter"]
+            for (kind, stage), count in sorted(self._errors.items()):
+                lines.append(f'{prefix}_stage_errors_total{{kind="{kind}",stage="{stage}"}} {count}')
+            for name in COUNTED_ATTRIBUTES:
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                for (metric, kind, stage), value in sorted(self._totals.items()):
+                    if metric == name:
+                        lines.append(f'{prefix}_{name}_total{{kind="{kind}",stage="{stage}"}} {_number(value)}')
+            lines.append(f"# TYPE {prefix}_method_total counter")
+            for (kind, method), count in sorted(self._methods.items()):
+                lines.append(f'{prefix}_method_total{{kind="{kind}",method="{method}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | Path) -> Path:
+        """Write :meth:`render` output to *path* (e.g. a node-exporter textfile)."""
+        output = Path(path)
+        output.write_text(self.render(), encoding="utf-8")
+        return output
+
+
+def _number(value: float) -> str:
+    """Format a sample value without losing precision (``repr`` round-trips floats)."""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+__all__ = ["JSONLinesExporter", "Observer", "PrometheusExporter", "StageEvent"]
@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional, Tuple
-
+from pathlib import Path
+from typing import Optional, Tuple, Union
 
 RgbColor = Tuple[int, int, int]
+BoundingBox = Tuple[float, float, float, float]
+
+# File size from which DXF conversions stream modelspace instead of loading the document.
+DEFAULT_STREAM_THRESHOLD = 256 * 1024 * 1024
 
 
 @dataclass(slots=True)
@@ -19,6 +23,8 @@ class AIOptions:
     prefer_method: str = "auto"
     fallback: bool = True
     timeout: int = 30
+    pages: Optional[str] = None
+    tile_size: Optional[int] = None
 
 
 @dataclass(slots=True)
@@ -38,6 +44,26 @@ class DXFOptions:
     layout_name: Optional[str] = None
     pdsize: Optional[float] = None
     normalize_relative_size: bool = False
+    normalize_workers: int = 1
+    tile_size: Optional[int] = None
+    layers: Optional[Tuple[str, ...]] = None
+    exclude_layers: Optional[Tuple[str, ...]] = None
+    entity_types: Optional[Tuple[str, ...]] = None
+    bbox: Optional[BoundingBox] = None
+    persist_index: bool = False
+    lod: bool = False
+    lod_threshold: float = 1.0
+    lod_text_height: float = 4.0
+    stream: Optional[bool] = None
+    stream_threshold: int = DEFAULT_STREAM_THRESHOLD
+
+
+@dataclass(slots=True)
+class OutputSpec:
+    """One rasterization requested from a multi-output render."""
+
+    dpi: int
+    target: Optional[Union[str, Path]] = None
 
 
-__all__ = ["AIOptions", "DXFOptions", "RgbColor"]
+__all__ = ["AIOptions", "BoundingBox", "DEFAULT_STREAM_THRESHOLD", "DXFOptions", "OutputSpec", "RgbColor"]
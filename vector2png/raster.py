@@ -0,0 +1,203 @@
+"""Memory-bounded rasterization helpers shared by the AI and DXF pipelines."""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Sequence, Tuple
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color type per channel count: gray, gray+alpha, RGB, RGBA.
+_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+
+class PNGStreamWriter:
+    """Encode a PNG incrementally from blocks of scanlines.
+
+    Only the current block and the zlib window are held in memory, so the encoder
+    never needs the full raster.
+    """
+
+    def __init__(
+        self,
+        handle: BinaryIO,
+        width: int,
+        height: int,
+        channels: int,
+        compress_level: int = 6,
+    ) -> None:
+        if channels not in _COLOR_TYPES:
+            raise ValueError(f"Unsupported channel count for PNG output: {channels}")
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Invalid PNG dimensions {width}x{height}")
+        self.handle = handle
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(compress_level)
+        handle.write(PNG_SIGNATURE)
+        header = struct.pack(">IIBBBBB", width, height, 8, _COLOR_TYPES[channels], 0, 0, 0)
+        self._write_chunk(b"IHDR", header)
+
+    def write_rows(self, samples: bytes | bytearray | memoryview, stride: int) -> None:
+        """Append every complete row contained in *samples* (``stride`` bytes apart)."""
+        view = memoryview(samples)
+        row_bytes = self.width * self.channels
+        rows = len(view) // stride
+        if self.rows_written + rows > self.height:
+            raise ValueError("More rows written than declared in the PNG header")
+
+        filtered = bytearray()
+        for offset in range(0, rows * stride, stride):
+            filtered.append(0)  # filter type "None"
+            filtered += view[offset : offset + row_bytes]
+        data = self._compressor.compress(filtered)
+        if data:
+            self._write_chunk(b"IDAT", data)
+        self.rows_written += rows
+
+    def close(self) -> None:
+        """Flush the compressor and write the trailing chunks."""
+        if self.rows_written != self.height:
+            raise ValueError(f"PNG incomplete: {self.rows_written} of {self.height} rows written")
+        self._write_chunk(b"IDAT", self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
+
+    def _write_chunk(self, tag: bytes, data: bytes) -> None:
+        self.handle.write(struct.pack(">I", len(data)))
+        self.handle.write(tag)
+        self.handle.write(data)
+        self.handle.write(struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+
+def new_canvas(fitz: Any, irect: Any, alpha: bool) -> Any:
+    """Return an RGB(A) pixmap covering *irect*, cleared to transparent or white."""
+    pix = fitz.Pixmap(fitz.csRGB, irect, alpha)
+    pix.clear_with(0 if alpha else 255)
+    return pix
+
+
+def render_banded(
+    fitz: Any,
+    page: Any,
+    handle: BinaryIO,
+    zoom: float,
+    band_height: int,
+    alpha: bool = False,
+) -> Tuple[int, int]:
+    """Rasterize *page* in horizontal bands of *band_height* rows and stream them as PNG.
+
+    The page content is interpreted once into a display list (unless *page* already is
+    a :class:`DisplayListPage`) and each band replays it clipped to the band, so peak
+    memory is one ``width x band_height`` pixmap plus the encoder state rather than the
+    full raster. Pass a :func:`backdrop` page for a background color. Returns the output
+    ``(width, height)`` in pixels.
+    """
+    if band_height <= 0:
+        raise ValueError("Tile size must be a positive number of pixels")
+    if not isinstance(page, DisplayListPage):
+        page = DisplayListPage(page.get_displaylist())
+    mat = fitz.Matrix(zoom, zoom)
+    bounds = (page.rect * mat).irect
+    writer = PNGStreamWriter(handle, bounds.width, bounds.height, 4 if alpha else 3)
+    for top in range(bounds.y0, bounds.y1, band_height):
+        band = fitz.IRect(bounds.x0, top, bounds.x1, min(top + band_height, bounds.y1))
+        pix = render_region(fitz, page, mat, band, alpha)
+        writer.write_rows(_samples(pix), pix.stride)
+        del pix
+    writer.close()
+    return bounds.width, bounds.height
+
+
+def render_banded_to_path(
+    fitz: Any,
+    page: Any,
+    png_path: Path,
+    zoom: float,
+    band_height: int,
+    alpha: bool = False,
+) -> Tuple[int, int]:
+    """Write :func:`render_banded` output to *png_path*, removing partial files on failure."""
+    try:
+        with open(png_path, "wb") as handle:
+            return render_banded(fitz, page, handle, zoom, band_height, alpha=alpha)
+    except BaseException:
+        Path(png_path).unlink(missing_ok=True)
+        raise
+
+
+def render_region(fitz: Any, page: Any, matrix: Any, irect: Any, alpha: bool = False) -> Any:
+    """Rasterize the *irect* pixel region of *page* scaled by *matrix*."""
+    pix = page.get_pixmap(matrix=matrix, clip=fitz.Rect(irect) * ~matrix, alpha=alpha)
+    if tuple(pix.irect) == tuple(irect):
+        return pix
+    # The clip is converted back to pixels with outward rounding, which can add a row
+    # or column; copy the requested region so bands line up exactly.
+    region = new_canvas(fitz, irect, alpha)
+    region.copy(pix, irect)
+    return region
+
+
+class DisplayListPage:
+    """A page stand-in that replays a recorded ``fitz.DisplayList``.
+
+    It offers the ``rect`` and ``get_pixmap`` subset of ``fitz.Page`` used by the
+    renderers here, so repeat renders skip re-interpreting the content stream.
+    """
+
+    def __init__(self, display_list: Any) -> None:
+        self.display_list = display_list
+
+    @property
+    def rect(self) -> Any:
+        return self.display_list.rect
+
+    def get_pixmap(self, matrix: Any, alpha: bool = False, clip: Any = None) -> Any:
+        return self.display_list.get_pixmap(matrix=matrix, alpha=alpha, clip=clip)
+
+
+def backdrop(fitz: Any, page: Any, background: Sequence[int]) -> DisplayListPage:
+    """Return *page* drawn over its page box filled with the RGB *background* color.
+
+    The page is copied into a scratch PDF, so its document is left untouched.
+    """
+    scratch = fitz.open()
+    try:
+        scratch.insert_pdf(page.parent, from_page=page.number, to_page=page.number)
+        copy = scratch[0]
+        rotation = copy.rotation
+        copy.set_rotation(0)  # fill the unrotated page box
+        fill = tuple(channel / 255 for channel in background)
+        copy.draw_rect(copy.rect, color=None, fill=fill, width=0, overlay=False)
+        copy.set_rotation(rotation)
+        return DisplayListPage(copy.get_displaylist())
+    finally:
+        scratch.close()
+
+
+def png_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """Return ``(width, height)`` from a PNG header, or ``None`` if *data* is not a PNG."""
+    if len(data) < 24 or not data.startswith(PNG_SIGNATURE):
+        return None
+    return struct.unpack(">II", data[16:24])
+
+
+def _samples(pix: Any) -> bytes | memoryview:
+    # samples_mv avoids copying the pixel buffer on PyMuPDF versions that provide it.
+    view = getattr(pix, "samples_mv", None)
+    return view if view is not None else pix.samples
+
+
+__all__ = [
+    "DisplayListPage",
+    "PNGStreamWriter",
+    "backdrop",
+    "new_canvas",
+    "png_dimensions",
+    "render_banded",
+    "render_banded_to_path",
+    "render_region",
+]
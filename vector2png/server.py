@@ -0,0 +1,283 @@
+"""Warm conversion daemon on a Unix socket and the client used by the CLI.
+
+The protocol is one JSON object per line in each direction. Requests are
+``{"op": "convert", "kind": "ai"|"dxf", "source": ..., "target": ..., "options": {...}}``,
+``{"op": "ping"}`` or ``{"op": "shutdown"}``; responses carry ``ok`` plus either the
+result (``target``, ``duration``...) or an ``error`` message.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import __version__
+from .batch import BatchResult, _run_job, get_converter
+from .cache import RenderCache
+from .documents import enable_shared_document_cache, shared_document_cache
+from .exceptions import ConversionError, DependencyMissingError
+from .options import AIOptions, DXFOptions
+
+OPTION_TYPES = {"ai": AIOptions, "dxf": DXFOptions}
+
+logger = logging.getLogger("vector2png.server")
+
+
+def default_socket_path() -> Path:
+    """Return ``$VECTOR2PNG_SOCKET``, a per-user runtime socket, or a per-user temp path."""
+    env = os.environ.get("VECTOR2PNG_SOCKET")
+    if env:
+        return Path(env).expanduser()
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / "vector2png.sock"
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return Path(tempfile.gettempdir()) / f"vector2png-{uid}.sock"
+
+
+def encode_options(options: Any) -> Optional[Dict[str, Any]]:
+    return asdict(options) if options is not None else None
+
+
+def decode_options(kind: str, data: Optional[Dict[str, Any]]):
+    """Rebuild an options dataclass from its JSON form (lists become tuples again)."""
+    if data is None:
+        return None
+    option_type = OPTION_TYPES[kind]
+    known = {field.name for field in fields(option_type)}
+    values = {key: tuple(value) if isinstance(value, list) else value for key, value in data.items() if key in known}
+    return option_type(**values)
+
+
+def preload() -> None:
+    """Import the rendering stacks and build the per-process converters ahead of requests.
+
+    Also enables the process-wide document cache, so repeated requests for the same
+    drawing skip parsing and AI pages replay their display lists.
+    """
+    enable_shared_document_cache()
+    for kind in OPTION_TYPES:
+        try:
+            converter = get_converter(kind)
+            if kind == "dxf":
+                converter._load_modules()
+        except DependencyMissingError as exc:
+            logger.debug("Not preloading %s: %s", kind, exc)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                response = {"ok": False, "error": f"Malformed request: {exc}"}
+                request = {}
+            else:
+                response = self.server.conversion_daemon.handle(request)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+            if request.get("op") == "shutdown":
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class ConversionDaemon:
+    """Serve conversions from warm converters over a Unix socket.
+
+    With ``workers=1`` requests are converted in the daemon process one at a time
+    (MuPDF is not thread-safe). More workers dispatch to a process pool whose
+    processes preload PyMuPDF/ezdxf once and enforce per-request timeouts; the
+    in-process mode converts on socket handler threads, where the ``SIGALRM`` timer
+    cannot run, so it rejects requests with a ``timeout``.
+    """
+
+    def __init__(
+        self,
+        socket_path: str | Path | None = None,
+        workers: int = 1,
+        cache: Optional[RenderCache] = None,
+    ) -> None:
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise ConversionError("The conversion daemon requires Unix domain sockets")
+        self.socket_path = Path(socket_path).expanduser() if socket_path else default_socket_path()
+        self.workers = max(1, workers)
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+
+    def start(self) -> None:
+        """Bind the socket (replacing a stale one) and warm up the converters."""
+        if self.socket_path.exists():
+            if DaemonClient(self.socket_path).ping() is not None:
+                raise ConversionError(f"A vector2png daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=preload)
+        else:
+            preload()
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.conversion_daemon = self
+        os.chmod(self.socket_path, 0o600)
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.start()
+        logger.info("vector2png daemon listening on %s", self.socket_path)
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            self.socket_path.unlink(missing_ok=True)
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Process one decoded request and return the response object."""
+        op = request.get("op", "convert")
+        if op == "ping":
+            response = {"ok": True, "pid": os.getpid(), "version": __version__, "workers": self.workers}
+            documents = shared_document_cache()
+            if documents is not None and self._executor is None:
+                response["documents"] = asdict(documents.stats())
+            return response
+        if op == "shutdown":
+            return {"ok": True}
+        if op != "convert":
+            return {"ok": False, "error": f"Unknown operation '{op}'"}
+
+        kind = request.get("kind")
+        if kind not in OPTION_TYPES:
+            return {"ok": False, "error": f"Unknown converter kind: {kind}"}
+        if not request.get("source"):
+            return {"ok": False, "error": "Missing 'source' in convert request"}
+
+        try:
+            options = decode_options(kind, request.get("options"))
+        except TypeError as exc:
+            return {"ok": False, "error": f"Invalid options: {exc}"}
+        timeout = request.get("timeout")
+        if timeout and self._executor is None:
+            return {"ok": False, "error": "Per-request timeouts need a daemon with more than one worker"}
+        job = (kind, Path(request["source"]), Path(request["target"]) if request.get("target") else None)
+        worker = partial(
+            _run_job,
+            ai_options=options if kind == "ai" else None,
+            dxf_options=options if kind == "dxf" else None,
+            timeout=timeout,
+            cache=self.cache,
+        )
+        if self._executor is not None:
+            result: BatchResult = self._executor.submit(worker, job).result()
+        else:
+            with self._lock:
+                result = worker(job)
+        return {
+            "ok": result.ok,
+            "target": str(result.target) if result.target else None,
+            "error": result.error,
+            "duration": result.duration,
+        }
+
+
+class DaemonClient:
+    """Minimal client for :class:`ConversionDaemon`."""
+
+    def __init__(self, socket_path: str | Path | None = None, connect_timeout: float = 1.0) -> None:
+        self.socket_path = Path(socket_path).expanduser() if socket_path else default_socket_path()
+        self.connect_timeout = connect_timeout
+
+    def request(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Send *payload* and return the response, or ``None`` when no daemon is reachable."""
+        if not hasattr(socket, "AF_UNIX") or not self.socket_path.exists():
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.connect_timeout)
+            try:
+                sock.connect(str(self.socket_path))
+            except OSError:
+                return None
+            sock.settimeout(None)
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+        finally:
+            sock.close()
+        if not line:
+            raise ConversionError("The vector2png daemon closed the connection")
+        return json.loads(line)
+
+    def ping(self) -> Optional[Dict[str, Any]]:
+        return self.request({"op": "ping"})
+
+    def shutdown(self) -> bool:
+        return self.request({"op": "shutdown"}) is not None
+
+    def convert(
+        self,
+        kind: str,
+        source: str | Path,
+        target: str | Path | None = None,
+        options: Any = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[Path]:
+        """Convert through the daemon; return ``None`` if it is not running.
+
+        Paths are resolved here because the daemon may run in another directory.
+        Failures reported by the daemon are raised as :class:`ConversionError`.
+        """
+        source_path = Path(source).expanduser().resolve()
+        if not source_path.exists():
+            raise FileNotFoundError(f"Input file not found: {source_path}")
+        response = self.request(
+            {
+                "op": "convert",
+                "kind": kind,
+                "source": str(source_path),
+                "target": str(Path(target).expanduser().resolve()) if target else None,
+                "options": encode_options(options),
+                "timeout": timeout,
+            }
+        )
+        if response is None:
+            return None
+        if not response.get("ok"):
+            raise ConversionError(response.get("error") or "Conversion failed in the daemon")
+        return Path(response["target"])
+
+
+__all__ = [
+    "ConversionDaemon",
+    "DaemonClient",
+    "decode_options",
+    "default_socket_path",
+    "encode_options",
+    "preload",
+]
@@ -0,0 +1,81 @@
+"""Detect how a DXF input is stored from its leading bytes."""
+
+from __future__ import annotations
+
+import gzip
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
+
+from .exceptions import ConversionError
+
+BINARY_DXF_SENTINEL = b"AutoCAD Binary DXF\r\n\x1a\x00"
+GZIP_MAGIC = b"\x1f\x8b"
+ZIP_MAGIC = b"PK\x03\x04"
+
+ASCII = "ascii"
+BINARY = "binary"
+GZIP = "gzip"
+ZIP = "zip"
+
+# Bytes needed to tell every format apart.
+SNIFF_SIZE = len(BINARY_DXF_SENTINEL)
+
+
+def sniff_bytes(head: bytes) -> str:
+    """Return the storage format (``ascii``, ``binary``, ``gzip`` or ``zip``) of *head*."""
+    if head.startswith(BINARY_DXF_SENTINEL):
+        return BINARY
+    if head.startswith(GZIP_MAGIC):
+        return GZIP
+    if head.startswith(ZIP_MAGIC):
+        return ZIP
+    return ASCII
+
+
+def sniff_dxf(path: str | Path) -> str:
+    """Return the storage format of the DXF file at *path* from its first bytes."""
+    with open(path, "rb") as handle:
+        return sniff_bytes(handle.read(SNIFF_SIZE))
+
+
+def dxf_member(archive: zipfile.ZipFile) -> str:
+    """Return the DXF member of *archive*: the first ``*.dxf`` or the only member."""
+    names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    for name in names:
+        if name.lower().endswith(".dxf"):
+            return name
+    if len(names) == 1:
+        return names[0]
+    raise ConversionError("Zip archive contains no .dxf member")
+
+
+@contextmanager
+def open_decompressed(kind: str, open_raw: Callable[[], BinaryIO]) -> Iterator[BinaryIO]:
+    """Open the raw input with *open_raw* and yield its decompressed DXF byte stream.
+
+    Decompression is incremental: only what the reader consumes is inflated.
+    """
+    with open_raw() as raw:
+        if kind == GZIP:
+            with gzip.GzipFile(fileobj=raw) as stream:
+                yield stream
+        elif kind == ZIP:
+            with zipfile.ZipFile(raw) as archive, archive.open(dxf_member(archive)) as stream:
+                yield stream
+        else:
+            yield raw
+
+
+__all__ = [
+    "ASCII",
+    "BINARY",
+    "BINARY_DXF_SENTINEL",
+    "GZIP",
+    "ZIP",
+    "dxf_member",
+    "open_decompressed",
+    "sniff_bytes",
+    "sniff_dxf",
+]
@@ -0,0 +1,222 @@
+"""Uniform-grid spatial index over DXF entity bounding boxes."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Box = Tuple[float, float, float, float]
+
+INDEX_SUFFIX = ".v2pindex"
+INDEX_VERSION = 1
+
+# Average number of entities per grid cell the cell size aims for.
+TARGET_PER_CELL = 16
+# Entities covering more cells than this are tested directly instead of gridded.
+MAX_CELLS_PER_ENTITY = 64
+
+
+class SpatialIndex:
+    """Grid of entity handles bucketed by bounding box, queried with a region.
+
+    ``boxes[i]`` is ``(xmin, ymin, xmax, ymax)`` for ``handles[i]`` or ``None`` when the
+    entity has no extents; such entities match every query. Query results keep the
+    original entity order, so redraw order is preserved.
+    """
+
+    def __init__(self, handles: Sequence[str], boxes: Sequence[Optional[Box]]) -> None:
+        self.handles = list(handles)
+        self.boxes = [tuple(box) if box is not None else None for box in boxes]
+        self._always: List[int] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+
+        bounded = [box for box in self.boxes if box is not None]
+        self.origin, self.cell_size = (0.0, 0.0), 1.0
+        self._span: Tuple[range, range] = (range(0), range(0))
+        extents = self.extents
+        if extents is not None:
+            self.origin = extents[:2]
+            # Sized from the longer side so flat or point-like extents (a single horizontal
+            # line) still give a grid of at most about sqrt(cells) cells per side.
+            cells = max(1.0, len(bounded) / TARGET_PER_CELL)
+            self.cell_size = max(extents[2] - extents[0], extents[3] - extents[1]) / math.sqrt(cells) or 1.0
+            self._span = self._cell_range(extents)
+
+        for number, box in enumerate(self.boxes):
+            if box is None:
+                self._always.append(number)
+                continue
+            columns, rows = self._cell_range(box)
+            if len(columns) * len(rows) > MAX_CELLS_PER_ENTITY:
+                self._always.append(number)
+                continue
+            for column in columns:
+                for row in rows:
+                    self._cells.setdefault((column, row), []).append(number)
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    @property
+    def extents(self) -> Optional[Box]:
+        """Union of all entity boxes, or ``None`` when no entity has extents."""
+        bounded = [box for box in self.boxes if box is not None]
+        if not bounded:
+            return None
+        return (
+            min(box[0] for box in bounded),
+            min(box[1] for box in bounded),
+            max(box[2] for box in bounded),
+            max(box[3] for box in bounded),
+        )
+
+    def box_lookup(self) -> Callable[[Any], Optional[Box]]:
+        """Return a function mapping an entity (by ``dxf.handle``) to its indexed box."""
+        boxes = dict(zip(self.handles, self.boxes))
+        return lambda entity: boxes.get(entity.dxf.handle)
+
+    def query(self, region: Box) -> List[str]:
+        """Return the handles of entities whose boxes intersect *region*, in entity order."""
+        xmin, ymin, xmax, ymax = region
+        # Cells outside the indexed extents are empty, so a region much larger than the
+        # drawing walks no more cells than the grid has.
+        columns, rows = (_clamp(cells, span) for cells, span in zip(self._cell_range(region), self._span))
+        candidates = set(self._always)
+        for column in columns:
+            for row in rows:
+                candidates.update(self._cells.get((column, row), ()))
+        matches = []
+        for number in sorted(candidates):
+            box = self.boxes[number]
+            if box is None or (box[0] <= xmax and box[2] >= xmin and box[1] <= ymax and box[3] >= ymin):
+                matches.append(self.handles[number])
+        return matches
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"handles": self.handles, "boxes": self.boxes}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpatialIndex":
+        return cls(data["handles"], data["boxes"])
+
+    @classmethod
+    def build(cls, entities: Iterable[Any], extents: Callable[[Any], Optional[Box]]) -> "SpatialIndex":
+        """Index *entities* (objects with ``dxf.handle``) using *extents* for their boxes."""
+        handles, boxes = [], []
+        for entity in entities:
+            handles.append(entity.dxf.handle)
+            boxes.append(extents(entity))
+        return cls(handles, boxes)
+
+    def _cell_range(self, box: Box) -> Tuple[range, range]:
+        size = self.cell_size
+        x0, y0 = self.origin
+        return (
+            range(math.floor((box[0] - x0) / size), math.floor((box[2] - x0) / size) + 1),
+            range(math.floor((box[1] - y0) / size), math.floor((box[3] - y0) / size) + 1),
+        )
+
+
+def _clamp(cells: range, span: range) -> range:
+    return range(max(cells.start, span.start), min(cells.stop, span.stop))
+
+
+def ezdxf_extents(bbox_module: Any) -> Callable[[Any], Optional[Box]]:
+    """Return an extents function backed by ``ezdxf.bbox`` (fast, control-point based)."""
+
+    def extents(entity: Any) -> Optional[Box]:
+        box = bbox_module.extents([entity], fast=True)
+        if not box.has_data:
+            return None
+        return (box.extmin.x, box.extmin.y, box.extmax.x, box.extmax.y)
+
+    return extents
+
+
+def index_path(source: Path) -> Path:
+    """Return where the index of *source* is persisted (next to the drawing)."""
+    return source.with_name(source.name + INDEX_SUFFIX)
+
+
+def _signature(source: Path) -> Dict[str, int]:
+    stat = source.stat()
+    return {"version": INDEX_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def load_index(source: Path, layout: str) -> Optional[SpatialIndex]:
+    """Load the persisted index of *layout*, or ``None`` if missing or stale."""
+    try:
+        data = json.loads(index_path(source).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("source") != _signature(source) or layout not in data.get("layouts", {}):
+        return None
+    return SpatialIndex.from_dict(data["layouts"][layout])
+
+
+def save_index(source: Path, layout: str, index: SpatialIndex) -> Path:
+    """Persist *index* for *layout*, keeping other layouts of the same drawing version."""
+    path = index_path(source)
+    signature = _signature(source)
+    layouts: Dict[str, Any] = {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("source") == signature:
+            layouts = data.get("layouts", {})
+    except (OSError, ValueError):
+        pass
+    layouts[layout] = index.to_dict()
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump({"source": signature, "layouts": layouts}, handle, separators=(",", ":"))
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+
+class LayoutView:
+    """A layout restricted to a subset of its entities, handed to the ezdxf frontend.
+
+    Everything except entity iteration is delegated to the wrapped layout.
+    """
+
+    def __init__(self, layout: Any, entities: Sequence[Any]) -> None:
+        self._layout = layout
+        self._entities = list(entities)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._entities)
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def entities_in_redraw_order(self, reverse: bool = False) -> Iterable[Any]:
+        get_order = getattr(self._layout, "get_redraw_order", None)
+        if get_order is not None and get_order():
+            # A SORTENTSTABLE reorders entities; keep its order for the selected subset.
+            # Entities are matched by handle so simplified stand-ins take their originals' place.
+            selected = {entity.dxf.handle: entity for entity in self._entities}
+            ordered = self._layout.entities_in_redraw_order(reverse=reverse)
+            return [selected[entity.dxf.handle] for entity in ordered if entity.dxf.handle in selected]
+        return list(reversed(self._entities)) if reverse else list(self._entities)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._layout, name)
+
+
+__all__ = [
+    "INDEX_SUFFIX",
+    "LayoutView",
+    "SpatialIndex",
+    "ezdxf_extents",
+    "index_path",
+    "load_index",
+    "save_index",
+]
@@ -0,0 +1,94 @@
+"""Helpers for drawing DXF modelspace entities straight from a file stream."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+from .options import DXFOptions
+
+# Modelspace layout names accepted by a streaming render.
+MODELSPACE_NAMES = frozenset({"", "MODEL", "MODELSPACE"})
+
+# Bytes read at a time when scanning a file for block references.
+SCAN_CHUNK_SIZE = 4 * 1024 * 1024
+# A section start, a section end or an INSERT: group code 0 and its value, each on its own line.
+# Anchored on the preceding newline rather than ``^``, which lets the regex engine skip ahead faster.
+_MARKER = re.compile(rb"\n[ \t]*0\r?\n(?:SECTION\r?\n[ \t]*2\r?\n(\w+)|(INSERT|ENDSEC))\r?(?=\n)")
+# Lines a marker spans after its leading newline; the last ones of a chunk are scanned again.
+_MARKER_LINES = 4
+
+
+def stream_blockers(opts: DXFOptions) -> List[str]:
+    """Return the options in *opts* that need the fully loaded document."""
+    blockers = []
+    if opts.layout_name and opts.layout_name.upper() not in MODELSPACE_NAMES:
+        blockers.append(f"layout '{opts.layout_name}'")
+    if opts.bbox:
+        blockers.append("bbox")
+    if opts.lod:
+        blockers.append("lod")
+    return blockers
+
+
+def has_block_references(path: Path) -> bool:
+    """Return whether the ENTITIES section of the ASCII DXF at *path* contains an INSERT.
+
+    Block definitions are not in the entity stream, so such drawings cannot be streamed.
+    The file is scanned in chunks with a regular expression, without parsing tags, and
+    the scan stops at the end of the ENTITIES section.
+    """
+    section = None
+    carry = b"\n"  # the first line has no newline before it
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(SCAN_CHUNK_SIZE)
+            buffer = carry + chunk
+            # Matches must start before the newline ahead of the last few lines, which may be
+            # incomplete and are scanned again with the next chunk; the final chunk is
+            # scanned to its end.
+            cut = len(buffer)
+            if chunk:
+                for _ in range(_MARKER_LINES + 1):
+                    cut = max(buffer.rfind(b"\n", 0, cut), 0)
+            for match in _MARKER.finditer(buffer):
+                if match.start() >= cut:
+                    break
+                if match.group(1):
+                    section = match.group(1)
+                elif section == b"ENTITIES":
+                    if match.group(2) == b"INSERT":
+                        return True
+                    return False  # ENDSEC
+            if not chunk:
+                return False
+            carry = buffer[cut:]
+
+
+class StreamedLayout:
+    """A one-shot modelspace stand-in handed to ``Frontend.draw_layout``.
+
+    Entities are pulled from *entities* while the frontend draws them, so only the
+    entity being drawn is held in memory. ``count`` is the number of entities read.
+    """
+
+    def __init__(self, entities: Iterable[Any]) -> None:
+        self._entities = entities
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for entity in self._entities:
+            self.count += 1
+            yield entity
+
+    def get_redraw_order(self) -> Sequence[Tuple[str, str]]:
+        # Called by Frontend.draw_layout; an empty order draws the entities as iterated.
+        return ()
+
+    def entities_in_redraw_order(self, reverse: bool = False) -> Iterator[Any]:
+        # A stream has no SORTENTSTABLE and cannot be reversed; file order is redraw order.
+        return iter(self)
+
+
+__all__ = ["MODELSPACE_NAMES", "StreamedLayout", "has_block_references", "stream_blockers"]
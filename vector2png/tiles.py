@@ -0,0 +1,207 @@
+"""Deep Zoom (DZI) and XYZ tile pyramids rendered straight from vector pages."""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from .exceptions import ConversionError
+from .raster import render_region
+from .utils import source_stem
+
+LAYOUTS = ("dzi", "xyz")
+
+
+@dataclass(slots=True)
+class PyramidLevel:
+    """Geometry of one zoom level of a tile pyramid."""
+
+    index: int
+    scale: float
+    width: int
+    height: int
+    columns: int
+    rows: int
+
+
+def pyramid_levels(width: int, height: int, tile_size: int, layout: str = "dzi") -> List[PyramidLevel]:
+    """Return the levels of a pyramid whose full-resolution image is ``width x height``.
+
+    DZI levels run from a 1x1 image (level 0) to full resolution; XYZ levels start at
+    the zoom where the whole image fits a single tile.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown tile layout '{layout}'; expected one of {', '.join(LAYOUTS)}")
+    if tile_size <= 0:
+        raise ValueError("Tile size must be positive")
+    longest = max(width, height, 1)
+    if layout == "dzi":
+        top = math.ceil(math.log2(longest))
+    else:
+        top = max(0, math.ceil(math.log2(longest / tile_size)))
+
+    levels = []
+    for index in range(top + 1):
+        scale = 2.0 ** (index - top)
+        level_width = max(1, math.ceil(width * scale))
+        level_height = max(1, math.ceil(height * scale))
+        levels.append(
+            PyramidLevel(
+                index=index,
+                scale=scale,
+                width=level_width,
+                height=level_height,
+                columns=math.ceil(level_width / tile_size),
+                rows=math.ceil(level_height / tile_size),
+            )
+        )
+    return levels
+
+
+class TilePyramid:
+    """Render a page into a multi-level tile pyramid, eagerly or on demand.
+
+    Every tile is a ``get_pixmap`` call clipped to the tile rectangle, so only the
+    tiles that are requested are ever rasterized. Call :meth:`generate` to
+    render everything, or keep the pyramid open and call :meth:`tile` lazily (tiles
+    already on disk are kept); call :meth:`close` (or use it as a context manager)
+    to release the source document.
+    """
+
+    def __init__(
+        self,
+        fitz: Any,
+        page: Any,
+        output_dir: Path,
+        name: str,
+        zoom: float,
+        tile_size: int = 256,
+        layout: str = "dzi",
+        overlap: int = 0,
+        alpha: bool = False,
+        on_close: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.fitz = fitz
+        self.page = page
+        self.output_dir = Path(output_dir)
+        self.name = name
+        self.zoom = zoom
+        self.tile_size = tile_size
+        self.layout = layout
+        self.overlap = overlap if layout == "dzi" else 0
+        self.alpha = alpha
+        self._on_close = on_close
+
+        bounds = (page.rect * fitz.Matrix(zoom, zoom)).irect
+        self.width = bounds.width
+        self.height = bounds.height
+        self.levels = pyramid_levels(self.width, self.height, tile_size, layout)
+
+    def __enter__(self) -> "TilePyramid":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    @property
+    def descriptor(self) -> Path:
+        """Path of the DZI XML (or ``tiles.json`` for XYZ) describing the pyramid."""
+        if self.layout == "dzi":
+            return self.output_dir / f"{self.name}.dzi"
+        return self.output_dir / "tiles.json"
+
+    def tile_path(self, level: int, column: int, row: int) -> Path:
+        if self.layout == "dzi":
+            return self.output_dir / f"{self.name}_files" / str(level) / f"{column}_{row}.png"
+        return self.output_dir / str(level) / str(column) / f"{row}.png"
+
+    def write_descriptor(self) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self.layout == "dzi":
+            content = (
+                '<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" '
+                f'Format="png" Overlap="{self.overlap}" TileSize="{self.tile_size}">\n'
+                f'  <Size Width="{self.width}" Height="{self.height}"/>\n'
+                "</Image>\n"
+            )
+        else:
+            content = json.dumps(
+                {
+                    "width": self.width,
+                    "height": self.height,
+                    "tile_size": self.tile_size,
+                    "min_zoom": self.levels[0].index,
+                    "max_zoom": self.levels[-1].index,
+                    "url": "{z}/{x}/{y}.png",
+                },
+                indent=2,
+            )
+        self.descriptor.write_text(content, encoding="utf-8")
+        return self.descriptor
+
+    def tile(self, level: int, column: int, row: int, overwrite: bool = False) -> Path:
+        """Return the PNG for one tile, rendering it first if it does not exist yet."""
+        path = self.tile_path(level, column, row)
+        if path.exists() and not overwrite:
+            return path
+        if self.page is None:
+            raise ConversionError("Tile pyramid is closed; reopen it to render missing tiles")
+        if not 0 <= level < len(self.levels):
+            raise ConversionError(f"Tile level {level} out of range 0..{len(self.levels) - 1}")
+        spec = self.levels[level]
+        if not (0 <= column < spec.columns and 0 <= row < spec.rows):
+            raise ConversionError(f"Tile {column},{row} outside level {level} ({spec.columns}x{spec.rows})")
+
+        x0 = max(0, column * self.tile_size - self.overlap)
+        y0 = max(0, row * self.tile_size - self.overlap)
+        x1 = min(spec.width, (column + 1) * self.tile_size + self.overlap)
+        y1 = min(spec.height, (row + 1) * self.tile_size + self.overlap)
+        zoom = self.zoom * spec.scale
+        region = self.fitz.IRect(x0, y0, x1, y1)
+        pix = render_region(self.fitz, self.page, self.fitz.Matrix(zoom, zoom), region, self.alpha)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pix.save(str(path))
+        return path
+
+    def iter_tiles(self, levels: Optional[Sequence[int]] = None) -> Iterator[Tuple[int, int, int]]:
+        """Yield ``(level, column, row)`` for every tile of the selected levels."""
+        for spec in self.levels:
+            if levels is not None and spec.index not in levels:
+                continue
+            for row in range(spec.rows):
+                for column in range(spec.columns):
+                    yield spec.index, column, row
+
+    def generate(self, levels: Optional[Sequence[int]] = None, overwrite: bool = True) -> int:
+        """Render the tiles of *levels* (default: all) and return the count.
+
+        Existing tiles are replaced, since they may come from an older source or other
+        options; pass ``overwrite=False`` to only fill in missing ones.
+        """
+        self.write_descriptor()
+        rendered = 0
+        for level, column, row in self.iter_tiles(levels):
+            if overwrite or not self.tile_path(level, column, row).exists():
+                self.tile(level, column, row, overwrite=True)
+                rendered += 1
+        return rendered
+
+    def close(self) -> None:
+        self.page = None
+        if self._on_close is not None:
+            self._on_close()
+            self._on_close = None
+
+
+def default_tile_dir(source: Path, target_dir: str | Path | None) -> Path:
+    """Return the pyramid directory: *target_dir* or ``<stem>_tiles`` beside the source."""
+    if target_dir is not None:
+        return Path(target_dir).expanduser().resolve()
+    return source.with_name(f"{source_stem(source)}_tiles")
+
+
+__all__ = ["LAYOUTS", "PyramidLevel", "TilePyramid", "default_tile_dir", "pyramid_levels"]
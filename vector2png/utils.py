@@ -4,10 +4,15 @@ from __future__ import annotations
 
 import importlib
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, BinaryIO, Callable, List, Union
 
 from .exceptions import DependencyMissingError
 
+BinarySource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+# Compression suffixes dropped together with the format suffix when naming outputs.
+COMPRESSED_SUFFIXES = (".gz",)
+
 
 def ensure_input_path(path: str | Path) -> Path:
     """Return a resolved path and ensure it exists."""
@@ -17,16 +22,90 @@ def ensure_input_path(path: str | Path) -> Path:
     return resolved
 
 
+def source_stem(source: Path) -> str:
+    """Return the file name without its format suffix, e.g. ``plan`` for ``plan.dxf.gz``."""
+    if source.suffix.lower() in COMPRESSED_SUFFIXES:
+        source = source.with_suffix("")
+    return source.stem
+
+
 def ensure_output_path(source: Path, target: str | Path | None) -> Path:
     """Derive the output path; default to source stem if not provided."""
     if target is None:
-        output = source.with_suffix(".png")
+        output = source.with_name(f"{source_stem(source)}.png")
     else:
         output = Path(target).expanduser().resolve()
     output.parent.mkdir(parents=True, exist_ok=True)
     return output
 
 
+def read_binary(data: BinarySource) -> bytes:
+    """Return in-memory input as ``bytes``.
+
+    ``bytes`` are returned as-is; ``bytearray``/``memoryview`` are copied once and
+    file-like objects are read from their current position.
+    """
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, (bytearray, memoryview)):
+        return bytes(data)
+    read = getattr(data, "read", None)
+    if callable(read):
+        content = read()
+        if not isinstance(content, (bytes, bytearray, memoryview)):
+            raise TypeError("File-like input must be opened in binary mode")
+        return content if isinstance(content, bytes) else bytes(content)
+    raise TypeError(f"Expected bytes, bytearray, memoryview or a binary file object, got {type(data).__name__}")
+
+
+def ensure_page_output_path(source: Path, target: str | Path | None, page: int) -> Path:
+    """Derive the PNG path for *page* (1-based) as ``<stem>-<page>.png``.
+
+    A ``{page}`` placeholder inside *target* is formatted instead when present.
+    """
+    if target is not None and "{page}" in str(target):
+        return ensure_output_path(source, str(target).format(page=page))
+    base = ensure_output_path(source, target)
+    return base.with_name(f"{base.stem}-{page}.png")
+
+
+def parse_page_selection(spec: str | None, page_count: int) -> List[int]:
+    """Return sorted 1-based page numbers selected by *spec*.
+
+    ``None`` selects the first page, ``"all"``/``"*"`` every page, and otherwise a
+    comma separated list of numbers and ranges such as ``"1-3,5,8-"``.
+    """
+    if page_count <= 0:
+        return []
+    if spec is None:
+        return [1]
+    text = str(spec).strip().lower()
+    if text in ("all", "*", ""):
+        return list(range(1, page_count + 1))
+
+    selected = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start = int(start_text) if start_text.strip() else 1
+                end = int(end_text) if end_text.strip() else page_count
+            else:
+                start = end = int(part)
+        except ValueError as exc:
+            raise ValueError(f"Invalid page selection '{spec}'") from exc
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid page range '{part}' in '{spec}'")
+        selected.update(range(start, min(end, page_count) + 1))
+
+    if not selected:
+        raise ValueError(f"Page selection '{spec}' matches no pages (document has {page_count})")
+    return sorted(selected)
+
+
 def optional_import(module: str, package: str | None = None, hint: str | None = None) -> Any:
     """Try importing a module and raise a descriptive error when missing."""
     try:
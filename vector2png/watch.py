@@ -0,0 +1,257 @@
+"""Incremental conversion of a directory that keeps receiving AI/DXF files."""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .batch import BatchResult, Job, _run_job, source_kind
+from .cache import RenderCache, hash_file
+from .options import AIOptions, DXFOptions
+from .utils import source_stem
+
+MANIFEST_NAME = ".vector2png-watch.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    output TEXT,
+    error TEXT,
+    converted_at REAL NOT NULL
+)
+"""
+
+
+@dataclass(slots=True)
+class ManifestEntry:
+    """Last known state of a watched file and the outcome of its conversion."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    digest: str
+    output: Optional[str] = None
+    error: Optional[str] = None
+    converted_at: float = 0.0
+
+
+class Manifest:
+    """SQLite table of ``mtime``/size/hash per source, used to skip unchanged files."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.execute(_SCHEMA)
+        self.connection.commit()
+
+    def __enter__(self) -> "Manifest":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def get(self, source: str | Path) -> Optional[ManifestEntry]:
+        row = self.connection.execute(
+            "SELECT path, mtime_ns, size, digest, output, error, converted_at FROM files WHERE path = ?",
+            (str(source),),
+        ).fetchone()
+        return ManifestEntry(*row) if row else None
+
+    def record(self, entry: ManifestEntry) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                entry.path,
+                entry.mtime_ns,
+                entry.size,
+                entry.digest,
+                entry.output,
+                entry.error,
+                entry.converted_at,
+            ),
+        )
+        self.connection.commit()
+
+    def forget(self, source: str | Path) -> None:
+        self.connection.execute("DELETE FROM files WHERE path = ?", (str(source),))
+        self.connection.commit()
+
+    def paths(self) -> List[str]:
+        return [row[0] for row in self.connection.execute("SELECT path FROM files")]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class DirectoryWatcher:
+    """Poll a directory and convert new or changed ``.ai``/``.dxf`` files.
+
+    A file is picked up once it has not been modified for ``settle`` seconds, so
+    partially written uploads are left alone. Files whose mtime and size match the
+    manifest are skipped without reading them; touched-but-identical files are
+    recognized by their hash. Failed files are retried only after they change.
+    Conversions run on a process pool that stays up between polls, so workers keep
+    their converters (and parsed dependencies) warm.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        output_dir: str | Path | None = None,
+        ai_options: Optional[AIOptions] = None,
+        dxf_options: Optional[DXFOptions] = None,
+        workers: Optional[int] = None,
+        interval: float = 2.0,
+        settle: float = 2.0,
+        recursive: bool = True,
+        manifest: str | Path | None = None,
+        timeout: Optional[float] = None,
+        cache: Optional[RenderCache] = None,
+    ) -> None:
+        self.directory = Path(directory).expanduser().resolve()
+        if not self.directory.is_dir():
+            raise FileNotFoundError(f"Watch directory not found: {self.directory}")
+        self.output_dir = Path(output_dir).expanduser().resolve() if output_dir else None
+        self.ai_options = ai_options
+        self.dxf_options = dxf_options
+        self.workers = max(1, workers if workers is not None else (os.cpu_count() or 1))
+        self.interval = interval
+        self.settle = settle
+        self.recursive = recursive
+        self.timeout = timeout
+        self.cache = cache
+        self.manifest = Manifest(manifest or self.directory / MANIFEST_NAME)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "DirectoryWatcher":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def poll(self) -> List[BatchResult]:
+        """Convert every settled new or changed file once and return the results."""
+        changes = self._scan()
+        if not changes:
+            return []
+
+        jobs = [self._build_job(path) for path, _ in changes]
+        results = self._convert(jobs)
+        now = time.time()
+        for (path, entry), result in zip(changes, results):
+            self.manifest.record(
+                replace(
+                    entry,
+                    output=str(result.target) if result.target else None,
+                    error=result.error,
+                    converted_at=now,
+                )
+            )
+            if result.ok:
+                self.logger.info("Converted %s -> %s (%.2fs)", path, result.target, result.duration)
+            else:
+                self.logger.error("%s: %s", path, result.error)
+        return results
+
+    def run(
+        self,
+        stop: Optional[threading.Event] = None,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+        max_polls: Optional[int] = None,
+    ) -> None:
+        """Poll every ``interval`` seconds until *stop* is set or *max_polls* is reached."""
+        stop = stop or threading.Event()
+        polls = 0
+        while not stop.is_set():
+            for result in self.poll():
+                if on_result is not None:
+                    on_result(result)
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                break
+            stop.wait(self.interval)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        self.manifest.close()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _candidates(self) -> Iterator[Path]:
+        entries = self.directory.rglob("*") if self.recursive else self.directory.iterdir()
+        for path in entries:
+            if source_kind(path) is not None and path.is_file():
+                yield path
+
+    def _scan(self) -> List[Tuple[Path, ManifestEntry]]:
+        """Return settled files that differ from the manifest, with their new state."""
+        now = time.time()
+        seen = set()
+        changes = []
+        for path in sorted(self._candidates()):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            seen.add(str(path))
+            entry = self.manifest.get(path)
+            if entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                continue
+            if now - stat.st_mtime < self.settle:
+                self.logger.debug("Waiting for %s to settle", path)
+                continue
+
+            digest = hash_file(path)
+            current = ManifestEntry(str(path), stat.st_mtime_ns, stat.st_size, digest)
+            if entry is not None and entry.digest == digest and entry.error is None:
+                # Touched but unchanged: refresh the stat signature, keep the output.
+                self.manifest.record(replace(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size))
+                continue
+            changes.append((path, current))
+
+        for stale in set(self.manifest.paths()) - seen:
+            self.manifest.forget(stale)
+        return changes
+
+    def _build_job(self, source: Path) -> Job:
+        kind = source_kind(source)
+        if self.output_dir is None:
+            return kind, source, None
+        relative = source.relative_to(self.directory)
+        relative = relative.with_name(f"{source_stem(relative)}.png")
+        target = self.output_dir / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        return kind, source, target
+
+    def _convert(self, jobs: List[Job]) -> List[BatchResult]:
+        worker = partial(
+            _run_job,
+            ai_options=self.ai_options,
+            dxf_options=self.dxf_options,
+            timeout=self.timeout,
+            cache=self.cache,
+        )
+        if self.workers == 1:
+            return [worker(job) for job in jobs]
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return list(self._executor.map(worker, jobs))
+
+
+__all__ = ["DirectoryWatcher", "MANIFEST_NAME", "Manifest", "ManifestEntry"]